@@ -0,0 +1,149 @@
+"""
+Append-only journal of the agent state, one line per step, to resume a run after a crash.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Type
+
+from browser_use.agent.message_manager.views import ManagedMessage, MessageHistory, MessageManagerState
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList, AgentOutput, AgentState
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointJournal:
+	"""
+	After every step, `append` writes one JSON line with what changed since the previous line:
+	the new history items, the new messages (and how many of the previous ones are kept - the last
+	state message is removed every step) and the counters. Nothing already written is rewritten.
+
+	`load_state` replays the journal into an `AgentState`, see `Agent.resume_from`.
+
+	fsync: flush every line to disk, not only to the OS - survives a machine crash, not just a process crash
+	"""
+
+	def __init__(self, path: str | Path, fsync: bool = False):
+		self.path = Path(path)
+		self.fsync = fsync
+		# what the journal already holds - kept as objects to compare by identity
+		self._written_messages: list[ManagedMessage] = []
+		self._written_history = 0
+		self._tail_checked = False
+
+	def seed(self, state: AgentState) -> None:
+		"""Mark `state` as already written, e.g. after resuming from this journal"""
+		self._written_messages = list(state.message_manager_state.history.messages)
+		self._written_history = len(state.history.history)
+
+	def append(self, state: AgentState) -> None:
+		messages = state.message_manager_state.history.messages
+		keep = 0
+		for written, current in zip(self._written_messages, messages):
+			if written is not current:
+				break
+			keep += 1
+
+		entry = {
+			'agent_id': state.agent_id,
+			'n_steps': state.n_steps,
+			'consecutive_failures': state.consecutive_failures,
+			'last_result': [r.model_dump(exclude_none=True) for r in state.last_result] if state.last_result else None,
+			'last_plan': state.last_plan,
+			'tool_id': state.message_manager_state.tool_id,
+			'prefix_length': state.message_manager_state.prefix_length,
+			'history': [h.model_dump() for h in state.history.history[self._written_history :]],
+			'messages': {'keep': keep, 'append': [m.model_dump() for m in messages[keep:]]},
+		}
+		line = json.dumps(entry) + '\n'
+
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		if not self._tail_checked:
+			self._repair_tail()
+			self._tail_checked = True
+		with open(self.path, 'a', encoding='utf-8') as f:
+			f.write(line)
+			if self.fsync:
+				f.flush()
+				os.fsync(f.fileno())
+
+		self._written_messages = list(messages)
+		self._written_history = len(state.history.history)
+
+	def _repair_tail(self) -> None:
+		"""
+		Cut the torn last line of a crashed write - the next line would be appended to it and could not be read.
+		A complete last line that only misses its newline is kept, `load_state` already counted it.
+		"""
+		if not self.path.exists():
+			return
+		with open(self.path, 'rb+') as f:
+			size = f.seek(0, os.SEEK_END)
+			if size == 0:
+				return
+			f.seek(size - 1)
+			if f.read(1) == b'\n':
+				return
+
+			# find the start of the last line, reading backwards
+			start = size
+			while start > 0:
+				chunk_start = max(0, start - 65536)
+				f.seek(chunk_start)
+				newline = f.read(start - chunk_start).rfind(b'\n')
+				if newline != -1:
+					start = chunk_start + newline + 1
+					break
+				start = chunk_start
+
+			f.seek(start)
+			try:
+				json.loads(f.read())
+			except ValueError:
+				logger.warning(f'Removing incomplete checkpoint line from {self.path}')
+				f.truncate(start)
+			else:
+				f.write(b'\n')
+
+	@staticmethod
+	def load_state(path: str | Path, output_model: Type[AgentOutput]) -> AgentState:
+		"""Rebuild the agent state of the last complete line - a torn last line of a crashed write is ignored"""
+		history: list[AgentHistory] = []
+		messages: list[ManagedMessage] = []
+		last_entry: dict[str, Any] | None = None
+
+		with open(path, 'r', encoding='utf-8') as f:
+			for line in f:
+				try:
+					entry = json.loads(line)
+				except json.JSONDecodeError:
+					logger.warning(f'Ignoring incomplete checkpoint line in {path}')
+					break
+				history.extend(AgentHistory.load_from_dict(h, output_model) for h in entry['history'])
+				messages = messages[: entry['messages']['keep']] + [
+					ManagedMessage.model_validate(m) for m in entry['messages']['append']
+				]
+				last_entry = entry
+
+		if last_entry is None:
+			raise ValueError(f'No checkpoint in {path}')
+
+		last_result = last_entry['last_result']
+
+		return AgentState(
+			agent_id=last_entry['agent_id'],
+			n_steps=last_entry['n_steps'],
+			consecutive_failures=last_entry['consecutive_failures'],
+			last_result=[ActionResult.model_validate(r) for r in last_result] if last_result else None,
+			last_plan=last_entry['last_plan'],
+			history=AgentHistoryList(history=history),
+			message_manager_state=MessageManagerState(
+				history=MessageHistory(messages=messages, current_tokens=sum(m.metadata.tokens for m in messages)),
+				tool_id=last_entry['tool_id'],
+				prefix_length=last_entry['prefix_length'],
+			),
+		)
@@ -0,0 +1,146 @@
+"""
+JSONL history files - one step per line, screenshots stored next to the file instead of inline as base64.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence, Type, overload
+
+from browser_use.agent.views import AgentHistory, AgentHistoryList, AgentOutput
+
+logger = logging.getLogger(__name__)
+
+
+def screenshots_dir(path: str | Path) -> Path:
+	"""`history.jsonl` keeps its screenshots in `history_screenshots/`"""
+	path = Path(path)
+	return path.with_name(f'{path.stem}_screenshots')
+
+
+class HistoryWriter:
+	"""
+	Appends history items to a JSONL file as they come - `Agent(history_path=...)` appends every step as it
+	completes. The screenshot of step `i` is written to `<name>_screenshots/step_<i>.png` and referenced by
+	`state.screenshot_file`.
+	"""
+
+	def __init__(self, path: str | Path, overwrite: bool = False):
+		self.path = Path(path)
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		if overwrite:
+			self.path.write_text('', encoding='utf-8')
+		self._n_steps = self._count_lines()
+
+	def _count_lines(self) -> int:
+		if not self.path.exists():
+			return 0
+		with open(self.path, 'rb') as f:
+			return sum(1 for _ in f)
+
+	def append(self, item: AgentHistory) -> None:
+		data = item.model_dump()
+		screenshot = data['state'].pop('screenshot', None)
+		data['state']['screenshot'] = None
+		if screenshot:
+			directory = screenshots_dir(self.path)
+			directory.mkdir(exist_ok=True)
+			filename = f'step_{self._n_steps:04d}.png'
+			(directory / filename).write_bytes(base64.b64decode(screenshot))
+			data['state']['screenshot_file'] = filename
+
+		with open(self.path, 'a', encoding='utf-8') as f:
+			f.write(json.dumps(data) + '\n')
+		self._n_steps += 1
+
+	def write(self, history: AgentHistoryList) -> None:
+		for item in history.history:
+			self.append(item)
+
+
+class HistoryReader(Sequence[AgentHistory]):
+	"""
+	Lazy reader of a JSONL history file. Opening it only indexes the line offsets - a step is parsed and
+	validated when it is accessed, and its screenshot is only read if `load_screenshots` is set.
+
+	Iterate it (or pass it to `Agent.rerun_history`) instead of loading the whole history.
+	"""
+
+	def __init__(self, path: str | Path, output_model: Type[AgentOutput], load_screenshots: bool = False):
+		self.path = Path(path)
+		self.output_model = output_model
+		self.load_screenshots = load_screenshots
+		self._offsets: list[int] = []
+
+		offset = 0
+		with open(self.path, 'rb') as f:
+			for line in f:
+				if line.strip():
+					self._offsets.append(offset)
+				offset += len(line)
+
+	def __len__(self) -> int:
+		return len(self._offsets)
+
+	def _read_line(self, index: int) -> dict[str, Any]:
+		with open(self.path, 'rb') as f:
+			f.seek(self._offsets[index])
+			return json.loads(f.readline())
+
+	def raw(self, index: int) -> dict[str, Any]:
+		"""The step as stored, without validating it - cheap for analytics over single fields"""
+		return self._read_line(index)
+
+	def screenshot(self, index: int) -> Optional[str]:
+		"""Base64 screenshot of a step"""
+		filename = self._read_line(index)['state'].get('screenshot_file')
+		return self._load_screenshot(filename)
+
+	def _load_screenshot(self, filename: Optional[str]) -> Optional[str]:
+		if not filename:
+			return None
+		file = screenshots_dir(self.path) / filename
+		if not file.exists():
+			logger.debug(f'Missing screenshot {file}')
+			return None
+		return base64.b64encode(file.read_bytes()).decode('utf-8')
+
+	def _load(self, index: int) -> AgentHistory:
+		data = self._read_line(index)
+		filename = data['state'].pop('screenshot_file', None)
+		if self.load_screenshots:
+			data['state']['screenshot'] = self._load_screenshot(filename)
+		return AgentHistory.load_from_dict(data, self.output_model)
+
+	@overload
+	def __getitem__(self, index: int) -> AgentHistory: ...
+
+	@overload
+	def __getitem__(self, index: slice) -> list[AgentHistory]: ...
+
+	def __getitem__(self, index: int | slice) -> AgentHistory | list[AgentHistory]:
+		if isinstance(index, slice):
+			return [self._load(i) for i in range(*index.indices(len(self)))]
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError(index)
+		return self._load(index)
+
+	def __iter__(self) -> Iterator[AgentHistory]:
+		# one file handle for the whole pass
+		with open(self.path, 'rb') as f:
+			for line in f:
+				if not line.strip():
+					continue
+				data = json.loads(line)
+				filename = data['state'].pop('screenshot_file', None)
+				if self.load_screenshots:
+					data['state']['screenshot'] = self._load_screenshot(filename)
+				yield AgentHistory.load_from_dict(data, self.output_model)
+
+	def to_history_list(self) -> AgentHistoryList:
+		return AgentHistoryList(history=list(self))
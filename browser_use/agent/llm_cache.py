@@ -0,0 +1,164 @@
+"""
+On-disk cache of LLM responses, so reruns of the same task on an unchanged page skip the model calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+# The state message contains the current time, which would make every key unique
+_VOLATILE_PATTERNS = (re.compile(r'Current date and time: \d{4}-\d{2}-\d{2} \d{2}:\d{2}'),)
+
+
+@dataclass
+class LLMCacheStats:
+	hits: int = 0
+	misses: int = 0
+	stored: int = 0
+	evictions: int = 0
+
+	@property
+	def hit_rate(self) -> float:
+		total = self.hits + self.misses
+		return self.hits / total if total else 0.0
+
+	def since(self, earlier: LLMCacheStats) -> LLMCacheStats:
+		"""Difference to an earlier snapshot, e.g. the stats of one agent run"""
+		return LLMCacheStats(
+			hits=self.hits - earlier.hits,
+			misses=self.misses - earlier.misses,
+			stored=self.stored - earlier.stored,
+			evictions=self.evictions - earlier.evictions,
+		)
+
+
+class LLMCache:
+	"""
+	SQLite backed cache of model responses, keyed by a hash of the input messages, the model
+	and its settings, and whatever else decides the response (e.g. the output schema).
+
+	Entries expire `ttl_seconds` after they were stored. Above `max_entries` the least recently
+	used entries are evicted.
+
+	Responses are stored as text - callers serialize parsed outputs themselves.
+
+	Images in the input messages are part of the key. With vision, a single changed pixel of the screenshot
+	(animations, carousels, a blinking cursor) is a miss - reruns mostly hit with `use_vision=False`.
+
+	`aget` and `aput` run the SQLite reads and commits on a single thread of the cache, off the event loop.
+	"""
+
+	def __init__(self, path: str | Path, max_entries: int = 10_000, ttl_seconds: Optional[float] = None):
+		self.path = Path(path)
+		self.max_entries = max_entries
+		self.ttl_seconds = ttl_seconds
+		self.stats = LLMCacheStats()
+
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		self._db = sqlite3.connect(self.path, check_same_thread=False)
+		self._db.execute(
+			'CREATE TABLE IF NOT EXISTS responses '
+			'(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)'
+		)
+		self._db.execute('CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)')
+		self._db.commit()
+		self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='llm-cache')
+
+	@staticmethod
+	def _normalize(text: str) -> str:
+		for pattern in _VOLATILE_PATTERNS:
+			text = pattern.sub('', text)
+		return text
+
+	@classmethod
+	def _serialize_input(cls, input: str | list[BaseMessage]) -> Any:
+		if isinstance(input, str):
+			return cls._normalize(input)
+		serialized = []
+		for message in input:
+			content = message.content
+			if isinstance(content, str):
+				content = cls._normalize(content)
+			else:
+				content = [
+					{**item, 'text': cls._normalize(item['text'])} if isinstance(item, dict) and 'text' in item else item
+					for item in content
+				]
+			serialized.append({'type': message.type, 'content': content, 'tool_calls': getattr(message, 'tool_calls', None)})
+		return serialized
+
+	@classmethod
+	def make_key(cls, llm: BaseChatModel, input: str | list[BaseMessage], *extra: Any) -> str:
+		"""Stable key for a call of `llm` with `input` - `extra` holds anything else that changes the response"""
+		payload = {
+			'model': llm.__class__.__name__,
+			'params': getattr(llm, '_identifying_params', {}),
+			'input': cls._serialize_input(input),
+			'extra': extra,
+		}
+		return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+	def get(self, key: str) -> Optional[str]:
+		now = time.time()
+		row = self._db.execute('SELECT value, created_at FROM responses WHERE key = ?', (key,)).fetchone()
+		if row is not None and self.ttl_seconds is not None and row[1] + self.ttl_seconds <= now:
+			self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+			self._db.commit()
+			row = None
+		if row is None:
+			self.stats.misses += 1
+			return None
+
+		self._db.execute('UPDATE responses SET last_used = ? WHERE key = ?', (now, key))
+		self._db.commit()
+		self.stats.hits += 1
+		return row[0]
+
+	def put(self, key: str, value: str) -> None:
+		now = time.time()
+		self._db.execute(
+			'INSERT OR REPLACE INTO responses (key, value, created_at, last_used) VALUES (?, ?, ?, ?)', (key, value, now, now)
+		)
+		self.stats.stored += 1
+
+		(count,) = self._db.execute('SELECT COUNT(*) FROM responses').fetchone()
+		if count > self.max_entries:
+			evicted = self._db.execute(
+				'DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used, rowid LIMIT ?)',
+				(count - self.max_entries,),
+			).rowcount
+			self.stats.evictions += evicted
+		self._db.commit()
+
+	async def aget(self, key: str) -> Optional[str]:
+		return await asyncio.get_running_loop().run_in_executor(self._executor, self.get, key)
+
+	async def aput(self, key: str, value: str) -> None:
+		await asyncio.get_running_loop().run_in_executor(self._executor, self.put, key, value)
+
+	def __len__(self) -> int:
+		(count,) = self._db.execute('SELECT COUNT(*) FROM responses').fetchone()
+		return count
+
+	def clear(self) -> None:
+		self._db.execute('DELETE FROM responses')
+		self._db.commit()
+
+	def close(self) -> None:
+		self._executor.shutdown(wait=True)
+		self._db.close()
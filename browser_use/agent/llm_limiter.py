@@ -0,0 +1,181 @@
+"""
+Shared concurrency limiter for LLM calls - bounds the requests in flight and the tokens per minute per provider.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import Runnable
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_WINDOW_SECONDS = 60.0
+
+
+@dataclass
+class LLMCallStats:
+	"""Summed over the LLM calls of one agent step - see `track_llm_calls`"""
+
+	queue_seconds: float = 0.0  # time spent waiting for the limiter
+	cache_read_tokens: int = 0  # input tokens the provider served from its prompt cache
+	cache_creation_tokens: int = 0  # input tokens the provider wrote to its prompt cache
+
+
+_call_stats: ContextVar[Optional[LLMCallStats]] = ContextVar('llm_call_stats', default=None)
+
+
+@dataclass
+class ProviderLimits:
+	"""
+	max_in_flight: Maximum number of concurrent requests to the provider, None for no limit
+	tokens_per_minute: Input token budget of the provider over a sliding 60 second window, None for no limit
+	"""
+
+	max_in_flight: Optional[int] = None
+	tokens_per_minute: Optional[int] = None
+
+
+class _ProviderState:
+	def __init__(self, limits: ProviderLimits):
+		self.limits = limits
+		self.semaphore = asyncio.Semaphore(limits.max_in_flight) if limits.max_in_flight else None
+		self.token_lock = asyncio.Lock()
+		self.sent: deque[tuple[float, int]] = deque()
+		self.sent_tokens = 0
+
+	def _expire(self, now: float) -> None:
+		while self.sent and self.sent[0][0] <= now - _TOKEN_WINDOW_SECONDS:
+			_, tokens = self.sent.popleft()
+			self.sent_tokens -= tokens
+
+	async def reserve_tokens(self, tokens: int) -> None:
+		budget = self.limits.tokens_per_minute
+		if not budget:
+			return
+		# one waiter at a time, so requests are served in order and a large one is not starved by small ones
+		async with self.token_lock:
+			while True:
+				now = time.monotonic()
+				self._expire(now)
+				# a request larger than the whole budget is sent alone
+				if self.sent_tokens + tokens <= budget or not self.sent:
+					break
+				await asyncio.sleep(self.sent[0][0] + _TOKEN_WINDOW_SECONDS - now)
+			self.sent.append((now, tokens))
+			self.sent_tokens += tokens
+
+
+class LLMLimiter:
+	"""
+	Every model call of the agent (actions, planner, validator) and of the controller (page extraction)
+	goes through `ainvoke`. Calls wait until their provider has a free slot and enough tokens
+	left in its per minute budget.
+
+	Providers are keyed by the chat model class name, e.g. `ChatOpenAI` or `ChatAnthropic`.
+	Providers without configured limits are not limited.
+
+	Semaphores are bound to an event loop, so the limiter keeps separate state per loop.
+	"""
+
+	def __init__(self, limits: Optional[dict[str, ProviderLimits]] = None):
+		self.limits: dict[str, ProviderLimits] = dict(limits or {})
+		self._states: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _ProviderState]] = (
+			weakref.WeakKeyDictionary()
+		)
+
+	def set_limits(self, provider: str, limits: ProviderLimits) -> None:
+		"""Set the limits of a provider - applies to calls started after this"""
+		self.limits[provider] = limits
+		for states in self._states.values():
+			states.pop(provider, None)
+
+	def _get_state(self, provider: str) -> Optional[_ProviderState]:
+		limits = self.limits.get(provider)
+		if limits is None or (not limits.max_in_flight and not limits.tokens_per_minute):
+			return None
+		states = self._states.setdefault(asyncio.get_running_loop(), {})
+		state = states.get(provider)
+		if state is None:
+			state = states[provider] = _ProviderState(limits)
+		return state
+
+	async def ainvoke(self, runnable: Runnable, input: Any, *, provider: str, tokens: int = 0) -> Any:
+		"""
+		Await `runnable.ainvoke(input)` once the provider has capacity.
+
+		tokens: estimated input tokens of the call, counted against the provider's tokens per minute
+		"""
+		state = self._get_state(provider)
+		if state is None:
+			response = await runnable.ainvoke(input)
+			_record_usage(response)
+			return response
+
+		queued_at = time.monotonic()
+		if state.semaphore is not None:
+			await state.semaphore.acquire()
+		try:
+			await state.reserve_tokens(tokens)
+			waited = time.monotonic() - queued_at
+			if waited > 0.5:
+				logger.debug(f'LLM call to {provider} waited {waited:.2f}s for the limiter')
+			_record_queue_time(waited)
+			response = await runnable.ainvoke(input)
+			_record_usage(response)
+			return response
+		finally:
+			if state.semaphore is not None:
+				state.semaphore.release()
+
+
+_default_limiter = LLMLimiter()
+
+
+def get_llm_limiter() -> LLMLimiter:
+	"""The process wide limiter used when no other limiter is passed"""
+	return _default_limiter
+
+
+def provider_name(llm: BaseChatModel) -> str:
+	return llm.__class__.__name__
+
+
+def estimate_tokens(text: str, characters_per_token: int = 3) -> int:
+	return len(text) // characters_per_token
+
+
+def _record_queue_time(seconds: float) -> None:
+	stats = _call_stats.get()
+	if stats is not None:
+		stats.queue_seconds += seconds
+
+
+def _record_usage(response: Any) -> None:
+	stats = _call_stats.get()
+	if stats is None:
+		return
+	# structured output runnables with include_raw=True return {'raw': AIMessage, 'parsed': ...}
+	message = response.get('raw') if isinstance(response, dict) else response
+	usage = getattr(message, 'usage_metadata', None) or {}
+	details = usage.get('input_token_details') or {}
+	stats.cache_read_tokens += details.get('cache_read') or 0
+	stats.cache_creation_tokens += details.get('cache_creation') or 0
+
+
+def track_llm_calls() -> LLMCallStats:
+	"""
+	Start summing the limiter wait and prompt cache usage of all calls made from the current task
+	(and tasks it creates from now on).
+	"""
+	stats = LLMCallStats()
+	_call_stats.set(stats)
+	return stats
@@ -0,0 +1,105 @@
+"""
+Rolling history compaction - old model outputs and action results are summarized into one memory message.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+from browser_use.agent.llm_limiter import get_llm_limiter, provider_name
+
+if TYPE_CHECKING:
+	from browser_use.agent.message_manager.service import MessageManager
+
+logger = logging.getLogger(__name__)
+
+MEMORY_MESSAGE_PREFIX = '[Memory of earlier steps]'
+
+COMPACTION_PROMPT = """You compress the history of a browser agent into a memory it will read instead of the history.
+You get the previous memory (if any) and the agent's steps since then: its evaluations, goals, actions and their results.
+Write the new memory as a concise list of facts:
+- the tasks the agent was given, verbatim
+- what was done and what was achieved, in order, with the pages (URLs) visited
+- every piece of information the agent extracted that may be needed for the task, verbatim - names, numbers, links
+- what failed and should not be retried the same way
+Do not invent anything. Return only the memory."""
+
+
+class HistoryCompactor:
+	"""
+	Keeps the input size of the agent roughly constant: once the task history (everything after the
+	preamble) exceeds `token_budget`, all but the last `keep_recent_messages` messages are summarized by
+	`llm` (a cheap model is enough) into one memory message. The next compaction folds the previous
+	memory into the new one.
+	"""
+
+	def __init__(self, llm: BaseChatModel, token_budget: int, keep_recent_messages: int = 10):
+		self.llm = llm
+		self.token_budget = token_budget
+		self.keep_recent_messages = keep_recent_messages
+
+	def compaction_range(self, message_manager: MessageManager) -> Optional[tuple[int, int]]:
+		"""Start and end index of the messages to summarize, None if the history is within budget"""
+		messages = message_manager.state.history.messages
+		# the system prompt is never summarized, even without a recorded preamble
+		start = max(message_manager.state.prefix_length, 1)
+		history_tokens = sum(m.metadata.tokens for m in messages[start:])
+		if history_tokens <= self.token_budget:
+			return None
+
+		end = len(messages) - self.keep_recent_messages
+		# a tool message must stay with the tool call it answers
+		while end < len(messages) and isinstance(messages[end].message, ToolMessage):
+			end += 1
+		if end - start < 2:
+			return None
+		return start, end
+
+	@staticmethod
+	def _format(message: BaseMessage) -> Optional[str]:
+		if isinstance(message, ToolMessage):
+			return None
+		if isinstance(message, AIMessage):
+			if message.tool_calls:
+				return '\n'.join(f'Agent: {json.dumps(tool_call["args"])}' for tool_call in message.tool_calls)
+			return f'Plan: {message.content}'
+		if isinstance(message.content, str):
+			return message.content
+		return '\n'.join(item['text'] for item in message.content if isinstance(item, dict) and 'text' in item)
+
+	async def compact(self, message_manager: MessageManager) -> bool:
+		"""Summarize the old part of the history if it is over budget, returns whether it was compacted"""
+		compaction_range = self.compaction_range(message_manager)
+		if compaction_range is None:
+			return False
+		start, end = compaction_range
+		old_messages = message_manager.state.history.messages[start:end]
+
+		transcript = '\n'.join(text for m in old_messages if (text := self._format(m.message)))
+		prompt = [SystemMessage(content=COMPACTION_PROMPT), HumanMessage(content=transcript)]
+		response = await get_llm_limiter().ainvoke(
+			self.llm,
+			prompt,
+			provider=provider_name(self.llm),
+			tokens=message_manager._count_text_tokens(transcript),
+		)
+		memory = str(response.content).strip()
+
+		# the history must not have changed while the model was summarizing
+		current = message_manager.state.history.messages[start:end]
+		if len(current) != len(old_messages) or any(a is not b for a, b in zip(current, old_messages)):
+			logger.debug('History changed during compaction, skipping')
+			return False
+
+		removed_tokens = sum(m.metadata.tokens for m in old_messages)
+		message_manager.replace_messages(start, end, HumanMessage(content=f'{MEMORY_MESSAGE_PREFIX}\n{memory}'))
+		logger.info(
+			f'Compacted {len(old_messages)} history messages ({removed_tokens} tokens) into memory '
+			f'({message_manager.state.history.messages[start].metadata.tokens} tokens)'
+		)
+		return True
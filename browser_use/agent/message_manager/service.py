@@ -12,6 +12,7 @@ from langchain_core.messages import (
 )
 from pydantic import BaseModel
 
+from browser_use.agent.message_manager.tokenizers import get_tokenizer, image_tokens, png_dimensions
 from browser_use.agent.message_manager.views import MessageMetadata
 from browser_use.agent.prompts import AgentMessagePrompt
 from browser_use.agent.views import ActionResult, AgentOutput, AgentStepInfo, MessageManagerState
@@ -20,15 +21,27 @@ from browser_use.utils import time_execution_sync
 
 logger = logging.getLogger(__name__)
 
+# Last message of the preamble, the task history follows it
+HISTORY_PLACEHOLDER = '[Your task history memory starts here]'
+FILE_PATHS_PREFIX = 'Here are file paths you can use:'
+
 
 class MessageManagerSettings(BaseModel):
 	max_input_tokens: int = 128000
+	# Picks the tokenizer and the image token formula, see tokenizers.py
+	model_name: Optional[str] = None
+	# Used if there is no tokenizer for the model
 	estimated_characters_per_token: int = 3
+	# Used for images whose size cannot be read
 	image_tokens: int = 800
 	include_attributes: list[str] = []
 	message_context: Optional[str] = None
 	sensitive_data: Optional[Dict[str, str]] = None
 	available_file_paths: Optional[List[str]] = None
+	# Keep the preamble byte-stable across steps for provider prefix caching
+	stable_prefix: bool = False
+	# Mark cache breakpoints with Anthropic style `cache_control` blocks - only for providers that support them
+	cache_control: bool = False
 
 
 class MessageManager:
@@ -43,10 +56,15 @@ class MessageManager:
 		self.settings = settings
 		self.state = state
 		self.system_prompt = system_message
+		self.tokenizer = get_tokenizer(settings.model_name, settings.estimated_characters_per_token)
+		self._token_counts: dict[tuple[Optional[str], int], int] = {}
 
 		# Only initialize messages if state is empty
 		if len(self.state.history.messages) == 0:
 			self._init_messages()
+		elif self.state.prefix_length == 0:
+			# state saved before the preamble length was recorded
+			self.state.prefix_length = self._find_prefix_length()
 
 	def _init_messages(self) -> None:
 		"""Initialize the message history with system message, context, task, and other initial messages"""
@@ -93,13 +111,30 @@ class MessageManager:
 		self._add_message_with_tokens(example_tool_call)
 		self.add_tool_message(content='Browser started')
 
-		placeholder_message = HumanMessage(content='[Your task history memory starts here]')
+		placeholder_message = HumanMessage(content=HISTORY_PLACEHOLDER)
 		self._add_message_with_tokens(placeholder_message)
 
 		if self.settings.available_file_paths:
-			filepaths_msg = HumanMessage(content=f'Here are file paths you can use: {self.settings.available_file_paths}')
+			filepaths_msg = HumanMessage(content=f'{FILE_PATHS_PREFIX} {self.settings.available_file_paths}')
 			self._add_message_with_tokens(filepaths_msg)
 
+		self.state.prefix_length = len(self.state.history.messages)
+
+	def _find_prefix_length(self) -> int:
+		"""
+		End of the preamble of an existing history - after the memory placeholder _init_messages adds, and the file
+		paths message that may follow it. Without the placeholder the whole history is taken as preamble, so
+		nothing of it is ever compacted away.
+		"""
+		messages = [m.message for m in self.state.history.messages]
+		for i, message in enumerate(messages):
+			if message.content == HISTORY_PLACEHOLDER:
+				end = i + 1
+				if end < len(messages) and str(messages[end].content).startswith(FILE_PATHS_PREFIX):
+					end += 1
+				return end
+		return len(messages)
+
 	def add_new_task(self, new_task: str) -> None:
 		content = f'Your new ultimate task is: """{new_task}""". Take the previous context into account and finish your new ultimate task. '
 		msg = HumanMessage(content=content)
@@ -172,6 +207,8 @@ class MessageManager:
 		"""Get current message list, potentially trimmed to max tokens"""
 
 		msg = [m.message for m in self.state.history.messages]
+		if self.settings.stable_prefix and self.settings.cache_control:
+			msg = self._with_cache_control(msg)
 		# debug which messages are in history with token count # log
 		total_input_tokens = 0
 		logger.debug(f'Messages in history: {len(self.state.history.messages)}:')
@@ -182,11 +219,53 @@ class MessageManager:
 
 		return msg
 
+	@staticmethod
+	def _is_cache_breakpoint_candidate(message: BaseMessage) -> bool:
+		if not isinstance(message, (HumanMessage, SystemMessage)):
+			return False
+		if isinstance(message.content, str):
+			return bool(message.content)
+		return any(isinstance(item, dict) and item.get('type') == 'text' and item.get('text') for item in message.content)
+
+	@staticmethod
+	def _mark_cache_breakpoint(message: BaseMessage) -> BaseMessage:
+		if isinstance(message.content, str):
+			content = [{'type': 'text', 'text': message.content, 'cache_control': {'type': 'ephemeral'}}]
+		else:
+			content = list(message.content)
+			last_text = max(
+				i for i, item in enumerate(content) if isinstance(item, dict) and item.get('type') == 'text' and item.get('text')
+			)
+			content[last_text] = {**content[last_text], 'cache_control': {'type': 'ephemeral'}}  # type: ignore
+		return message.model_copy(update={'content': content})
+
+	def _with_cache_control(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+		"""
+		Mark the end of the preamble and the end of the task history (before the current state message)
+		as cache breakpoints. The marked messages are copies, the history itself is not changed.
+		"""
+		breakpoints = [self.state.prefix_length - 1]
+		for i in range(len(messages) - 2, self.state.prefix_length - 1, -1):
+			if self._is_cache_breakpoint_candidate(messages[i]):
+				breakpoints.append(i)
+				break
+
+		messages = list(messages)
+		for i in breakpoints:
+			if 0 <= i < len(messages) and self._is_cache_breakpoint_candidate(messages[i]):
+				messages[i] = self._mark_cache_breakpoint(messages[i])
+		return messages
+
 	def _add_message_with_tokens(self, message: BaseMessage, position: int | None = None) -> None:
 		"""Add message with token count metadata
 		position: None for last, -1 for second last, etc.
 		"""
 
+		if self.settings.stable_prefix and position is not None:
+			index = position if position >= 0 else len(self.state.history.messages) + position
+			if index < self.state.prefix_length:
+				raise ValueError(f'Cannot insert a message at position {position} - it would change the stable prompt prefix')
+
 		# filter out sensitive data from the message
 		if self.settings.sensitive_data:
 			message = self._filter_sensitive_data(message)
@@ -218,12 +297,17 @@ class MessageManager:
 		return message
 
 	def _count_tokens(self, message: BaseMessage) -> int:
-		"""Count tokens in a message using the model's tokenizer"""
+		"""Count tokens in a message using the model's tokenizer - memoized by message id and content"""
+		key = (message.id, hash((message.type, repr(message.content), repr(getattr(message, 'tool_calls', None)))))
+		tokens = self._token_counts.get(key)
+		if tokens is not None:
+			return tokens
+
 		tokens = 0
 		if isinstance(message.content, list):
 			for item in message.content:
 				if 'image_url' in item:
-					tokens += self.settings.image_tokens
+					tokens += self._count_image_tokens(item)
 				elif isinstance(item, dict) and 'text' in item:
 					tokens += self._count_text_tokens(item['text'])
 		else:
@@ -231,12 +315,27 @@ class MessageManager:
 			if hasattr(message, 'tool_calls'):
 				msg += str(message.tool_calls)  # type: ignore
 			tokens += self._count_text_tokens(msg)
+
+		# estimates of a tokenizer that is still loading would outlive it
+		if getattr(self.tokenizer, 'estimating', False):
+			return tokens
+		if len(self._token_counts) >= 4096:
+			self._token_counts.clear()
+		self._token_counts[key] = tokens
 		return tokens
 
 	def _count_text_tokens(self, text: str) -> int:
 		"""Count tokens in a text string"""
-		tokens = len(text) // self.settings.estimated_characters_per_token  # Rough estimate if no tokenizer available
-		return tokens
+		return self.tokenizer.count(text)
+
+	def _count_image_tokens(self, item: dict | str) -> int:
+		"""Count tokens of an image content item from the size of the screenshot"""
+		image_url = item.get('image_url') if isinstance(item, dict) else None
+		url = image_url.get('url') if isinstance(image_url, dict) else image_url
+		dimensions = png_dimensions(url) if isinstance(url, str) else None
+		if dimensions is None:
+			return self.settings.image_tokens
+		return image_tokens(*dimensions, model_name=self.settings.model_name)
 
 	def cut_messages(self):
 		"""Get current message list, potentially trimmed to max tokens"""
@@ -252,11 +351,12 @@ class MessageManager:
 			for item in msg.message.content:
 				if 'image_url' in item:
 					msg.message.content.remove(item)
-					diff -= self.settings.image_tokens
-					msg.metadata.tokens -= self.settings.image_tokens
-					self.state.history.current_tokens -= self.settings.image_tokens
+					removed_tokens = self._count_image_tokens(item)
+					diff -= removed_tokens
+					msg.metadata.tokens -= removed_tokens
+					self.state.history.current_tokens -= removed_tokens
 					logger.debug(
-						f'Removed image with {self.settings.image_tokens} tokens - total tokens now: {self.state.history.current_tokens}/{self.settings.max_input_tokens}'
+						f'Removed image with {removed_tokens} tokens - total tokens now: {self.state.history.current_tokens}/{self.settings.max_input_tokens}'
 					)
 				elif 'text' in item and isinstance(item, dict):
 					text += item['text']
@@ -295,6 +395,13 @@ class MessageManager:
 			f'Added message with {last_msg.metadata.tokens} tokens - total tokens now: {self.state.history.current_tokens}/{self.settings.max_input_tokens} - total messages: {len(self.state.history.messages)}'
 		)
 
+	def replace_messages(self, start: int, end: int, message: BaseMessage) -> None:
+		"""Replace the history messages from start to end (exclusive) with one message, e.g. a summary of them"""
+		removed = self.state.history.messages[start:end]
+		self.state.history.current_tokens -= sum(m.metadata.tokens for m in removed)
+		del self.state.history.messages[start:end]
+		self._add_message_with_tokens(message, position=start)
+
 	def _remove_last_state_message(self) -> None:
 		"""Remove last state message from history"""
 		self.state.history.remove_last_state_message()
@@ -0,0 +1,158 @@
+"""
+Token counting per model family - exact tokenizers where one is available locally, a character estimate otherwise.
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import math
+import struct
+import threading
+from typing import Callable, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class Tokenizer(Protocol):
+	def count(self, text: str) -> int: ...
+
+
+class EstimateTokenizer:
+	"""Fallback for models without a local tokenizer"""
+
+	def __init__(self, characters_per_token: int = 3):
+		self.characters_per_token = characters_per_token
+
+	def count(self, text: str) -> int:
+		return len(text) // self.characters_per_token
+
+
+class TiktokenTokenizer:
+	"""OpenAI models - exact"""
+
+	def __init__(self, encoding_name: str):
+		import tiktoken
+
+		self.encoding = tiktoken.get_encoding(encoding_name)
+
+	def count(self, text: str) -> int:
+		return len(self.encoding.encode(text, disallowed_special=()))
+
+
+class HuggingFaceTokenizer:
+	"""
+	Open weight models - exact, needs the optional `tokenizers` package and the tokenizer files from the hub.
+	The files are downloaded on a background thread on the first count, until then (or if that fails) tokens are estimated.
+	"""
+
+	def __init__(self, repo_id: str, characters_per_token: int = 3):
+		import tokenizers  # noqa: F401 - without the package there is nothing to load
+
+		self.repo_id = repo_id
+		self.estimate = EstimateTokenizer(characters_per_token)
+		self.tokenizer = None
+		self._loader: Optional[threading.Thread] = None
+
+	def _load(self) -> None:
+		from tokenizers import Tokenizer as _Tokenizer
+
+		try:
+			self.tokenizer = _Tokenizer.from_pretrained(self.repo_id)
+		except Exception as e:
+			logger.debug(f'Failed to load tokenizer {self.repo_id}, estimating tokens: {e}')
+
+	@property
+	def estimating(self) -> bool:
+		"""Whether counts are estimates - callers must not memoize them"""
+		return self.tokenizer is None
+
+	def count(self, text: str) -> int:
+		if self.tokenizer is None:
+			if self._loader is None:
+				self._loader = threading.Thread(target=self._load, name=f'load-tokenizer-{self.repo_id}', daemon=True)
+				self._loader.start()
+			return self.estimate.count(text)
+		return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+# Matched by model name prefix, longest prefix first
+_TOKENIZER_FACTORIES: dict[str, Callable[[], Tokenizer]] = {
+	'gpt-4o': lambda: TiktokenTokenizer('o200k_base'),
+	'gpt-4.1': lambda: TiktokenTokenizer('o200k_base'),
+	'gpt-4.5': lambda: TiktokenTokenizer('o200k_base'),
+	'chatgpt-4o': lambda: TiktokenTokenizer('o200k_base'),
+	'o1': lambda: TiktokenTokenizer('o200k_base'),
+	'o3': lambda: TiktokenTokenizer('o200k_base'),
+	'o4': lambda: TiktokenTokenizer('o200k_base'),
+	'gpt-4': lambda: TiktokenTokenizer('cl100k_base'),
+	'gpt-3.5': lambda: TiktokenTokenizer('cl100k_base'),
+	'deepseek': lambda: HuggingFaceTokenizer('deepseek-ai/DeepSeek-V3'),
+	'qwen': lambda: HuggingFaceTokenizer('Qwen/Qwen2.5-7B-Instruct'),
+}
+
+_tokenizers: dict[str, Tokenizer] = {}
+
+
+def register_tokenizer(model_prefix: str, factory: Callable[[], Tokenizer]) -> None:
+	"""Use the tokenizer created by `factory` for all models whose name starts with `model_prefix`"""
+	_TOKENIZER_FACTORIES[model_prefix.lower()] = factory
+	_tokenizers.clear()
+
+
+def get_tokenizer(model_name: Optional[str], characters_per_token: int = 3) -> Tokenizer:
+	"""Tokenizer for a model - falls back to a character estimate if there is none or it cannot be loaded"""
+	name = (model_name or '').lower()
+	# provider prefixes like `openai/gpt-4o`
+	name = name.rsplit('/', 1)[-1]
+	# and region or provider prefixes of Bedrock model ids like `us.deepseek.r1-v1:0`, dropped one at a time
+	candidates = [name] + [name.split('.', i)[-1] for i in range(1, name.count('.') + 1)]
+	prefix = None
+	for candidate in candidates:
+		prefix = max((prefix for prefix in _TOKENIZER_FACTORIES if candidate.startswith(prefix)), key=len, default=None)
+		if prefix is not None:
+			break
+	if prefix is None:
+		return EstimateTokenizer(characters_per_token)
+
+	tokenizer = _tokenizers.get(prefix)
+	if tokenizer is None:
+		try:
+			tokenizer = _TOKENIZER_FACTORIES[prefix]()
+		except Exception as e:
+			logger.debug(f'No tokenizer for {model_name}, estimating tokens: {e}')
+			tokenizer = EstimateTokenizer(characters_per_token)
+		_tokenizers[prefix] = tokenizer
+	return tokenizer
+
+
+def png_dimensions(image_url: str) -> Optional[tuple[int, int]]:
+	"""Width and height of a base64 PNG data URL - only the header is decoded"""
+	if not image_url.startswith('data:image/png;base64,'):
+		return None
+	# signature (8 bytes) + IHDR length and type (8 bytes) + width and height (8 bytes)
+	header = image_url[len('data:image/png;base64,') :][:32]
+	try:
+		data = base64.b64decode(header)
+	except ValueError:
+		return None
+	if len(data) < 24 or data[:8] != b'\x89PNG\r\n\x1a\n' or data[12:16] != b'IHDR':
+		return None
+	width, height = struct.unpack('>II', data[16:24])
+	return width, height
+
+
+def image_tokens(width: int, height: int, model_name: Optional[str] = None) -> int:
+	"""Input tokens of an image of the given size, following the provider's published formula"""
+	name = (model_name or '').lower()
+	if 'claude' in name:
+		# scaled to at most 1568px on the long edge, then width * height / 750
+		scale = min(1.0, 1568 / max(width, height))
+		return math.ceil(width * scale * height * scale / 750)
+
+	# OpenAI high detail: fit into 2048x2048, scale the short side to 768, then 170 tokens per 512px tile plus 85
+	scale = min(1.0, 2048 / max(width, height))
+	width, height = width * scale, height * scale
+	scale = min(1.0, 768 / min(width, height))
+	width, height = width * scale, height * scale
+	return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
@@ -125,5 +125,6 @@ class MessageManagerState(BaseModel):
 
 	history: MessageHistory = Field(default_factory=MessageHistory)
 	tool_id: int = 1
+	prefix_length: int = 0  # Number of messages in the fixed preamble - system prompt, task and example tool call
 
 	model_config = ConfigDict(arbitrary_types_allowed=True)
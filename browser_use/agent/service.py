@@ -6,7 +6,7 @@ import logging
 import re
 import time
 from pathlib import Path
-from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Sequence, TypeVar
 
 from dotenv import load_dotenv
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -19,11 +19,17 @@ from langchain_core.messages import (
 # from lmnr.sdk.decorators import observe
 from pydantic import BaseModel, ValidationError
 
+from browser_use.agent.checkpoint import CheckpointJournal
 from browser_use.agent.gif import create_history_gif
+from browser_use.agent.history_file import HistoryReader, HistoryWriter
+from browser_use.agent.llm_cache import LLMCache, LLMCacheStats
+from browser_use.agent.llm_limiter import get_llm_limiter, provider_name, track_llm_calls
+from browser_use.agent.message_manager.compaction import HistoryCompactor
 from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
 from browser_use.agent.message_manager.utils import convert_input_messages, extract_json_from_model_output, save_conversation
 from browser_use.agent.prompts import AgentMessagePrompt, PlannerPrompt, SystemPrompt
 from browser_use.agent.views import (
+	NO_ACTION_TO_REPLAY,
 	ActionResult,
 	AgentError,
 	AgentHistory,
@@ -55,6 +61,14 @@ from browser_use.utils import time_execution_async, time_execution_sync
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Chat models that take Anthropic style `cache_control` breakpoints
+# others (OpenAI, DeepSeek, Gemini) cache prompt prefixes automatically
+CACHE_CONTROL_CHAT_MODELS = {'ChatAnthropic', 'ChatAnthropicVertex'}
+
+# Actions that only need the element itself - the fast replay state has no children or parents to walk.
+# Every other action with an index (e.g. custom upload actions) is replayed on the full state.
+FAST_REPLAY_ACTIONS = {'click_element', 'input_text', 'get_dropdown_options', 'select_dropdown_option'}
+
 
 def log_response(response: AgentOutput) -> None:
 	"""Utility function to log the model's response."""
@@ -124,6 +138,14 @@ class Agent(Generic[Context]):
 		page_extraction_llm: Optional[BaseChatModel] = None,
 		planner_llm: Optional[BaseChatModel] = None,
 		planner_interval: int = 1,  # Run planner every N steps
+		planner_pipelined: bool = False,
+		llm_cache: Optional[LLMCache] = None,
+		stable_prompt_prefix: bool = False,
+		compaction_llm: Optional[BaseChatModel] = None,
+		compaction_token_budget: int = 20000,
+		compaction_keep_recent_messages: int = 10,
+		checkpoint_path: Optional[str | Path] = None,
+		history_path: Optional[str | Path] = None,
 		# Inject state
 		injected_agent_state: Optional[AgentState] = None,
 		#
@@ -137,6 +159,8 @@ class Agent(Generic[Context]):
 		self.llm = llm
 		self.controller = controller
 		self.sensitive_data = sensitive_data
+		self.llm_cache = llm_cache
+		self.llm_cache_stats: Optional[LLMCacheStats] = None
 
 		self.settings = AgentSettings(
 			use_vision=use_vision,
@@ -158,6 +182,11 @@ class Agent(Generic[Context]):
 			page_extraction_llm=page_extraction_llm,
 			planner_llm=planner_llm,
 			planner_interval=planner_interval,
+			planner_pipelined=planner_pipelined,
+			stable_prompt_prefix=stable_prompt_prefix,
+			compaction_llm=compaction_llm,
+			compaction_token_budget=compaction_token_budget,
+			compaction_keep_recent_messages=compaction_keep_recent_messages,
 		)
 
 		# Initialize state
@@ -188,13 +217,30 @@ class Agent(Generic[Context]):
 			).get_system_message(),
 			settings=MessageManagerSettings(
 				max_input_tokens=self.settings.max_input_tokens,
+				model_name=self.model_name,
 				include_attributes=self.settings.include_attributes,
 				message_context=self.settings.message_context,
 				sensitive_data=sensitive_data,
 				available_file_paths=self.settings.available_file_paths,
+				stable_prefix=self.settings.stable_prompt_prefix,
+				cache_control=self.chat_model_library in CACHE_CONTROL_CHAT_MODELS,
 			),
 			state=self.state.message_manager_state,
 		)
+		self._compactor = (
+			HistoryCompactor(
+				self.settings.compaction_llm,
+				token_budget=self.settings.compaction_token_budget,
+				keep_recent_messages=self.settings.compaction_keep_recent_messages,
+			)
+			if self.settings.compaction_llm
+			else None
+		)
+		self._compaction_task: Optional[asyncio.Task] = None
+		self._planner_task: Optional[asyncio.Task] = None
+		self._checkpoint = CheckpointJournal(checkpoint_path) if checkpoint_path else None
+		# every history item is appended to this JSONL file as its step completes, see history_file.py
+		self._history_writer = HistoryWriter(history_path) if history_path else None
 
 		# Browser setup
 		self.injected_browser = browser is not None
@@ -330,16 +376,22 @@ class Agent(Generic[Context]):
 		result: list[ActionResult] = []
 		step_start_time = time.time()
 		tokens = 0
+		llm_call_stats = track_llm_calls()
 
 		try:
 			state = await self.browser_context.get_state()
 
 			await self._raise_if_stopped_or_paused()
 
+			await self._wait_for_compaction()
 			self._message_manager.add_state_message(state, self.state.last_result, step_info, self.settings.use_vision)
 
 			# Run planner at specified intervals if planner is configured
-			if self.settings.planner_llm and self.state.n_steps % self.settings.planner_interval == 0:
+			run_planner = self.settings.planner_llm is not None and self.state.n_steps % self.settings.planner_interval == 0
+			if self.settings.planner_pipelined:
+				# the plan of the previous state, computed while the model chose the previous actions
+				self._message_manager.add_plan(await self._wait_for_planner(), position=-1)
+			elif run_planner:
 				plan = await self._run_planner()
 				# add plan before last state message
 				self._message_manager.add_plan(plan, position=-1)
@@ -357,6 +409,9 @@ class Agent(Generic[Context]):
 			input_messages = self._message_manager.get_messages()
 			tokens = self._message_manager.state.history.current_tokens
 
+			if self.settings.planner_pipelined and run_planner:
+				self._planner_task = asyncio.create_task(self._run_planner(input_messages))
+
 			try:
 				model_output = await self.get_next_action(input_messages)
 
@@ -374,6 +429,8 @@ class Agent(Generic[Context]):
 				await self._raise_if_stopped_or_paused()
 
 				self._message_manager.add_model_output(model_output)
+				# summarize old history while the actions run
+				self._start_compaction()
 			except Exception as e:
 				# model call failed, remove last state message from history
 				self._message_manager._remove_last_state_message()
@@ -421,9 +478,62 @@ class Agent(Generic[Context]):
 					step_start_time=step_start_time,
 					step_end_time=step_end_time,
 					input_tokens=tokens,
+					llm_queue_seconds=llm_call_stats.queue_seconds,
+					cached_input_tokens=llm_call_stats.cache_read_tokens,
 				)
+				if llm_call_stats.cache_read_tokens or llm_call_stats.cache_creation_tokens:
+					logger.debug(
+						f'Prompt cache: {llm_call_stats.cache_read_tokens} input tokens read, '
+						f'{llm_call_stats.cache_creation_tokens} written'
+					)
 				self._make_history_item(model_output, state, result, metadata)
 
+			if self._checkpoint:
+				try:
+					self._checkpoint.append(self.state)
+				except Exception as e:
+					logger.warning(f'Failed to write checkpoint: {e}')
+
+	async def _report_late_downloads(self) -> None:
+		"""Downloads still being saved when the run ends are awaited and added to the result of the last action"""
+		if not self.browser_context.config.save_downloads_path or not self.state.history.history:
+			return
+		last_result = self.state.history.history[-1].result
+		if last_result:
+			try:
+				await self.controller.attach_downloads(last_result[-1], self.browser_context, wait=True)
+			except Exception as e:
+				logger.warning(f'Failed to collect downloads: {e}')
+
+	def _start_compaction(self) -> None:
+		if self._compactor is None or (self._compaction_task is not None and not self._compaction_task.done()):
+			return
+		if self._compactor.compaction_range(self._message_manager) is None:
+			return
+		self._compaction_task = asyncio.create_task(self._compactor.compact(self._message_manager))
+
+	async def _wait_for_compaction(self) -> None:
+		if self._compaction_task is None:
+			return
+		try:
+			await self._compaction_task
+		except Exception as e:
+			logger.warning(f'History compaction failed: {e}')
+		finally:
+			self._compaction_task = None
+
+	async def _wait_for_planner(self) -> Optional[str]:
+		"""Plan of the pipelined planner started in the previous step, None if there is none"""
+		if self._planner_task is None:
+			return None
+		try:
+			return await self._planner_task
+		except Exception as e:
+			logger.warning(f'Planner failed: {e}')
+			return None
+		finally:
+			self._planner_task = None
+
 	@time_execution_async('--handle_step_error (agent)')
 	async def _handle_step_error(self, error: Exception) -> list[ActionResult]:
 		"""Handle all types of errors that can occur during a step"""
@@ -484,6 +594,11 @@ class Agent(Generic[Context]):
 		history_item = AgentHistory(model_output=model_output, result=result, state=state_history, metadata=metadata)
 
 		self.state.history.history.append(history_item)
+		if self._history_writer:
+			try:
+				self._history_writer.append(history_item)
+			except Exception as e:
+				logger.warning(f'Failed to append step to history file: {e}')
 
 	THINK_TAGS = re.compile(r'<think>.*?</think>', re.DOTALL)
 	STRAY_CLOSE_TAG = re.compile(r'.*?</think>', re.DOTALL)
@@ -507,10 +622,29 @@ class Agent(Generic[Context]):
 	async def get_next_action(self, input_messages: list[BaseMessage]) -> AgentOutput:
 		"""Get next action from LLM based on current state"""
 		input_messages = self._convert_input_messages(input_messages)
+		limiter = get_llm_limiter()
+		provider = provider_name(self.llm)
+		tokens = self._message_manager.state.history.current_tokens
+
+		cache_key = None
+		if self.llm_cache is not None:
+			cache_key = self.llm_cache.make_key(
+				self.llm,
+				input_messages,
+				'next_action',
+				self.tool_calling_method,
+				self.settings.max_actions_per_step,
+				self.AgentOutput.model_json_schema(),
+			)
+			cached = await self.llm_cache.aget(cache_key)
+			if cached is not None:
+				parsed = self.AgentOutput.model_validate_json(cached)
+				log_response(parsed)
+				return parsed
 
 		if self.tool_calling_method == 'raw':
-			output = self.llm.invoke(input_messages)
-			# TODO: currently invoke does not return reasoning_content, we should override invoke
+			output = await limiter.ainvoke(self.llm, input_messages, provider=provider, tokens=tokens)
+			# TODO: currently ainvoke does not return reasoning_content, we should override ainvoke
 			output.content = self._remove_think_tags(str(output.content))
 			try:
 				parsed_json = extract_json_from_model_output(output.content)
@@ -521,11 +655,11 @@ class Agent(Generic[Context]):
 
 		elif self.tool_calling_method is None:
 			structured_llm = self.llm.with_structured_output(self.AgentOutput, include_raw=True)
-			response: dict[str, Any] = await structured_llm.ainvoke(input_messages)  # type: ignore
+			response: dict[str, Any] = await limiter.ainvoke(structured_llm, input_messages, provider=provider, tokens=tokens)  # type: ignore
 			parsed: AgentOutput | None = response['parsed']
 		else:
 			structured_llm = self.llm.with_structured_output(self.AgentOutput, include_raw=True, method=self.tool_calling_method)
-			response: dict[str, Any] = await structured_llm.ainvoke(input_messages)  # type: ignore
+			response: dict[str, Any] = await limiter.ainvoke(structured_llm, input_messages, provider=provider, tokens=tokens)  # type: ignore
 			parsed: AgentOutput | None = response['parsed']
 
 		if parsed is None:
@@ -535,6 +669,9 @@ class Agent(Generic[Context]):
 		if len(parsed.action) > self.settings.max_actions_per_step:
 			parsed.action = parsed.action[: self.settings.max_actions_per_step]
 
+		if cache_key is not None:
+			await self.llm_cache.aput(cache_key, parsed.model_dump_json(exclude_unset=True))
+
 		log_response(parsed)
 
 		return parsed
@@ -581,6 +718,7 @@ class Agent(Generic[Context]):
 	@time_execution_async('--run (agent)')
 	async def run(self, max_steps: int = 100) -> AgentHistoryList:
 		"""Execute the task with maximum number of steps"""
+		llm_cache_snapshot = LLMCacheStats(**vars(self.llm_cache.stats)) if self.llm_cache is not None else None
 		try:
 			self._log_agent_run()
 
@@ -620,6 +758,13 @@ class Agent(Generic[Context]):
 
 			return self.state.history
 		finally:
+			if self.llm_cache is not None and llm_cache_snapshot is not None:
+				self.llm_cache_stats = self.llm_cache.stats.since(llm_cache_snapshot)
+				logger.info(
+					f'LLM cache: {self.llm_cache_stats.hits} hits, {self.llm_cache_stats.misses} misses '
+					f'({self.llm_cache_stats.hit_rate:.0%} hit rate)'
+				)
+
 			self.telemetry.capture(
 				AgentEndTelemetryEvent(
 					agent_id=self.state.agent_id,
@@ -633,6 +778,15 @@ class Agent(Generic[Context]):
 				)
 			)
 
+			await self._report_late_downloads()
+
+			if self._compaction_task is not None:
+				self._compaction_task.cancel()
+				self._compaction_task = None
+			if self._planner_task is not None:
+				self._planner_task.cancel()
+				self._planner_task = None
+
 			if not self.injected_browser_context:
 				await self.browser_context.close()
 
@@ -662,7 +816,8 @@ class Agent(Generic[Context]):
 		await self.browser_context.remove_highlights()
 
 		for i, action in enumerate(actions):
-			if action.get_index() is not None and i != 0:
+			# without DOM mutations the selector map is still valid - only rebuild the state if the page changed
+			if action.get_index() is not None and i != 0 and await self.browser_context.dom_changed_since_state():
 				new_state = await self.browser_context.get_state()
 				new_path_hashes = set(e.hash.branch_path_hash for e in new_state.selector_map.values())
 				if check_for_new_elements and not new_path_hashes.issubset(cached_path_hashes):
@@ -681,6 +836,7 @@ class Agent(Generic[Context]):
 				self.sensitive_data,
 				self.settings.available_file_paths,
 				context=self.context,
+				llm_cache=self.llm_cache,
 			)
 
 			results.append(result)
@@ -727,9 +883,21 @@ class Agent(Generic[Context]):
 			is_valid: bool
 			reason: str
 
-		validator = self.llm.with_structured_output(ValidationResult, include_raw=True)
-		response: dict[str, Any] = await validator.ainvoke(msg)  # type: ignore
-		parsed: ValidationResult = response['parsed']
+		cache_key = self.llm_cache.make_key(self.llm, msg, 'validation') if self.llm_cache is not None else None
+		cached = await self.llm_cache.aget(cache_key) if cache_key is not None else None
+		if cached is not None:
+			parsed = ValidationResult.model_validate_json(cached)
+		else:
+			validator = self.llm.with_structured_output(ValidationResult, include_raw=True)
+			response: dict[str, Any] = await get_llm_limiter().ainvoke(
+				validator,
+				msg,
+				provider=provider_name(self.llm),
+				tokens=sum(self._message_manager._count_tokens(m) for m in msg),
+			)  # type: ignore
+			parsed: ValidationResult = response['parsed']
+			if cache_key is not None:
+				await self.llm_cache.aput(cache_key, parsed.model_dump_json())
 		is_valid = parsed.is_valid
 		if not is_valid:
 			logger.info(f'❌ Validator decision: {parsed.reason}')
@@ -752,19 +920,22 @@ class Agent(Generic[Context]):
 
 	async def rerun_history(
 		self,
-		history: AgentHistoryList,
+		history: AgentHistoryList | Sequence[AgentHistory],
 		max_retries: int = 3,
 		skip_failures: bool = True,
 		delay_between_actions: float = 2.0,
+		fast: bool = False,
 	) -> list[ActionResult]:
 		"""
 		Rerun a saved history of actions with error handling and retry logic.
 
 		Args:
-				history: The history to replay
+				history: The history to replay, or a lazy `HistoryReader`
 				max_retries: Maximum number of retries per action
 				skip_failures: Whether to skip failed actions or stop execution
 				delay_between_actions: Delay between actions in seconds
+				fast: Find the recorded elements by their css selector instead of extracting the DOM before every step,
+					and wait for the page to settle instead of `delay_between_actions`
 
 		Returns:
 				List of action results
@@ -775,10 +946,11 @@ class Agent(Generic[Context]):
 			self.state.last_result = result
 
 		results = []
+		steps = history.history if isinstance(history, AgentHistoryList) else history
 
-		for i, history_item in enumerate(history.history):
+		for i, history_item in enumerate(steps):
 			goal = history_item.model_output.current_state.next_goal if history_item.model_output else ''
-			logger.info(f'Replaying step {i + 1}/{len(history.history)}: goal: {goal}')
+			logger.info(f'Replaying step {i + 1}/{len(steps)}: goal: {goal}')
 
 			if (
 				not history_item.model_output
@@ -786,13 +958,16 @@ class Agent(Generic[Context]):
 				or history_item.model_output.action == [None]
 			):
 				logger.warning(f'Step {i + 1}: No action to replay, skipping')
-				results.append(ActionResult(error='No action to replay'))
+				results.append(ActionResult(error=NO_ACTION_TO_REPLAY))
 				continue
 
 			retry_count = 0
 			while retry_count < max_retries:
 				try:
-					result = await self._execute_history_step(history_item, delay_between_actions)
+					if fast:
+						result = await self._execute_history_step_fast(history_item)
+					else:
+						result = await self._execute_history_step(history_item, delay_between_actions)
 					results.extend(result)
 					break
 
@@ -832,6 +1007,50 @@ class Agent(Generic[Context]):
 		await asyncio.sleep(delay)
 		return result
 
+	async def _execute_history_step_fast(self, history_item: AgentHistory) -> list[ActionResult]:
+		"""
+		Execute a single step from history without extracting the DOM - the full state is only captured
+		for an element that its recorded css selector does not find.
+		"""
+		if not history_item.model_output:
+			raise ValueError('Invalid model output')
+
+		results = []
+		for i, action in enumerate(history_item.model_output.action):
+			historical_element = history_item.state.interacted_element[i]
+			index = action.get_index()
+			action_name = next(iter(action.model_dump(exclude_unset=True)), None)
+			if index is not None and (
+				historical_element is None
+				or action_name not in FAST_REPLAY_ACTIONS
+				or await self.browser_context.get_replay_state({index: historical_element}) is None
+			):
+				logger.debug(f'Action {i} ({action_name}) can not be replayed on its recorded selector, extracting the page')
+				state = await self.browser_context.get_state()
+				updated_action = await self._update_action_indices(historical_element, action, state)
+				if updated_action is None:
+					raise ValueError(f'Could not find matching element {i} in current page')
+				action = updated_action
+
+			await self._raise_if_stopped_or_paused()
+
+			result = await self.controller.act(
+				action,
+				self.browser_context,
+				self.settings.page_extraction_llm,
+				self.sensitive_data,
+				self.settings.available_file_paths,
+				context=self.context,
+				llm_cache=self.llm_cache,
+			)
+			results.append(result)
+			if result.is_done or result.error:
+				break
+
+			await self.browser_context.wait_for_quiescence()
+
+		return results
+
 	async def _update_action_indices(
 		self,
 		historical_element: Optional[DOMHistoryElement],
@@ -867,9 +1086,28 @@ class Agent(Generic[Context]):
 		"""
 		if not history_file:
 			history_file = 'AgentHistory.json'
+		if Path(history_file).suffix == '.jsonl':
+			# steps are read one at a time while replaying
+			return await self.rerun_history(HistoryReader(history_file, self.AgentOutput), **kwargs)
 		history = AgentHistoryList.load_from_file(history_file, self.AgentOutput)
 		return await self.rerun_history(history, **kwargs)
 
+	@classmethod
+	def resume_from(cls, journal: str | Path, task: str, llm: BaseChatModel, **kwargs) -> 'Agent':
+		"""
+		Rebuild an agent from the checkpoint journal of an interrupted run and keep appending to the journal.
+
+		Pass the same controller and settings as the interrupted run - its custom actions are needed to load
+		the history. `run(max_steps)` then runs up to max_steps more steps.
+		"""
+		agent = cls(task=task, llm=llm, checkpoint_path=journal, **kwargs)
+		state = CheckpointJournal.load_state(journal, agent.AgentOutput)
+		agent.state = state
+		agent._message_manager.state = state.message_manager_state
+		agent._checkpoint.seed(state)  # type: ignore
+		logger.info(f'Resuming agent {state.agent_id} at step {state.n_steps} from {journal}')
+		return agent
+
 	def save_history(self, file_path: Optional[str | Path] = None) -> None:
 		"""Save the history to a file"""
 		if not file_path:
@@ -913,16 +1151,19 @@ class Agent(Generic[Context]):
 
 		return converted_actions
 
-	async def _run_planner(self) -> Optional[str]:
-		"""Run the planner to analyze state and suggest next steps"""
+	async def _run_planner(self, input_messages: Optional[list[BaseMessage]] = None) -> Optional[str]:
+		"""Run the planner to analyze state and suggest next steps - on `input_messages` if given, else the current history"""
 		# Skip planning if no planner_llm is set
 		if not self.settings.planner_llm:
 			return None
 
+		if input_messages is None:
+			input_messages = self._message_manager.get_messages()
+
 		# Create planner message history using full message history
 		planner_messages = [
 			PlannerPrompt(self.controller.registry.get_prompt_description()).get_system_message(),
-			*self._message_manager.get_messages()[1:],  # Use full message history except the first
+			*input_messages[1:],  # Use full message history except the first
 		]
 
 		if not self.settings.use_vision_for_planner and self.settings.use_vision:
@@ -943,8 +1184,22 @@ class Agent(Generic[Context]):
 		planner_messages = convert_input_messages(planner_messages, self.planner_model_name)
 
 		# Get planner output
-		response = await self.settings.planner_llm.ainvoke(planner_messages)
-		plan = str(response.content)
+		cache_key = None
+		if self.llm_cache is not None:
+			cache_key = self.llm_cache.make_key(self.settings.planner_llm, planner_messages, 'plan')
+		cached = await self.llm_cache.aget(cache_key) if cache_key is not None else None
+		if cached is not None:
+			plan = cached
+		else:
+			response = await get_llm_limiter().ainvoke(
+				self.settings.planner_llm,
+				planner_messages,
+				provider=provider_name(self.settings.planner_llm),
+				tokens=sum(self._message_manager._count_tokens(m) for m in planner_messages),
+			)
+			plan = str(response.content)
+			if cache_key is not None:
+				await self.llm_cache.aput(cache_key, plan)
 		# if deepseek-reasoner, remove think tags
 		if self.planner_model_name and ('deepseek-r1' in self.planner_model_name or 'deepseek-reasoner' in self.planner_model_name):
 			plan = self._remove_think_tags(plan)
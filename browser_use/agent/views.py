@@ -58,6 +58,11 @@ class AgentSettings(BaseModel):
 	page_extraction_llm: Optional[BaseChatModel] = None
 	planner_llm: Optional[BaseChatModel] = None
 	planner_interval: int = 1  # Run planner every N steps
+	planner_pipelined: bool = False  # Plan concurrently with the action model - the plan is added to the next step
+	stable_prompt_prefix: bool = False  # Keep the preamble byte-stable for provider prefix caching
+	compaction_llm: Optional[BaseChatModel] = None
+	compaction_token_budget: int = 20000  # Summarize the task history once it exceeds this many tokens
+	compaction_keep_recent_messages: int = 10  # Messages at the end of the history that are never summarized
 
 
 class AgentState(BaseModel):
@@ -88,6 +93,10 @@ class AgentStepInfo:
 		return self.step_number >= self.max_steps - 1
 
 
+# error of the placeholder result rerun_history returns for a recorded step without actions
+NO_ACTION_TO_REPLAY = 'No action to replay'
+
+
 class ActionResult(BaseModel):
 	"""Result of executing an action"""
 
@@ -105,6 +114,8 @@ class StepMetadata(BaseModel):
 	step_end_time: float
 	input_tokens: int  # Approximate tokens from message manager for this step
 	step_number: int
+	llm_queue_seconds: float = 0.0  # Time LLM calls of this step waited for the shared limiter
+	cached_input_tokens: int = 0  # Input tokens the provider served from its prompt cache, from the response usage
 
 	@property
 	def duration_seconds(self) -> float:
@@ -173,6 +184,18 @@ class AgentHistory(BaseModel):
 				elements.append(None)
 		return elements
 
+	@classmethod
+	def load_from_dict(cls, data: Dict[str, Any], output_model: Type[AgentOutput]) -> 'AgentHistory':
+		"""Load one item of `model_dump`, validating the actions with `output_model` to enrich them with custom actions"""
+		if data['model_output']:
+			if isinstance(data['model_output'], dict):
+				data['model_output'] = output_model.model_validate(data['model_output'])
+			else:
+				data['model_output'] = None
+		if 'interacted_element' not in data['state']:
+			data['state']['interacted_element'] = None
+		return cls.model_validate(data)
+
 	def model_dump(self, **kwargs) -> Dict[str, Any]:
 		"""Custom serialization handling circular references"""
 
@@ -218,6 +241,14 @@ class AgentHistoryList(BaseModel):
 				total += h.metadata.input_tokens
 		return total
 
+	def total_cached_input_tokens(self) -> int:
+		"""Get total input tokens served from the provider's prompt cache across all steps"""
+		total = 0
+		for h in self.history:
+			if h.metadata:
+				total += h.metadata.cached_input_tokens
+		return total
+
 	def input_token_usage(self) -> list[int]:
 		"""Get token usage for each step"""
 		return [h.metadata.input_tokens for h in self.history if h.metadata]
@@ -231,7 +262,12 @@ class AgentHistoryList(BaseModel):
 		return self.__str__()
 
 	def save_to_file(self, filepath: str | Path) -> None:
-		"""Save history to JSON file with proper serialization"""
+		"""Save history to JSON file with proper serialization - `.jsonl` files get one step per line, see history_file.py"""
+		if Path(filepath).suffix == '.jsonl':
+			from browser_use.agent.history_file import HistoryWriter
+
+			HistoryWriter(filepath, overwrite=True).write(self)
+			return
 		try:
 			Path(filepath).parent.mkdir(parents=True, exist_ok=True)
 			data = self.model_dump()
@@ -248,20 +284,14 @@ class AgentHistoryList(BaseModel):
 
 	@classmethod
 	def load_from_file(cls, filepath: str | Path, output_model: Type[AgentOutput]) -> 'AgentHistoryList':
-		"""Load history from JSON file"""
+		"""Load history from JSON file - use `HistoryReader` to iterate `.jsonl` files without loading them"""
+		if Path(filepath).suffix == '.jsonl':
+			from browser_use.agent.history_file import HistoryReader
+
+			return HistoryReader(filepath, output_model, load_screenshots=True).to_history_list()
 		with open(filepath, 'r', encoding='utf-8') as f:
 			data = json.load(f)
-		# loop through history and validate output_model actions to enrich with custom actions
-		for h in data['history']:
-			if h['model_output']:
-				if isinstance(h['model_output'], dict):
-					h['model_output'] = output_model.model_validate(h['model_output'])
-				else:
-					h['model_output'] = None
-			if 'interacted_element' not in h['state']:
-				h['state']['interacted_element'] = None
-		history = cls.model_validate(data)
-		return history
+		return cls(history=[AgentHistory.load_from_dict(h, output_model) for h in data['history']])
 
 	def last_action(self) -> None | dict:
 		"""Last action in history"""
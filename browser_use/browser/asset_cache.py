@@ -0,0 +1,165 @@
+"""
+In-process static asset cache shared by all contexts of a Browser.
+"""
+
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from playwright.async_api import Route
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_RESOURCE_TYPES = {'script', 'stylesheet', 'font'}
+
+# The body we store is already decoded, so these must not be replayed
+_STRIPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'}
+
+_MAX_AGE_PATTERN = re.compile(r'(?:^|,)\s*(?:s-maxage|max-age)\s*=\s*"?(\d+)"?', re.IGNORECASE)
+
+
+@dataclass
+class CachedAsset:
+	status: int
+	headers: dict[str, str]
+	body: bytes
+	expires_at: float
+
+	@property
+	def size(self) -> int:
+		return len(self.body)
+
+
+@dataclass
+class AssetCacheStats:
+	hits: int = 0
+	misses: int = 0
+	stored: int = 0
+	evictions: int = 0
+	bytes_served: int = 0
+
+	@property
+	def hit_rate(self) -> float:
+		total = self.hits + self.misses
+		return self.hits / total if total else 0.0
+
+
+@dataclass
+class AssetCache:
+	"""
+	Size bounded LRU cache for static responses (scripts, stylesheets, fonts).
+
+	Plugged into every context with `context.route`. Only GET responses with explicit freshness
+	(`Cache-Control: max-age` or `Expires`) are stored and they are served until they expire.
+
+	@dev routing a request disables the browser's own HTTP cache for it - this cache replaces it
+	for the asset types above and shares it across contexts.
+	"""
+
+	max_bytes: int
+	max_asset_bytes: Optional[int] = None
+	stats: AssetCacheStats = field(default_factory=AssetCacheStats)
+
+	def __post_init__(self):
+		if self.max_asset_bytes is None:
+			self.max_asset_bytes = self.max_bytes // 4
+		self._entries: OrderedDict[str, CachedAsset] = OrderedDict()
+		self._size = 0
+
+	@property
+	def size_bytes(self) -> int:
+		return self._size
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def get(self, key: str) -> Optional[CachedAsset]:
+		asset = self._entries.get(key)
+		if asset is None:
+			return None
+		if asset.expires_at <= time.time():
+			self._remove(key)
+			return None
+		self._entries.move_to_end(key)
+		return asset
+
+	def put(self, key: str, asset: CachedAsset) -> bool:
+		if self.max_asset_bytes is not None and asset.size > self.max_asset_bytes:
+			return False
+		if key in self._entries:
+			self._remove(key)
+		self._entries[key] = asset
+		self._size += asset.size
+		self.stats.stored += 1
+		while self._size > self.max_bytes and self._entries:
+			oldest_key = next(iter(self._entries))
+			self._remove(oldest_key)
+			self.stats.evictions += 1
+		return True
+
+	def _remove(self, key: str) -> None:
+		asset = self._entries.pop(key)
+		self._size -= asset.size
+
+	@staticmethod
+	def freshness_lifetime(status: int, headers: dict[str, str]) -> Optional[float]:
+		"""Seconds the response may be reused, None if it must not be cached"""
+		if status != 200:
+			return None
+		if 'set-cookie' in headers or headers.get('vary', '').strip() == '*':
+			return None
+
+		cache_control = headers.get('cache-control', '').lower()
+		if any(directive in cache_control for directive in ('no-store', 'no-cache', 'private')):
+			return None
+
+		match = _MAX_AGE_PATTERN.search(cache_control)
+		if match:
+			max_age = int(match.group(1))
+			return float(max_age) if max_age > 0 else None
+
+		if 'expires' in headers:
+			try:
+				lifetime = parsedate_to_datetime(headers['expires']).timestamp() - time.time()
+			except (TypeError, ValueError):
+				return None
+			return lifetime if lifetime > 0 else None
+
+		return None
+
+	async def handle_route(self, route: Route) -> None:
+		"""`context.route` handler - serve from cache or fetch and store"""
+		request = route.request
+		if request.method != 'GET' or request.resource_type not in CACHEABLE_RESOURCE_TYPES:
+			await route.fallback()
+			return
+
+		# CORS headers in the cached response depend on the requesting origin
+		key = f'{request.headers.get("origin", "")} {request.url}'
+
+		asset = self.get(key)
+		if asset is not None:
+			self.stats.hits += 1
+			self.stats.bytes_served += asset.size
+			await route.fulfill(status=asset.status, headers=asset.headers, body=asset.body)
+			return
+
+		self.stats.misses += 1
+		try:
+			response = await route.fetch()
+			body = await response.body()
+		except Exception as e:
+			logger.debug(f'Asset cache fetch failed for {request.url}: {e}')
+			await route.fallback()
+			return
+
+		headers = {k.lower(): v for k, v in response.headers.items() if k.lower() not in _STRIPPED_HEADERS}
+		lifetime = self.freshness_lifetime(response.status, {k.lower(): v for k, v in response.headers.items()})
+		if lifetime is not None:
+			self.put(key, CachedAsset(status=response.status, headers=headers, body=body, expires_at=time.time() + lifetime))
+
+		await route.fulfill(status=response.status, headers=headers, body=body)
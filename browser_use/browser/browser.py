@@ -5,16 +5,21 @@ Playwright browser on steroids.
 import asyncio
 import gc
 import logging
-from dataclasses import dataclass, field
+import os
+import weakref
+from dataclasses import dataclass, field, replace
 
 from playwright._impl._api_structures import ProxySettings
 from playwright.async_api import Browser as PlaywrightBrowser
+from playwright.async_api import BrowserContext as PlaywrightBrowserContext
 from playwright.async_api import (
 	Playwright,
 	async_playwright,
 )
 
+from browser_use.browser.asset_cache import AssetCache
 from browser_use.browser.context import BrowserContext, BrowserContextConfig
+from browser_use.browser.presets import LaunchPreset, LaunchPresetName, get_launch_preset
 from browser_use.utils import time_execution_async
 
 logger = logging.getLogger(__name__)
@@ -44,6 +49,31 @@ class BrowserConfig:
 		chrome_instance_path: None
 			Path to a Chrome instance to use to connect to your normal browser
 			e.g. '/Applications/Google\ Chrome.app/Contents/MacOS/Google\ Chrome'
+
+		asset_cache_size_mb: 0
+			Size of the in-process static asset cache (scripts, stylesheets, fonts) shared by all contexts
+			of this browser. 0 disables it.
+
+		user_data_dir: None
+			Base directory for managed persistent profiles. If set, the browser is launched with a persistent
+			profile in `{user_data_dir}/{profile_name}`, so the HTTP disk cache, service workers and the V8
+			code cache survive across runs. All BrowserContexts of the browser share the profile, each one in
+			tabs of its own.
+
+		profile_name: 'default'
+			Profile directory inside `user_data_dir`. Chromium locks a profile, so every concurrently running
+			browser (e.g. one per worker) needs its own.
+
+		disk_cache_size_mb: 512
+			Cap for the disk cache of the persistent profile
+
+		share_playwright_driver: False
+			Reuse one Playwright driver process for all browsers of the same event loop that set it, instead of starting
+			one per browser
+
+		preset: None
+			Named launch preset for headless throughput ('throughput' or 'low_memory'), see browser_use/browser/presets.py
+			for their memory and CPU profiles. Adds Chromium args and a smaller default viewport, extra_chromium_args still win.
 	"""
 
 	headless: bool = False
@@ -56,9 +86,56 @@ class BrowserConfig:
 	proxy: ProxySettings | None = field(default=None)
 	new_context_config: BrowserContextConfig = field(default_factory=BrowserContextConfig)
 
+	asset_cache_size_mb: int = 0
+
+	user_data_dir: str | None = None
+	profile_name: str = 'default'
+	disk_cache_size_mb: int = 512
+
+	share_playwright_driver: bool = False
+
+	preset: LaunchPresetName | None = None
+
 	_force_keep_browser_alive: bool = False
 
 
+@dataclass
+class _SharedDriver:
+	playwright: Playwright
+	users: int = 0
+
+
+# Playwright objects are bound to the event loop they were created on, so there is one shared driver per loop
+_shared_drivers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _SharedDriver] = weakref.WeakKeyDictionary()
+_shared_driver_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = weakref.WeakKeyDictionary()
+
+
+async def acquire_playwright() -> Playwright:
+	"""Get the Playwright driver of the running event loop, starting it on first use"""
+	loop = asyncio.get_running_loop()
+	lock = _shared_driver_locks.setdefault(loop, asyncio.Lock())
+	async with lock:
+		driver = _shared_drivers.get(loop)
+		if driver is None:
+			driver = _SharedDriver(playwright=await async_playwright().start())
+			_shared_drivers[loop] = driver
+		driver.users += 1
+		return driver.playwright
+
+
+async def release_playwright(playwright: Playwright) -> None:
+	"""Release a driver from acquire_playwright - it is stopped when its last user releases it"""
+	loop = asyncio.get_running_loop()
+	driver = _shared_drivers.get(loop)
+	if driver is None or driver.playwright is not playwright:
+		await playwright.stop()
+		return
+	driver.users -= 1
+	if driver.users <= 0:
+		del _shared_drivers[loop]
+		await playwright.stop()
+
+
 # @singleton: TODO - think about id singleton makes sense here
 # @dev By default this is a singleton, but you can create multiple instances if you need to.
 class Browser:
@@ -74,9 +151,38 @@ class Browser:
 		config: BrowserConfig = BrowserConfig(),
 	):
 		logger.debug('Initializing new browser')
+
+		self.launch_preset: LaunchPreset | None = get_launch_preset(config.preset) if config.preset else None
+		if self.launch_preset and self.launch_preset.viewport:
+			# the preset viewport only replaces the default one, never an explicitly configured size
+			if config.new_context_config.browser_window_size == BrowserContextConfig().browser_window_size:
+				config = replace(
+					config,
+					new_context_config=replace(config.new_context_config, browser_window_size=dict(self.launch_preset.viewport)),
+				)
+
 		self.config = config
 		self.playwright: Playwright | None = None
 		self.playwright_browser: PlaywrightBrowser | None = None
+		self.playwright_persistent_context: PlaywrightBrowserContext | None = None
+		# concurrent BrowserContexts must not launch the persistent profile twice
+		self._persistent_context_lock = asyncio.Lock()
+		# Playwright contexts the browser-wide routes and init scripts are installed on - a persistent or CDP context
+		# is shared by all BrowserContexts of the browser and must get them only once
+		self._prepared_contexts: weakref.WeakSet[PlaywrightBrowserContext] = weakref.WeakSet()
+		self._change_tracked_contexts: weakref.WeakSet[PlaywrightBrowserContext] = weakref.WeakSet()
+		self._uses_shared_driver = False
+
+		# set for browsers handed out by get_shared_browser
+		self._shared_key: str | None = None
+		self._shared_users = 0
+
+		# None without a persistent profile, otherwise whether the profile existed before launch
+		self.profile_warm: bool | None = None
+
+		self.asset_cache: AssetCache | None = None
+		if self.config.asset_cache_size_mb > 0:
+			self.asset_cache = AssetCache(max_bytes=self.config.asset_cache_size_mb * 1024 * 1024)
 
 		self.disable_security_args = []
 		if self.config.disable_security:
@@ -86,9 +192,9 @@ class Browser:
 				'--disable-features=IsolateOrigins,site-per-process',
 			]
 
-	async def new_context(self, config: BrowserContextConfig = BrowserContextConfig()) -> BrowserContext:
-		"""Create a browser context"""
-		return BrowserContext(config=config, browser=self)
+	async def new_context(self, config: BrowserContextConfig | None = None) -> BrowserContext:
+		"""Create a browser context, with the browser's new_context_config by default"""
+		return BrowserContext(config=config or self.config.new_context_config, browser=self)
 
 	async def get_playwright_browser(self) -> PlaywrightBrowser:
 		"""Get a browser context"""
@@ -100,7 +206,7 @@ class Browser:
 	@time_execution_async('--init (browser)')
 	async def _init(self):
 		"""Initialize the browser session"""
-		playwright = await async_playwright().start()
+		playwright = await self._start_playwright()
 		browser = await self._setup_browser(playwright)
 
 		self.playwright = playwright
@@ -108,6 +214,72 @@ class Browser:
 
 		return self.playwright_browser
 
+	async def _start_playwright(self) -> Playwright:
+		if self.config.share_playwright_driver:
+			self._uses_shared_driver = True
+			return await acquire_playwright()
+		return await async_playwright().start()
+
+	async def _stop_playwright(self, playwright: Playwright) -> None:
+		if self._uses_shared_driver:
+			self._uses_shared_driver = False
+			await release_playwright(playwright)
+		else:
+			await playwright.stop()
+
+	@property
+	def profile_dir(self) -> str | None:
+		"""Directory of the persistent profile, None if persistent profiles are not used"""
+		if not self.config.user_data_dir:
+			return None
+		return os.path.join(self.config.user_data_dir, self.config.profile_name)
+
+	async def get_persistent_context(self) -> PlaywrightBrowserContext:
+		"""Get the context of the persistent profile, launching it if needed"""
+		async with self._persistent_context_lock:
+			if self.playwright_persistent_context is None:
+				if self.playwright is None:
+					self.playwright = await self._start_playwright()
+				self.playwright_persistent_context = await self._setup_persistent_context(self.playwright)
+				self.playwright_browser = self.playwright_persistent_context.browser
+			return self.playwright_persistent_context
+
+	@time_execution_async('--init (persistent context)')
+	async def _setup_persistent_context(self, playwright: Playwright) -> PlaywrightBrowserContext:
+		"""Launches Chromium with a persistent profile directory and a capped disk cache."""
+		profile_dir = self.profile_dir
+		if not profile_dir:
+			raise ValueError('user_data_dir is required')
+
+		self.profile_warm = os.path.isdir(profile_dir) and len(os.listdir(profile_dir)) > 0
+		os.makedirs(profile_dir, exist_ok=True)
+		logger.info(f'Launching browser with {"warm" if self.profile_warm else "cold"} profile {profile_dir}')
+
+		context_config = self.config.new_context_config
+		context = await playwright.chromium.launch_persistent_context(
+			profile_dir,
+			headless=self.config.headless,
+			# the persistent context needs its startup window as initial page
+			args=[arg for arg in self._get_launch_args() if arg != '--no-startup-window']
+			+ [f'--disk-cache-size={self.config.disk_cache_size_mb * 1024 * 1024}'],
+			proxy=self.config.proxy,
+			viewport=context_config.browser_window_size,
+			no_viewport=False,
+			user_agent=context_config.user_agent,
+			java_script_enabled=True,
+			bypass_csp=context_config.disable_security,
+			ignore_https_errors=context_config.disable_security,
+			record_video_dir=context_config.save_recording_path,
+			record_video_size=context_config.browser_window_size,
+			locale=context_config.locale,
+		)
+		context.on('close', self._on_persistent_context_close)
+		return context
+
+	def _on_persistent_context_close(self, context: PlaywrightBrowserContext) -> None:
+		if context is self.playwright_persistent_context:
+			self.playwright_persistent_context = None
+
 	async def _setup_cdp(self, playwright: Playwright) -> PlaywrightBrowser:
 		"""Sets up and returns a Playwright Browser instance with anti-detection measures."""
 		if not self.config.cdp_url:
@@ -179,11 +351,10 @@ class Browser:
 				' To start chrome in Debug mode, you need to close all existing Chrome instances and try again otherwise we can not connect to the instance.'
 			)
 
-	async def _setup_standard_browser(self, playwright: Playwright) -> PlaywrightBrowser:
-		"""Sets up and returns a Playwright Browser instance with anti-detection measures."""
-		browser = await playwright.chromium.launch(
-			headless=self.config.headless,
-			args=[
+	def _get_launch_args(self) -> list[str]:
+		"""Chromium args for browsers launched by us"""
+		return (
+			[
 				'--no-sandbox',
 				'--disable-blink-features=AutomationControlled',
 				'--disable-infobars',
@@ -200,7 +371,15 @@ class Browser:
 				# '--window-size=1280,1000',
 			]
 			+ self.disable_security_args
-			+ self.config.extra_chromium_args,
+			+ list(self.launch_preset.args if self.launch_preset else ())
+			+ self.config.extra_chromium_args
+		)
+
+	async def _setup_standard_browser(self, playwright: Playwright) -> PlaywrightBrowser:
+		"""Sets up and returns a Playwright Browser instance with anti-detection measures."""
+		browser = await playwright.chromium.launch(
+			headless=self.config.headless,
+			args=self._get_launch_args(),
 			proxy=self.config.proxy,
 		)
 		# convert to Browser
@@ -223,19 +402,36 @@ class Browser:
 
 	async def close(self):
 		"""Close the browser instance"""
+		if self._shared_key is not None:
+			# shared browser - only the last user really closes it
+			self._shared_users -= 1
+			if self._shared_users > 0:
+				return
+			_shared_browsers.pop(self._shared_key, None)
+			self._shared_key = None
+		if self.asset_cache is not None:
+			stats = self.asset_cache.stats
+			logger.debug(
+				f'Asset cache: {stats.hits} hits, {stats.misses} misses ({stats.hit_rate:.0%} hit rate), '
+				f'{stats.bytes_served / 1024 / 1024:.1f} MB served from cache'
+			)
 		try:
 			if not self.config._force_keep_browser_alive:
+				if self.playwright_persistent_context:
+					# closing the persistent context flushes the profile (and its caches) to disk
+					await self.playwright_persistent_context.close()
 				if self.playwright_browser:
 					await self.playwright_browser.close()
 					del self.playwright_browser
 				if self.playwright:
-					await self.playwright.stop()
+					await self._stop_playwright(self.playwright)
 					del self.playwright
 
 		except Exception as e:
 			logger.debug(f'Failed to close browser properly: {e}')
 		finally:
 			self.playwright_browser = None
+			self.playwright_persistent_context = None
 			self.playwright = None
 
 			gc.collect()
@@ -251,3 +447,26 @@ class Browser:
 					asyncio.run(self.close())
 		except Exception as e:
 			logger.debug(f'Failed to cleanup browser in destructor: {e}')
+
+
+_shared_browsers: dict[str, Browser] = {}
+
+
+def get_shared_browser(config: BrowserConfig | None = None) -> Browser:
+	"""
+	Get a Browser that is shared by everyone asking for an equal config, so Chromium is launched once
+	and every agent only creates its own (isolated) context on it.
+
+	Every call must be paired with a `close()` - Chromium is closed when the last user closes it.
+
+	@dev the shared browser is bound to the event loop it is first used on
+	"""
+	config = config or BrowserConfig()
+	key = repr(config)
+	browser = _shared_browsers.get(key)
+	if browser is None:
+		browser = Browser(config=config)
+		browser._shared_key = key
+		_shared_browsers[key] = browser
+	browser._shared_users += 1
+	return browser
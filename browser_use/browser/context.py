@@ -5,32 +5,42 @@ Playwright browser on steroids.
 import asyncio
 import base64
 import gc
-import json
 import logging
 import os
 import re
 import time
 import uuid
+import weakref
+from collections import deque
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Optional, TypedDict
+from typing import TYPE_CHECKING, Literal, Optional, TypedDict
 
-from playwright._impl._errors import TimeoutError
 from playwright.async_api import Browser as PlaywrightBrowser
 from playwright.async_api import (
 	BrowserContext as PlaywrightBrowserContext,
 )
 from playwright.async_api import (
+	Download,
 	ElementHandle,
+	Frame,
 	FrameLocator,
 	Page,
 )
 
+from browser_use.browser.cookies import CookiePersister
+from browser_use.browser.domain_policy import DomainPolicy
+from browser_use.browser.storage_state import StorageStateStore
 from browser_use.browser.views import (
 	BrowserError,
 	BrowserState,
+	PageFingerprint,
+	PageLoadTiming,
 	TabInfo,
 	URLNotAllowedError,
 )
+from browser_use.browser.watchdog import MemoryWatchdog
+from browser_use.dom.highlights import draw_highlights
+from browser_use.dom.history_tree_processor.view import DOMHistoryElement
 from browser_use.dom.service import DomService
 from browser_use.dom.views import DOMElementNode, SelectorMap
 from browser_use.utils import time_execution_async, time_execution_sync
@@ -46,6 +56,88 @@ class BrowserContextWindowSize(TypedDict):
 	height: int
 
 
+MAX_PAGE_LOAD_TIMINGS = 100
+
+# Name of the symbol the change tracker exposes its counters under - random per process, so pages can not look it up
+CHANGE_TRACKER_KEY = f'__{uuid.uuid4().hex}'
+
+# Counts DOM mutations (ignoring our own highlights) and user input of a document and its shadow roots,
+# see get_page_fingerprint. Runs in every frame, each document gets a random id. Nothing of it is visible to the
+# page by name: the counters live in a closure read through a non-enumerable symbol property, and the patched
+# attachShadow and Function.prototype.toString look like the native functions.
+CHANGE_TRACKER_SCRIPT = (
+	"""
+(() => {
+	const key = Symbol.for('CHANGE_TRACKER_KEY');
+	if (window[key]) return;
+	const changes = { document: Math.random().toString(36).slice(2), mutations: 0, interactions: 0 };
+	Object.defineProperty(window, key, { value: () => [changes.document, changes.mutations, changes.interactions] });
+
+	const HIGHLIGHT_CONTAINER_ID = 'playwright-highlight-container';
+	const isOwnNode = (node) => node && node.id === HIGHLIGHT_CONTAINER_ID;
+	const isInHighlights = (node) => {
+		const element = node && (node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement);
+		return !!(element && element.closest && element.closest('#' + HIGHLIGHT_CONTAINER_ID));
+	};
+
+	const observer = new MutationObserver((records) => {
+		for (const record of records) {
+			if (record.attributeName === 'browser-user-highlight-id' || isInHighlights(record.target)) continue;
+			if (record.type === 'childList') {
+				const nodes = [...record.addedNodes, ...record.removedNodes];
+				if (nodes.length > 0 && nodes.every(isOwnNode)) continue;
+			}
+			changes.mutations++;
+		}
+	});
+	const countInteraction = () => { changes.interactions++; };
+	const observe = (root) => {
+		observer.observe(root, { subtree: true, childList: true, attributes: true, characterData: true });
+		// input values, focus and scrolling of inner containers are not DOM mutations but change the screenshot
+		for (const type of ['input', 'change', 'focusin', 'scroll']) {
+			root.addEventListener(type, countInteraction, { capture: true, passive: true });
+		}
+	};
+	const observeOpenShadowRoots = (root) => {
+		for (const element of root.querySelectorAll('*')) {
+			if (element.shadowRoot) {
+				observe(element.shadowRoot);
+				observeOpenShadowRoots(element.shadowRoot);
+			}
+		}
+	};
+
+	observe(document);
+	// a shadow root is a tree of its own that the document observer does not see into - observe each one
+	// as it is attached, declarative ones (parsed from <template shadowrootmode>) once the document is loaded.
+	// The proxies keep name, length and the missing prototype of the native functions, toString maps them back.
+	const natives = new WeakMap();
+	const attachShadow = Element.prototype.attachShadow;
+	const attachShadowProxy = new Proxy(attachShadow, {
+		apply(target, thisArg, args) {
+			const root = Reflect.apply(target, thisArg, args);
+			observe(root);
+			return root;
+		},
+	});
+	const toString = Function.prototype.toString;
+	const toStringProxy = new Proxy(toString, {
+		apply(target, thisArg, args) {
+			return Reflect.apply(target, natives.get(thisArg) || thisArg, args);
+		},
+	});
+	natives.set(attachShadowProxy, attachShadow);
+	natives.set(toStringProxy, toString);
+	Element.prototype.attachShadow = attachShadowProxy;
+	Function.prototype.toString = toStringProxy;
+
+	document.addEventListener('DOMContentLoaded', () => observeOpenShadowRoots(document), { once: true });
+	if (document.readyState !== 'loading') observeOpenShadowRoots(document);
+})();
+"""
+).replace('CHANGE_TRACKER_KEY', CHANGE_TRACKER_KEY)
+
+
 @dataclass
 class BrowserContextConfig:
 	"""
@@ -55,6 +147,19 @@ class BrowserContextConfig:
 	    cookies_file: None
 	        Path to cookies file for persistence
 
+	    cookies_save_debounce: 1.0
+	        Cookie saves requested within this many seconds are coalesced into one (atomic) write
+
+	    storage_state_profile: None
+	        Name of the storage state profile. If set, the newest snapshot of the profile (cookies, localStorage,
+	        IndexedDB, sessionStorage) is loaded when the context is created and a new snapshot is saved on close.
+
+	    storage_state_dir: './browser_profiles'
+	        Directory the storage state snapshots are stored in ({storage_state_dir}/{profile}/v{N}.json)
+
+	    storage_state_keep_versions: 5
+	        Number of snapshots to keep per profile
+
 	        disable_security: True
 	                Disable browser security features
 
@@ -84,7 +189,13 @@ class BrowserContextConfig:
 	        Path to save video recordings
 
 	    save_downloads_path: None
-	        Path to save downloads to
+	        Path to save downloads to. Downloads are detected by an event listener and saved in the background.
+	        The next action result reports a download as started, a later one (or the end of the run) as saved.
+
+	    download_wait_time: 0
+	        With save_downloads_path, seconds a click waits for a download to start, so that it is reported on
+	        the result of the click itself. Returns as soon as a download starts. Every click waits this long
+	        when it triggers no download.
 
 	    trace_path: None
 	        Path to save trace files. It will auto name the file with the TRACE_PATH/{context_id}.zip
@@ -98,6 +209,17 @@ class BrowserContextConfig:
 	    highlight_elements: True
 	        Highlight elements in the DOM on the screen
 
+	    reuse_unchanged_state: False
+	        Check a cheap page fingerprint (DOM mutation and input counters of the page, its shadow roots and iframes,
+	        URL, scroll position, viewport) before get_state and reuse the cached state if nothing changed, instead of
+	        waiting for the network, rebuilding the DOM tree and taking a new screenshot. Changes that are no DOM
+	        mutation (images loading, canvas, animations, video) keep the old screenshot. Adds a change tracker init
+	        script to every page.
+
+	    highlight_mode: 'dom'
+	        'dom' inserts the numbered highlights into the page. 'screenshot' leaves the page untouched and draws them
+	        onto the screenshot with PIL instead (requires Pillow) - no reflows and no reactions of page scripts.
+
 	    viewport_expansion: 500
 	        Viewport expansion in pixels. This amount will increase the number of elements which are included in the state what the LLM will see. If set to -1, all elements will be included (this leads to high token usage). If set to 0, only the elements which are visible in the viewport will be included.
 
@@ -105,11 +227,46 @@ class BrowserContextConfig:
 	        List of allowed domains that can be accessed. If None, all domains are allowed.
 	        Example: ['example.com', 'api.example.com']
 
+	    denied_domains: None
+	        List of domains that can never be accessed, wins over allowed_domains.
+	        Navigations to non-allowed domains are refused, or reverted right after the page loaded.
+
+	    block_disallowed_requests: False
+	        With allowed_domains or denied_domains, intercept every request with `context.route` and abort
+	        documents and subresources of non-allowed domains before they load. Routing disables the HTTP cache
+	        of the context and adds a round trip to the Playwright driver per request.
+
 	    include_dynamic_attributes: bool = True
 	        Include dynamic attributes in the CSS selector. If you want to reuse the css_selectors, it might be better to set this to False.
+
+	    input_text_strategy: 'auto'
+	        How text is entered into inputs. 'type' sends one key event per character, 'fill' sets the value at once
+	        (fill for inputs and textareas, Input.insertText for contenteditable elements). 'auto' only types into short
+	        fields that react to key events (comboboxes, autocomplete, datalist and search inputs) and fills everything else.
+
+	    input_type_max_length: 64
+	        With 'auto', text longer than this is never typed key by key.
+
+	    memory_watchdog_interval: 0
+	        Minimum seconds between memory samples of all tabs (CDP Performance.getMetrics), taken before get_state.
+	        0 disables the watchdog.
+	        Idle tabs over budget are closed (least recently used first), the current tab is reloaded keeping URL and scroll.
+
+	    max_tab_js_heap_mb: 512
+	        Per tab JS heap budget of the memory watchdog
+
+	    max_tab_dom_nodes: 200000
+	        Per tab DOM node budget of the memory watchdog
+
+	    max_total_js_heap_mb: 2048
+	        JS heap budget of all tabs of the context together
 	"""
 
 	cookies_file: str | None = None
+	cookies_save_debounce: float = 1.0
+	storage_state_profile: str | None = None
+	storage_state_dir: str = './browser_profiles'
+	storage_state_keep_versions: int = 5
 	minimum_wait_page_load_time: float = 0.25
 	wait_for_network_idle_page_load_time: float = 0.5
 	maximum_wait_page_load_time: float = 5
@@ -122,6 +279,7 @@ class BrowserContextConfig:
 
 	save_recording_path: str | None = None
 	save_downloads_path: str | None = None
+	download_wait_time: float = 0
 	trace_path: str | None = None
 	locale: str | None = None
 	user_agent: str = (
@@ -129,10 +287,22 @@ class BrowserContextConfig:
 	)
 
 	highlight_elements: bool = True
+	highlight_mode: Literal['dom', 'screenshot'] = 'dom'
+	reuse_unchanged_state: bool = False
 	viewport_expansion: int = 500
 	allowed_domains: list[str] | None = None
+	denied_domains: list[str] | None = None
+	block_disallowed_requests: bool = False
 	include_dynamic_attributes: bool = True
 
+	input_text_strategy: Literal['auto', 'type', 'fill'] = 'auto'
+	input_type_max_length: int = 64
+
+	memory_watchdog_interval: float = 0
+	max_tab_js_heap_mb: float = 512
+	max_tab_dom_nodes: int = 200_000
+	max_total_js_heap_mb: float = 2048
+
 	_force_keep_context_alive: bool = False
 
 
@@ -169,6 +339,48 @@ class BrowserContext:
 		# Initialize these as None - they'll be set up when needed
 		self.session: BrowserSession | None = None
 
+		self._cookie_persister = (
+			CookiePersister(self.config.cookies_file, debounce_seconds=self.config.cookies_save_debounce)
+			if self.config.cookies_file
+			else None
+		)
+		self._storage_state_store = (
+			StorageStateStore(self.config.storage_state_dir, keep_versions=self.config.storage_state_keep_versions)
+			if self.config.storage_state_profile
+			else None
+		)
+
+		# Only recorded with a persistent profile (BrowserConfig.user_data_dir), the last MAX_PAGE_LOAD_TIMINGS
+		self.page_load_timings: deque[PageLoadTiming] = deque(maxlen=MAX_PAGE_LOAD_TIMINGS)
+
+		# Downloads not reported as saved yet, saved in the background. The task name is the suggested filename
+		self._pending_downloads: list[asyncio.Task[str | None]] = []
+		self._announced_downloads: set[asyncio.Task[str | None]] = set()
+		self._reserved_download_paths: set[str] = set()
+		self._download_started = asyncio.Event()
+
+		# every origin loaded in a frame since the last reset - its storage is cleared by reset_context(keep_page=True)
+		self._visited_origins: set[str] = set()
+
+		self._memory_watchdog: MemoryWatchdog | None = None
+
+		# on the shared context of a persistent profile: the tabs this BrowserContext opened and their popups - it never
+		# uses the tabs of other BrowserContexts. None when the Playwright context is its own, see _get_pages
+		self._owned_pages: list[Page] | None = None
+
+		# fingerprint of the page when the cached state was captured
+		self._state_fingerprint: PageFingerprint | None = None
+		# id() of a closed page can be reused by the next one
+		self._page_ids: weakref.WeakKeyDictionary[Page, str] = weakref.WeakKeyDictionary()
+
+		self.domain_policy = DomainPolicy(self.config.allowed_domains, self.config.denied_domains)
+
+		if self.config.highlight_mode == 'screenshot':
+			try:
+				import PIL  # noqa: F401
+			except ImportError:
+				raise ImportError("highlight_mode='screenshot' requires Pillow, install it with `pip install pillow`")
+
 	async def __aenter__(self):
 		"""Async context manager entry"""
 		await self._initialize_session()
@@ -196,7 +408,37 @@ class BrowserContext:
 					logger.debug(f'Failed to remove CDP listener: {e}')
 				self._page_event_handler = None
 
+			if self._owned_pages is not None:
+				try:
+					self.session.context.remove_listener('page', self._on_shared_context_page)
+				except Exception as e:
+					logger.debug(f'Failed to remove page listener: {e}')
+			else:
+				if self.config.save_downloads_path and self.session.context:
+					try:
+						self.session.context.remove_listener('page', self._attach_download_listener)
+					except Exception as e:
+						logger.debug(f'Failed to remove download listener: {e}')
+				try:
+					self.session.context.remove_listener('page', self._track_visited_origins)
+				except Exception as e:
+					logger.debug(f'Failed to remove navigation listener: {e}')
+			# the agent reports downloads of its last action before closing - anything left is only logged
+			for message in await self.collect_downloads(wait=True):
+				logger.info(message)
+
+			if self._memory_watchdog:
+				await self._memory_watchdog.stop()
+				self._memory_watchdog = None
+
 			await self.save_cookies()
+			await self.save_storage_state()
+
+			if self._blocks_disallowed_requests:
+				try:
+					await self.session.context.unroute('**/*', self.domain_policy.handle_route)
+				except Exception as e:
+					logger.debug(f'Failed to remove domain policy route: {e}')
 
 			if self.config.trace_path:
 				try:
@@ -204,8 +446,16 @@ class BrowserContext:
 				except Exception as e:
 					logger.debug(f'Failed to stop tracing: {e}')
 
+			# The persistent profile context is owned by the Browser and closed with it - only close the own tabs
+			if self._owned_pages is not None:
+				for page in self._get_pages(self.session):
+					try:
+						await page.close()
+					except Exception as e:
+						logger.debug(f'Failed to close tab {page.url}: {e}')
+
 			# This is crucial - it closes the CDP connection
-			if not self.config._force_keep_context_alive:
+			if not self.config._force_keep_context_alive and self._owned_pages is None:
 				try:
 					await self.session.context.close()
 				except Exception as e:
@@ -215,6 +465,7 @@ class BrowserContext:
 			# Dereference everything
 			self.session = None
 			self._page_event_handler = None
+			self._owned_pages = None
 
 	def __del__(self):
 		"""Cleanup when object is destroyed"""
@@ -235,18 +486,32 @@ class BrowserContext:
 		"""Initialize the browser session"""
 		logger.debug('Initializing browser context')
 
-		playwright_browser = await self.browser.get_playwright_browser()
+		# a persistent profile brings its own context, there is no browser to create one from
+		playwright_browser = None if self.browser.config.user_data_dir else await self.browser.get_playwright_browser()
 		context = await self._create_context(playwright_browser)
 		self._page_event_handler = None
 
-		# Get or create a page to use
-		pages = context.pages
-
 		self.session = BrowserSession(
 			context=context,
 			cached_state=None,
 		)
 
+		# Get or create a page to use
+		pages = self._get_pages(self.session)
+
+		if self._owned_pages is not None:
+			# the listeners of the own tabs are attached as they are adopted
+			context.on('page', self._on_shared_context_page)
+		else:
+			if self.config.save_downloads_path:
+				for page in pages:
+					self._attach_download_listener(page)
+				context.on('page', self._attach_download_listener)
+
+			for page in pages:
+				self._track_visited_origins(page)
+			context.on('page', self._track_visited_origins)
+
 		active_page = None
 		if self.browser.config.cdp_url:
 			# If we have a saved target ID, try to find and activate it
@@ -267,7 +532,7 @@ class BrowserContext:
 				active_page = pages[0]
 				logger.debug('Using existing page')
 			else:
-				active_page = await context.new_page()
+				active_page = await self._new_page(self.session)
 				logger.debug('Created new page')
 
 			# Get target ID for the active page
@@ -282,6 +547,9 @@ class BrowserContext:
 		await active_page.bring_to_front()
 		await active_page.wait_for_load_state('load')
 
+		if self.config.memory_watchdog_interval > 0:
+			self._memory_watchdog = MemoryWatchdog(self, interval=self.config.memory_watchdog_interval)
+
 		return self.session
 
 	def _add_new_page_listener(self, context: PlaywrightBrowserContext):
@@ -307,14 +575,26 @@ class BrowserContext:
 		session = await self.get_session()
 		return await self._get_current_page(session)
 
-	async def _create_context(self, browser: PlaywrightBrowser):
+	async def _create_context(self, browser: PlaywrightBrowser | None):
 		"""Creates a new browser context with anti-detection measures and loads cookies if available."""
-		if self.browser.config.cdp_url and len(browser.contexts) > 0:
+		snapshot = None
+		if self._storage_state_store and self.config.storage_state_profile:
+			snapshot = await self._storage_state_store.load(self.config.storage_state_profile)
+			if snapshot:
+				logger.info(f'Loaded storage state snapshot of profile {self.config.storage_state_profile}')
+
+		reused_context = True
+		if browser is None:
+			context = await self.browser.get_persistent_context()
+			# shared by all BrowserContexts of the browser - every one opens tabs of its own
+			self._owned_pages = []
+		elif self.browser.config.cdp_url and len(browser.contexts) > 0:
 			context = browser.contexts[0]
 		elif self.browser.config.chrome_instance_path and len(browser.contexts) > 0:
 			# Connect to existing Chrome instance instead of creating new one
 			context = browser.contexts[0]
 		else:
+			reused_context = False
 			# Original code for creating new context
 			context = await browser.new_context(
 				viewport=self.config.browser_window_size,
@@ -326,18 +606,54 @@ class BrowserContext:
 				record_video_dir=self.config.save_recording_path,
 				record_video_size=self.config.browser_window_size,
 				locale=self.config.locale,
+				storage_state=snapshot['storage_state'] if snapshot else None,
 			)
 
 		if self.config.trace_path:
 			await context.tracing.start(screenshots=True, snapshots=True, sources=True)
 
+		first_use = context not in self.browser._prepared_contexts
+		if first_use:
+			self.browser._prepared_contexts.add(context)
+			if self.browser.asset_cache is not None:
+				await context.route('**/*', self.browser.asset_cache.handle_route)
+
+		# registered last, so it runs first - blocked requests never reach the asset cache.
+		# The policy belongs to this BrowserContext, close() removes it from a shared context.
+		if self._blocks_disallowed_requests:
+			await context.route('**/*', self.domain_policy.handle_route)
+
+		if snapshot:
+			if reused_context:
+				# reused context - storage_state can only be passed to new contexts
+				await context.add_cookies(snapshot['storage_state'].get('cookies', []))
+				origins = snapshot['storage_state'].get('origins', [])
+				if origins:
+					await context.add_init_script(StorageStateStore.local_storage_init_script(origins))
+				if any(entry.get('indexedDB') for entry in origins):
+					logger.warning('IndexedDB of the storage state snapshot can only be restored into new contexts, skipping it')
+			if snapshot.get('session_storage'):
+				await context.add_init_script(StorageStateStore.session_storage_init_script(snapshot['session_storage']))
+
 		# Load cookies if they exist
-		if self.config.cookies_file and os.path.exists(self.config.cookies_file):
-			with open(self.config.cookies_file, 'r') as f:
-				cookies = json.load(f)
+		if self._cookie_persister:
+			cookies = await self._cookie_persister.load()
+			if cookies:
 				logger.info(f'Loaded {len(cookies)} cookies from {self.config.cookies_file}')
 				await context.add_cookies(cookies)
 
+		if first_use:
+			await self._add_init_scripts(context)
+		# only tracked for reuse_unchanged_state - once per Playwright context, also if an earlier user of a shared
+		# context did not track changes
+		if self.config.reuse_unchanged_state and context not in self.browser._change_tracked_contexts:
+			self.browser._change_tracked_contexts.add(context)
+			await context.add_init_script(CHANGE_TRACKER_SCRIPT)
+
+		return context
+
+	async def _add_init_scripts(self, context: PlaywrightBrowserContext):
+		"""Init scripts every context needs - they can not be removed, so they are added once per Playwright context"""
 		# Expose anti-detection scripts
 		await context.add_init_script(
 			"""
@@ -375,8 +691,6 @@ class BrowserContext:
             """
 		)
 
-		return context
-
 	async def _wait_for_stable_network(self):
 		page = await self.get_current_page()
 
@@ -578,34 +892,19 @@ class BrowserContext:
 		if remaining > 0:
 			await asyncio.sleep(remaining)
 
-	def _is_url_allowed(self, url: str) -> bool:
-		"""Check if a URL is allowed based on the whitelist configuration."""
-		if not self.config.allowed_domains:
-			return True
-
-		try:
-			from urllib.parse import urlparse
-
-			parsed_url = urlparse(url)
-			domain = parsed_url.netloc.lower()
-
-			# Remove port number if present
-			if ':' in domain:
-				domain = domain.split(':')[0]
+	@property
+	def _blocks_disallowed_requests(self) -> bool:
+		return self.domain_policy.is_active and self.config.block_disallowed_requests
 
-			# Check if domain matches any allowed domain pattern
-			return any(
-				domain == allowed_domain.lower() or domain.endswith('.' + allowed_domain.lower())
-				for allowed_domain in self.config.allowed_domains
-			)
-		except Exception as e:
-			logger.error(f'Error checking URL allowlist: {str(e)}')
-			return False
+	def _is_url_allowed(self, url: str) -> bool:
+		"""Check if a URL is allowed based on the allow and deny lists."""
+		return self.domain_policy.is_url_allowed(url)
 
 	async def _check_and_handle_navigation(self, page: Page) -> None:
 		"""Check if current page URL is allowed and handle if not."""
 		if not self._is_url_allowed(page.url):
 			logger.warning(f'Navigation to non-allowed URL detected: {page.url}')
+			self.domain_policy.record_blocked(page.url)
 			try:
 				await self.go_back()
 			except Exception as e:
@@ -615,12 +914,43 @@ class BrowserContext:
 	async def navigate_to(self, url: str):
 		"""Navigate to a URL"""
 		if not self._is_url_allowed(url):
+			self.domain_policy.record_blocked(url)
 			raise BrowserError(f'Navigation to non-allowed URL: {url}')
 
 		page = await self.get_current_page()
 		await page.goto(url)
 		await page.wait_for_load_state()
 
+		if self.browser.profile_warm is not None:
+			await self._record_page_load_timing(page)
+
+	async def _record_page_load_timing(self, page: Page):
+		"""Record navigation timing and cache usage, to compare cold and warm profiles"""
+		try:
+			timing = await page.evaluate(
+				"""() => {
+					const nav = performance.getEntriesByType('navigation')[0];
+					const resources = performance.getEntriesByType('resource');
+					return {
+						duration_ms: nav ? nav.duration : 0,
+						transfer_bytes: resources.reduce((sum, r) => sum + r.transferSize, nav ? nav.transferSize : 0),
+						resources: resources.length,
+						cached_resources: resources.filter(r => r.transferSize === 0 && r.decodedBodySize > 0).length,
+					};
+				}"""
+			)
+		except Exception as e:
+			logger.debug(f'Failed to read page load timing: {e}')
+			return
+
+		page_load = PageLoadTiming(url=page.url, warm_profile=bool(self.browser.profile_warm), **timing)
+		self.page_load_timings.append(page_load)
+		logger.info(
+			f'Page load ({"warm" if page_load.warm_profile else "cold"} profile): {page_load.duration_ms:.0f} ms, '
+			f'{page_load.cached_resources}/{page_load.resources} resources from cache, '
+			f'{page_load.transfer_bytes / 1024:.0f} KB transferred - {page_load.url}'
+		)
+
 	async def refresh_page(self):
 		"""Refresh the current page"""
 		page = await self.get_current_page()
@@ -654,7 +984,7 @@ class BrowserContext:
 		await page.close()
 
 		# Switch to the first available tab if any exist
-		if session.context.pages:
+		if self._get_pages(session):
 			await self.switch_to_tab(0)
 
 		# otherwise the browser will be closed
@@ -743,16 +1073,183 @@ class BrowserContext:
 	@time_execution_sync('--get_state')  # This decorator might need to be updated to handle async
 	async def get_state(self) -> BrowserState:
 		"""Get the current state of the browser"""
-		await self._wait_for_page_and_frames_load()
+		if self._memory_watchdog:
+			# between steps, never in the middle of an action - closing or reloading tabs would break it
+			await self._memory_watchdog.step()
+
 		session = await self.get_session()
+		if self.config.reuse_unchanged_state and session.cached_state is not None and self._state_fingerprint is not None:
+			if await self.get_page_fingerprint() == self._state_fingerprint:
+				logger.debug('Page did not change since the last state, reusing it')
+				session.cached_state.memory_metrics = self._memory_watchdog.latest if self._memory_watchdog else None
+				return session.cached_state
+
+		await self._wait_for_page_and_frames_load()
+		# taken before the extraction - a change during the extraction must invalidate the new state
+		fingerprint = await self.get_page_fingerprint() if self.config.reuse_unchanged_state else None
 		session.cached_state = await self._update_state()
+		self._state_fingerprint = fingerprint
+
+		# Save cookies if a file is specified (debounced, only written if the jar changed)
+		if self._cookie_persister:
+			self._cookie_persister.schedule_save(session.context)
+
+		return session.cached_state
+
+	@time_execution_async('--get_replay_state')
+	async def get_replay_state(self, elements: dict[int, DOMHistoryElement]) -> Optional[BrowserState]:
+		"""
+		Cheap state to replay recorded actions on: the recorded elements are found by their stored css selector
+		instead of extracting the DOM, and no screenshot is taken. The selector map only holds these elements,
+		without their children or parents - only for actions that do not walk the element tree.
+
+		Returns None if a selector does not match exactly one visible element, or the element holds a file input
+		(is_file_uploader would not see it without the children) - use get_state then.
+		"""
+		session = await self.get_session()
+		page = await self.get_current_page()
 
-		# Save cookies if a file is specified
-		if self.config.cookies_file:
-			asyncio.create_task(self.save_cookies())
+		selector_map: SelectorMap = {}
+		for index, element in elements.items():
+			if not element.css_selector:
+				return None
+			try:
+				handles = await page.query_selector_all(element.css_selector)
+				if len(handles) != 1 or not await handles[0].is_visible():
+					return None
+				# the depth is_file_uploader checks
+				if await handles[0].evaluate(
+					"(el) => !!(el.matches('input[type=file]') || el.querySelector(':scope > * > * > input[type=file], "
+					":scope > * > input[type=file], :scope > input[type=file]'))"
+				):
+					return None
+			except Exception as e:
+				logger.debug(f'Failed to locate recorded element {element.css_selector}: {e}')
+				return None
+			selector_map[index] = DOMElementNode(
+				is_visible=True,
+				parent=None,
+				tag_name=element.tag_name,
+				xpath=element.xpath,
+				attributes=element.attributes,
+				children=[],
+				is_interactive=True,
+				shadow_root=element.shadow_root,
+				highlight_index=index,
+			)
 
+		element_tree = DOMElementNode(
+			is_visible=True, parent=None, tag_name='body', xpath='', attributes={}, children=list(selector_map.values())
+		)
+		session.cached_state = BrowserState(
+			element_tree=element_tree,
+			selector_map=selector_map,
+			url=page.url,
+			title=await page.title(),
+			tabs=await self.get_tabs_info(),
+		)
+		# the partial state must never be reused by get_state
+		self._state_fingerprint = None
 		return session.cached_state
 
+	async def _get_frame_changes(self, frame: Frame) -> Optional[list]:
+		"""[document id, mutations, interactions] of a child frame, None if the frame is gone"""
+		script = f"""() => {{
+			const changes = window[Symbol.for('{CHANGE_TRACKER_KEY}')];
+			return changes ? changes() : null;
+		}}"""
+		try:
+			values = await frame.evaluate(script)
+			if values is None:
+				# frames created without a navigation (about:blank, srcdoc) do not always run the init scripts
+				await frame.evaluate('() => {' + CHANGE_TRACKER_SCRIPT + '}')
+				values = await frame.evaluate(script)
+			return values
+		except Exception as e:
+			logger.debug(f'Failed to get changes of frame {frame.url}: {e}')
+			return None
+
+	async def get_page_fingerprint(self) -> PageFingerprint | None:
+		"""
+		Fingerprint of the current page, None if it can not be tracked (without `reuse_unchanged_state`, or pages
+		opened before the context was set up). The change counters are summed over the page and all its frames.
+		"""
+		try:
+			session = await self.get_session()
+			page = await self.get_current_page()
+			values = await page.evaluate(
+				f"""() => {{
+					const changes = window[Symbol.for('{CHANGE_TRACKER_KEY}')];
+					if (!changes) return null;
+					return [...changes(), location.href,
+						Math.round(window.scrollX), Math.round(window.scrollY), window.innerWidth, window.innerHeight];
+				}}"""
+			)
+		except Exception as e:
+			logger.debug(f'Failed to get page fingerprint: {e}')
+			return None
+		if values is None:
+			return None
+		document, dom_mutations, interactions, url, scroll_x, scroll_y, viewport_width, viewport_height = values
+		documents = [document]
+		child_frames = [frame for frame in page.frames if frame is not page.main_frame]
+		# a detached frame is skipped - its removal is a mutation of its parent
+		for frame_values in await asyncio.gather(*(self._get_frame_changes(frame) for frame in child_frames)):
+			if frame_values is not None:
+				documents.append(frame_values[0])
+				dom_mutations += frame_values[1]
+				interactions += frame_values[2]
+		return PageFingerprint(
+			page_id=self._page_ids.setdefault(page, uuid.uuid4().hex),
+			tabs=len(self._get_pages(session)),
+			url=url,
+			documents=tuple(documents),
+			dom_mutations=dom_mutations,
+			interactions=interactions,
+			scroll_x=scroll_x,
+			scroll_y=scroll_y,
+			viewport_width=viewport_width,
+			viewport_height=viewport_height,
+		)
+
+	async def dom_changed_since_state(self) -> bool:
+		"""Whether the DOM of the current page may have changed since the cached state was captured"""
+		if self._state_fingerprint is None:
+			return True
+		fingerprint = await self.get_page_fingerprint()
+		if fingerprint is None:
+			return True
+		return fingerprint.dom != self._state_fingerprint.dom
+
+	async def wait_for_quiescence(self, quiet_period: float = 0.1, timeout: float = 5.0) -> None:
+		"""
+		Wait until the page is loaded and its DOM did not change for `quiet_period` seconds - instead of a fixed delay
+		after an action. Gives up after `timeout` seconds. Untracked pages (without `reuse_unchanged_state`) wait for
+		the load state and `wait_between_actions`.
+		"""
+		loop = asyncio.get_running_loop()
+		deadline = loop.time() + timeout
+		page = await self.get_current_page()
+		try:
+			await page.wait_for_load_state(timeout=timeout * 1000)
+		except Exception:
+			pass
+
+		last_seen = None
+		stable_since = loop.time()
+		while loop.time() < deadline:
+			fingerprint = await self.get_page_fingerprint()
+			if fingerprint is None:
+				# untracked page - the load state and a fixed delay is all we can wait for
+				await asyncio.sleep(max(min(self.config.wait_between_actions, deadline - loop.time()), 0))
+				return
+			now = loop.time()
+			if fingerprint.dom != last_seen:
+				last_seen, stable_since = fingerprint.dom, now
+			elif now - stable_since >= quiet_period:
+				return
+			await asyncio.sleep(0.05)
+
 	async def _update_state(self, focus_element: int = -1) -> BrowserState:
 		"""Update and return state."""
 		session = await self.get_session()
@@ -765,7 +1262,7 @@ class BrowserContext:
 		except Exception as e:
 			logger.debug(f'Current page is no longer accessible: {str(e)}')
 			# Get all available pages
-			pages = session.context.pages
+			pages = self._get_pages(session)
 			if pages:
 				self.state.target_id = None
 				page = await self._get_current_page(session)
@@ -774,15 +1271,22 @@ class BrowserContext:
 				raise BrowserError('Browser closed: no valid pages available')
 
 		try:
-			await self.remove_highlights()
+			highlight_in_screenshot = self.config.highlight_elements and self.config.highlight_mode == 'screenshot'
+			if not highlight_in_screenshot:
+				await self.remove_highlights()
 			dom_service = DomService(page)
 			content = await dom_service.get_clickable_elements(
 				focus_element=focus_element,
 				viewport_expansion=self.config.viewport_expansion,
-				highlight_elements=self.config.highlight_elements,
+				highlight_elements=self.config.highlight_elements and not highlight_in_screenshot,
+				collect_highlight_boxes=highlight_in_screenshot,
 			)
 
 			screenshot_b64 = await self.take_screenshot()
+			if highlight_in_screenshot:
+				viewport_width = page.viewport_size['width'] if page.viewport_size else await page.evaluate('window.innerWidth')
+				# PIL work off the event loop
+				screenshot_b64 = await asyncio.to_thread(draw_highlights, screenshot_b64, content.selector_map, viewport_width)
 			pixels_above, pixels_below = await self.get_scroll_info(page)
 
 			self.current_state = BrowserState(
@@ -794,6 +1298,7 @@ class BrowserContext:
 				screenshot=screenshot_b64,
 				pixels_above=pixels_above,
 				pixels_below=pixels_below,
+				memory_metrics=self._memory_watchdog.latest if self._memory_watchdog else None,
 			)
 
 			return self.current_state
@@ -1092,19 +1597,46 @@ class BrowserContext:
 			except Exception:
 				pass
 
-			# Get element properties to determine input method
-			tag_handle = await element_handle.get_property("tagName")
-			tag_name = (await tag_handle.json_value()).lower()
-			is_contenteditable = await element_handle.get_property('isContentEditable')
-			readonly_handle = await element_handle.get_property("readOnly")
-			disabled_handle = await element_handle.get_property("disabled")
+			# Get element properties to determine input method - in one round trip
+			properties = await element_handle.evaluate(
+				"""el => ({
+					tagName: el.tagName.toLowerCase(),
+					isContentEditable: el.isContentEditable,
+					readOnly: !!el.readOnly,
+					disabled: !!el.disabled,
+					needsKeyEvents: el.getAttribute('role') === 'combobox'
+						|| (el.hasAttribute('aria-autocomplete') && el.getAttribute('aria-autocomplete') !== 'none')
+						|| el.hasAttribute('list')
+						|| el.type === 'search',
+				})"""
+			)
+
+			if properties['readOnly'] or properties['disabled']:
+				await element_handle.fill(text)
+				return
 
-			readonly = await readonly_handle.json_value() if readonly_handle else False
-			disabled = await disabled_handle.json_value() if disabled_handle else False
+			strategy = self.config.input_text_strategy
+			if strategy == 'auto':
+				needs_key_events = properties['needsKeyEvents'] and len(text) <= self.config.input_type_max_length
+				strategy = 'type' if needs_key_events else 'fill'
 
-			if (await is_contenteditable.json_value() or tag_name == 'input') and not (readonly or disabled):
-				await element_handle.evaluate('el => el.textContent = ""')
+			if strategy == 'type':
+				await element_handle.fill('')
 				await element_handle.type(text, delay=5)
+			elif properties['isContentEditable'] and text:
+				# fill on rich text editors skips beforeinput - insertText replaces the selection like a paste
+				page = await self.get_current_page()
+				await element_handle.focus()
+				await element_handle.evaluate(
+					"""el => {
+						const range = document.createRange();
+						range.selectNodeContents(el);
+						const selection = window.getSelection();
+						selection.removeAllRanges();
+						selection.addRange(range);
+					}"""
+				)
+				await page.keyboard.insert_text(text)
 			else:
 				await element_handle.fill(text)
 
@@ -1113,7 +1645,7 @@ class BrowserContext:
 			raise BrowserError(f'Failed to input text into index {element_node.highlight_index}')
 
 	@time_execution_async('--click_element_node')
-	async def _click_element_node(self, element_node: DOMElementNode) -> Optional[str]:
+	async def _click_element_node(self, element_node: DOMElementNode) -> None:
 		"""
 		Optimized method to click an element using xpath.
 		"""
@@ -1130,39 +1662,20 @@ class BrowserContext:
 				raise Exception(f'Element: {repr(element_node)} not found')
 
 			async def perform_click(click_func):
-				"""Performs the actual click, handling both download
-				and navigation scenarios."""
-				if self.config.save_downloads_path:
-					try:
-						# Try short-timeout expect_download to detect a file download has been been triggered
-						async with page.expect_download(timeout=5000) as download_info:
-							await click_func()
-						download = await download_info.value
-						# Determine file path
-						suggested_filename = download.suggested_filename
-						unique_filename = await self._get_unique_filename(self.config.save_downloads_path, suggested_filename)
-						download_path = os.path.join(self.config.save_downloads_path, unique_filename)
-						await download.save_as(download_path)
-						logger.debug(f'Download triggered. Saved file to: {download_path}')
-						return download_path
-					except TimeoutError:
-						# If no download is triggered, treat as normal click
-						logger.debug('No download triggered within timeout. Checking navigation...')
-						await page.wait_for_load_state()
-						await self._check_and_handle_navigation(page)
-				else:
-					# Standard click logic if no download is expected
-					await click_func()
-					await page.wait_for_load_state()
-					await self._check_and_handle_navigation(page)
+				"""Performs the actual click and handles navigation. Downloads are picked up by the download listener"""
+				self._download_started.clear()
+				await click_func()
+				await page.wait_for_load_state()
+				await self._check_and_handle_navigation(page)
+				await self._wait_for_download_start()
 
 			try:
-				return await perform_click(lambda: element_handle.click(timeout=1500))
+				await perform_click(lambda: element_handle.click(timeout=1500))
 			except URLNotAllowedError as e:
 				raise e
 			except Exception:
 				try:
-					return await perform_click(lambda: page.evaluate('(el) => el.click()', element_handle))
+					await perform_click(lambda: page.evaluate('(el) => el.click()', element_handle))
 				except URLNotAllowedError as e:
 					raise e
 				except Exception as e:
@@ -1179,7 +1692,7 @@ class BrowserContext:
 		session = await self.get_session()
 
 		tabs_info = []
-		for page_id, page in enumerate(session.context.pages):
+		for page_id, page in enumerate(self._get_pages(session)):
 			tab_info = TabInfo(page_id=page_id, url=page.url, title=await page.title())
 			tabs_info.append(tab_info)
 
@@ -1189,7 +1702,7 @@ class BrowserContext:
 	async def switch_to_tab(self, page_id: int) -> None:
 		"""Switch to a specific tab by its page_id"""
 		session = await self.get_session()
-		pages = session.context.pages
+		pages = self._get_pages(session)
 
 		if page_id >= len(pages):
 			raise BrowserError(f'No tab found with page_id: {page_id}')
@@ -1215,10 +1728,11 @@ class BrowserContext:
 	async def create_new_tab(self, url: str | None = None) -> None:
 		"""Create a new tab and optionally navigate to a URL"""
 		if url and not self._is_url_allowed(url):
+			self.domain_policy.record_blocked(url)
 			raise BrowserError(f'Cannot create new tab with non-allowed URL: {url}')
 
 		session = await self.get_session()
-		new_page = await session.context.new_page()
+		new_page = await self._new_page(session)
 		await new_page.wait_for_load_state()
 
 		if url:
@@ -1237,7 +1751,7 @@ class BrowserContext:
 
 	# region - Helper methods for easier access to the DOM
 	async def _get_current_page(self, session: BrowserSession) -> Page:
-		pages = session.context.pages
+		pages = self._get_pages(session)
 
 		# Try to find page by target ID if using CDP
 		if self.browser.config.cdp_url and self.state.target_id:
@@ -1249,7 +1763,43 @@ class BrowserContext:
 							return page
 
 		# Fallback to last page
-		return pages[-1] if pages else await session.context.new_page()
+		return pages[-1] if pages else await self._new_page(session)
+
+	def _get_pages(self, session: BrowserSession) -> list[Page]:
+		"""The tabs of this BrowserContext - on a shared persistent context only the ones it opened and their popups"""
+		if self._owned_pages is None:
+			return list(session.context.pages)
+		self._owned_pages = [page for page in self._owned_pages if not page.is_closed()]
+		return list(self._owned_pages)
+
+	async def get_pages(self) -> list[Page]:
+		"""Get the tabs of this BrowserContext"""
+		session = await self.get_session()
+		return self._get_pages(session)
+
+	async def _new_page(self, session: BrowserSession) -> Page:
+		page = await session.context.new_page()
+		if self._owned_pages is not None:
+			self._adopt_page(page)
+		return page
+
+	def _adopt_page(self, page: Page) -> None:
+		"""Make a tab of the shared persistent context one of this BrowserContext"""
+		if self._owned_pages is None or page in self._owned_pages:
+			return
+		self._owned_pages.append(page)
+		if self.config.save_downloads_path:
+			self._attach_download_listener(page)
+		self._track_visited_origins(page)
+
+	async def _on_shared_context_page(self, page: Page) -> None:
+		"""Popups of the own tabs belong to this BrowserContext, tabs of other BrowserContexts are ignored"""
+		try:
+			opener = await page.opener()
+		except Exception:
+			return
+		if opener is not None and self._owned_pages is not None and opener in self._owned_pages:
+			self._adopt_page(page)
 
 	async def get_selector_map(self) -> SelectorMap:
 		session = await self.get_session()
@@ -1267,21 +1817,19 @@ class BrowserContext:
 		return selector_map[index]
 
 	async def save_cookies(self):
-		"""Save current cookies to file"""
-		if self.session and self.session.context and self.config.cookies_file:
-			try:
-				cookies = await self.session.context.cookies()
-				logger.debug(f'Saving {len(cookies)} cookies to {self.config.cookies_file}')
-
-				# Check if the path is a directory and create it if necessary
-				dirname = os.path.dirname(self.config.cookies_file)
-				if dirname:
-					os.makedirs(dirname, exist_ok=True)
+		"""Save current cookies to file now (skips the write if nothing changed)"""
+		if self.session and self.session.context and self._cookie_persister:
+			await self._cookie_persister.flush(self.session.context)
 
-				with open(self.config.cookies_file, 'w') as f:
-					json.dump(cookies, f)
-			except Exception as e:
-				logger.warning(f'Failed to save cookies: {str(e)}')
+	async def save_storage_state(self) -> str | None:
+		"""Save a new storage state snapshot of the configured profile. Returns the snapshot path"""
+		if not (self.session and self.session.context and self._storage_state_store and self.config.storage_state_profile):
+			return None
+		try:
+			return await self._storage_state_store.save(self.session.context, self.config.storage_state_profile)
+		except Exception as e:
+			logger.warning(f'Failed to save storage state: {str(e)}')
+			return None
 
 	async def is_file_uploader(self, element_node: DOMElementNode, max_depth: int = 3, current_depth: int = 0) -> bool:
 		"""Check if element or its children are file uploaders"""
@@ -1319,26 +1867,161 @@ class BrowserContext:
 		pixels_below = total_height - (scroll_y + viewport_height)
 		return pixels_above, pixels_below
 
-	async def reset_context(self):
+	async def reset_context(self, keep_page: bool = False):
 		"""Reset the browser session
 		Call this when you don't want to kill the context but just kill the state
+
+		keep_page: instead of closing every tab and leaving none, replace them by one blank tab and clear cookies,
+			storage (of every origin visited since the last reset) and permissions of the context over CDP.
+			Much cheaper than a new context when the context is reused for many short tasks.
 		"""
-		# close all tabs and clear cached state
 		session = await self.get_session()
 
-		pages = session.context.pages
-		for page in pages:
-			await page.close()
+		# downloads of the previous task must not be reported to the next one
+		for download_task in self._pending_downloads:
+			download_task.cancel()
+		self._pending_downloads = []
+		self._announced_downloads.clear()
+
+		if keep_page:
+			await self._reset_keeping_page(session)
+		else:
+			# close all tabs and clear cached state
+			pages = self._get_pages(session)
+			for page in pages:
+				await page.close()
 
 		session.cached_state = None
+		self._state_fingerprint = None
 		self.state.target_id = None
+		if hasattr(self, 'current_state'):
+			del self.current_state
+
+	async def _reset_keeping_page(self, session: BrowserSession) -> None:
+		"""Replace all tabs by one blank tab and wipe cookies, storage and permissions"""
+		pages = self._get_pages(session)
+
+		# every origin of the task - also the ones that are not loaded anymore
+		origins = set(self._visited_origins)
+		for page in pages:
+			for frame in page.frames:
+				origin = self._get_origin(frame.url)
+				if origin:
+					origins.add(origin)
+
+		# a new tab instead of navigating an old one - go_back must not lead to the pages of the previous task
+		page = await self._new_page(session)
+		for old_page in pages:
+			await old_page.close()
+
+		try:
+			cdp_session = await session.context.new_cdp_session(page)
+			try:
+				await cdp_session.send('Network.clearBrowserCookies')
+				for origin in origins:
+					await cdp_session.send('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+			finally:
+				await cdp_session.detach()
+		except Exception as e:
+			# not chromium - fall back to what playwright can clear
+			logger.debug(f'Failed to clear browser data over CDP, clearing cookies only: {e}')
+			await session.context.clear_cookies()
+
+		await session.context.clear_permissions()
+		self._visited_origins.clear()
+		logger.debug(f'Reset context keeping one page, cleared data of {len(origins)} origins')
+
+	@staticmethod
+	def _get_origin(url: str) -> str | None:
+		"""scheme://host[:port] of a http(s) url, None for everything else (about:, data:, ...)"""
+		from urllib.parse import urlsplit
+
+		parts = urlsplit(url)
+		if parts.scheme not in ('http', 'https') or not parts.hostname:
+			return None
+		port = f':{parts.port}' if parts.port else ''
+		return f'{parts.scheme}://{parts.hostname}{port}'
+
+	def _track_visited_origins(self, page: Page) -> None:
+		page.on('framenavigated', self._on_frame_navigated)
+
+	def _on_frame_navigated(self, frame: Frame) -> None:
+		origin = self._get_origin(frame.url)
+		if origin:
+			self._visited_origins.add(origin)
+
+	def _attach_download_listener(self, page: Page) -> None:
+		page.on('download', self._on_download)
+
+	def _on_download(self, download: Download) -> None:
+		"""Start saving a download in the background, it is reported by the next collect_downloads()"""
+		if not self.config.save_downloads_path:
+			return
+		task = asyncio.create_task(
+			self._save_download(download, self.config.save_downloads_path), name=download.suggested_filename
+		)
+		self._pending_downloads.append(task)
+		self._download_started.set()
+
+	async def _wait_for_download_start(self) -> None:
+		"""Give a download triggered by a click `download_wait_time` seconds to start"""
+		if not self.config.save_downloads_path or self.config.download_wait_time <= 0:
+			return
+		try:
+			await asyncio.wait_for(self._download_started.wait(), timeout=self.config.download_wait_time)
+		except asyncio.TimeoutError:
+			pass
+
+	async def _save_download(self, download: Download, directory: str) -> str | None:
+		# reserve the name right away - concurrent downloads with the same name must not collide
+		unique_filename = await self._get_unique_filename(directory, download.suggested_filename)
+		download_path = os.path.join(directory, unique_filename)
+		self._reserved_download_paths.add(download_path)
+		try:
+			await download.save_as(download_path)
+			logger.debug(f'Download triggered. Saved file to: {download_path}')
+			return download_path
+		except Exception as e:
+			logger.warning(f'Failed to save download {download.suggested_filename}: {str(e)}')
+			return None
+		finally:
+			self._reserved_download_paths.discard(download_path)
+
+	async def collect_downloads(self, wait: bool = False) -> list[str]:
+		"""
+		Report the downloads since the last call: saved ones with their path, failed ones, and ones still being
+		saved as started - those are reported again once they are saved. Only waits for them with `wait=True`.
+		"""
+		if wait and self._pending_downloads:
+			await asyncio.wait(self._pending_downloads)
+
+		messages: list[str] = []
+		still_saving: list[asyncio.Task[str | None]] = []
+		for task in self._pending_downloads:
+			if not task.done():
+				still_saving.append(task)
+				if task not in self._announced_downloads:
+					self._announced_downloads.add(task)
+					messages.append(f'💾  Download started: {task.get_name()}')
+				continue
+			self._announced_downloads.discard(task)
+			download_path = task.result()
+			if download_path:
+				messages.append(f'💾  Downloaded file to {download_path}')
+			else:
+				messages.append(f'💾  Failed to download {task.get_name()}')
+		self._pending_downloads = still_saving
+		return messages
 
 	async def _get_unique_filename(self, directory, filename):
 		"""Generate a unique filename by appending (1), (2), etc., if a file already exists."""
 		base, ext = os.path.splitext(filename)
 		counter = 1
 		new_filename = filename
-		while os.path.exists(os.path.join(directory, new_filename)):
+		while (
+			os.path.exists(os.path.join(directory, new_filename))
+			or os.path.join(directory, new_filename) in self._reserved_download_paths
+		):
 			new_filename = f'{base} ({counter}){ext}'
 			counter += 1
 		return new_filename
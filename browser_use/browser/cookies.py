@@ -0,0 +1,106 @@
+"""
+Debounced, atomic cookie persistence for browser contexts.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Optional
+
+from playwright.async_api import BrowserContext as PlaywrightBrowserContext
+
+logger = logging.getLogger(__name__)
+
+
+class CookiePersister:
+	"""
+	Persists the cookie jar of a context to `cookies_file`.
+
+	- saves requested within `debounce_seconds` are coalesced into one write
+	- the file is only written if the cookie jar actually changed (hash compare)
+	- writes go to a temp file which is then renamed over the target, so readers never see a half written file
+	- file I/O runs in a worker thread, never on the event loop
+	"""
+
+	def __init__(self, cookies_file: str, debounce_seconds: float = 1.0):
+		self.cookies_file = cookies_file
+		self.debounce_seconds = debounce_seconds
+
+		self._last_hash: Optional[str] = None
+		self._lock = asyncio.Lock()
+		self._pending: Optional[asyncio.Task] = None
+
+	@staticmethod
+	def _hash(cookies: list[dict[str, Any]]) -> str:
+		return hashlib.sha256(json.dumps(cookies, sort_keys=True).encode()).hexdigest()
+
+	async def load(self) -> list[dict[str, Any]]:
+		"""Read cookies from file, empty list if the file does not exist"""
+		cookies = await asyncio.to_thread(self._read)
+		if cookies:
+			self._last_hash = self._hash(cookies)
+		return cookies
+
+	def _read(self) -> list[dict[str, Any]]:
+		if not os.path.exists(self.cookies_file):
+			return []
+		with open(self.cookies_file, 'r') as f:
+			return json.load(f)
+
+	def schedule_save(self, context: PlaywrightBrowserContext) -> None:
+		"""Request a save - it happens at most once per debounce window"""
+		if self._pending is not None and not self._pending.done():
+			return
+		self._pending = asyncio.create_task(self._save_later(context))
+
+	async def _save_later(self, context: PlaywrightBrowserContext) -> None:
+		await asyncio.sleep(self.debounce_seconds)
+		await self.save(context)
+
+	async def save(self, context: PlaywrightBrowserContext) -> bool:
+		"""Save cookies now. Returns True if the file was written"""
+		# shielded - cancelling a debounced save must not abandon a write that is already running
+		return await asyncio.shield(self._save(context))
+
+	async def _save(self, context: PlaywrightBrowserContext) -> bool:
+		async with self._lock:
+			try:
+				cookies = await context.cookies()
+				cookies_hash = self._hash(cookies)
+				if cookies_hash == self._last_hash:
+					return False
+
+				logger.debug(f'Saving {len(cookies)} cookies to {self.cookies_file}')
+				await asyncio.to_thread(self._write_atomic, cookies)
+				self._last_hash = cookies_hash
+				return True
+			except Exception as e:
+				logger.warning(f'Failed to save cookies: {str(e)}')
+				return False
+
+	def _write_atomic(self, cookies: list[dict[str, Any]]) -> None:
+		dirname = os.path.dirname(self.cookies_file)
+		if dirname:
+			os.makedirs(dirname, exist_ok=True)
+
+		fd, tmp_path = tempfile.mkstemp(dir=dirname or '.', prefix='.cookies-', suffix='.tmp')
+		try:
+			with os.fdopen(fd, 'w') as f:
+				json.dump(cookies, f)
+				f.flush()
+				os.fsync(f.fileno())
+			os.replace(tmp_path, self.cookies_file)
+		except BaseException:
+			if os.path.exists(tmp_path):
+				os.remove(tmp_path)
+			raise
+
+	async def flush(self, context: PlaywrightBrowserContext) -> bool:
+		"""Cancel a pending debounced save and save immediately"""
+		if self._pending is not None and not self._pending.done():
+			self._pending.cancel()
+		self._pending = None
+		return await self.save(context)
@@ -0,0 +1,106 @@
+"""
+Allow/deny domain lists compiled into a suffix set matcher, enforced on navigations or at the network layer.
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import Route
+
+logger = logging.getLogger(__name__)
+
+_MAX_CACHED_HOSTS = 4096
+
+
+@dataclass
+class DomainPolicyStats:
+	checks: int = 0
+	blocked_navigations: int = 0
+	blocked_subresources: int = 0
+	blocked_hosts: Counter[str] = field(default_factory=Counter)
+
+	@property
+	def blocked_requests(self) -> int:
+		return self.blocked_navigations + self.blocked_subresources
+
+
+class DomainPolicy:
+	"""
+	`example.com` in a list matches `example.com` and all of its subdomains. A host is allowed if it is not denied
+	and, if there is an allow list, it is on it. Denied domains win over allowed ones.
+
+	Matching walks the labels of the host against a set of domains, so a check costs one set lookup per label
+	no matter how long the lists are. Decisions are cached per host.
+	"""
+
+	def __init__(self, allowed_domains: Optional[list[str]] = None, denied_domains: Optional[list[str]] = None):
+		self.allowed = frozenset(domain.lower().strip('.') for domain in allowed_domains) if allowed_domains else None
+		self.denied = frozenset(domain.lower().strip('.') for domain in denied_domains) if denied_domains else frozenset()
+		self.stats = DomainPolicyStats()
+		self._host_cache: dict[str, bool] = {}
+
+	@property
+	def is_active(self) -> bool:
+		return self.allowed is not None or bool(self.denied)
+
+	@staticmethod
+	def _matches(host: str, domains: frozenset[str]) -> bool:
+		# example.com matches sub.example.com: check every suffix that starts at a label boundary
+		suffix = host
+		while True:
+			if suffix in domains:
+				return True
+			dot = suffix.find('.')
+			if dot == -1:
+				return False
+			suffix = suffix[dot + 1 :]
+
+	def is_host_allowed(self, host: str) -> bool:
+		allowed = self._host_cache.get(host)
+		if allowed is None:
+			allowed = not self._matches(host, self.denied) and (self.allowed is None or self._matches(host, self.allowed))
+			if len(self._host_cache) >= _MAX_CACHED_HOSTS:
+				self._host_cache.clear()
+			self._host_cache[host] = allowed
+		return allowed
+
+	@staticmethod
+	def _host(url: str) -> Optional[str]:
+		try:
+			return urlsplit(url).hostname
+		except ValueError:
+			return None
+
+	def is_url_allowed(self, url: str) -> bool:
+		"""Check a URL against the lists - URLs without a host are only allowed if there is no allow list"""
+		if not self.is_active:
+			return True
+		self.stats.checks += 1
+		host = self._host(url)
+		if not host:
+			return self.allowed is None
+		return self.is_host_allowed(host)
+
+	def record_blocked(self, url: str, navigation: bool = True) -> None:
+		if navigation:
+			self.stats.blocked_navigations += 1
+		else:
+			self.stats.blocked_subresources += 1
+		self.stats.blocked_hosts[self._host(url) or ''] += 1
+
+	async def handle_route(self, route: Route) -> None:
+		"""
+		`context.route` handler - abort requests to disallowed hosts before any bytes load. Only installed with
+		`BrowserContextConfig.block_disallowed_requests`, since routing disables the HTTP cache of the context.
+		"""
+		request = route.request
+		if self.is_url_allowed(request.url):
+			await route.fallback()
+			return
+
+		self.record_blocked(request.url, navigation=request.is_navigation_request())
+		logger.debug(f'Blocked {request.resource_type} request to non-allowed URL: {request.url}')
+		await route.abort('blockedbyclient')
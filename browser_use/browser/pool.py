@@ -0,0 +1,80 @@
+"""
+Pool of reusable browser contexts on one Browser.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+if TYPE_CHECKING:
+	from browser_use.browser.browser import Browser
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserContextPool:
+	"""
+	Hands out up to `size` contexts of `browser`. Contexts are created on first use and reset with
+	`reset_context(keep_page=True)` when they are returned, so the next task starts on a fresh blank tab
+	with no cookies, no storage of any origin the previous task visited, no back/forward history and no
+	pending downloads - without paying for a new context.
+
+	A context whose reset fails is closed and replaced by a fresh one.
+	"""
+
+	def __init__(self, browser: Browser, size: int, config: Optional[BrowserContextConfig] = None):
+		self.browser = browser
+		self.size = size
+		self.config = config or browser.config.new_context_config
+
+		self._idle: asyncio.Queue[BrowserContext] = asyncio.Queue()
+		self._contexts: list[BrowserContext] = []
+		self._slots = asyncio.Semaphore(size)
+
+	@asynccontextmanager
+	async def acquire(self) -> AsyncIterator[BrowserContext]:
+		"""Borrow a context for the duration of the `async with` block"""
+		async with self._slots:
+			if self._idle.empty():
+				context = BrowserContext(browser=self.browser, config=self.config)
+				self._contexts.append(context)
+			else:
+				context = self._idle.get_nowait()
+
+			try:
+				yield context
+			finally:
+				await self._release(context)
+
+	async def _release(self, context: BrowserContext) -> None:
+		if context.session is None:
+			# never used
+			self._idle.put_nowait(context)
+			return
+		try:
+			await context.reset_context(keep_page=True)
+		except Exception as e:
+			logger.debug(f'Failed to reset pooled context, replacing it: {e}')
+			self._contexts.remove(context)
+			try:
+				await context.close()
+			except Exception:
+				pass
+			return
+		self._idle.put_nowait(context)
+
+	async def close(self) -> None:
+		"""Close all contexts of the pool - contexts in use are closed too"""
+		contexts, self._contexts = self._contexts, []
+		while not self._idle.empty():
+			self._idle.get_nowait()
+		for context in contexts:
+			try:
+				await context.close()
+			except Exception as e:
+				logger.debug(f'Failed to close pooled context: {e}')
@@ -0,0 +1,93 @@
+"""
+Named Chromium launch presets for running many headless contexts per machine.
+"""
+
+from dataclasses import dataclass, field
+from typing import Literal, Optional
+
+from browser_use.browser.context import BrowserContextWindowSize
+
+LaunchPresetName = Literal['throughput', 'low_memory']
+
+
+@dataclass(frozen=True)
+class LaunchPreset:
+	"""
+	Extra Chromium args and a default viewport for a workload.
+
+	`memory_profile` and `cpu_profile` describe the trade-off of the preset - they are documentation,
+	measure your own workload before sizing machines.
+	"""
+
+	name: str
+	args: tuple[str, ...]
+	memory_profile: str
+	cpu_profile: str
+	viewport: Optional[BrowserContextWindowSize] = field(default=None)
+
+
+# Everything a headless automation browser does not need: no extensions, no background
+# networking (safe browsing, component and variation updates, metrics) and no crash reporting
+_HEADLESS_BASE_ARGS = (
+	'--disable-gpu',
+	'--disable-dev-shm-usage',
+	'--disable-extensions',
+	'--disable-component-extensions-with-background-pages',
+	'--disable-background-networking',
+	'--disable-component-update',
+	'--disable-default-apps',
+	'--disable-sync',
+	'--disable-domain-reliability',
+	'--disable-client-side-phishing-detection',
+	'--disable-breakpad',
+	'--disable-hang-monitor',
+	'--metrics-recording-only',
+	'--no-pings',
+	'--mute-audio',
+	'--autoplay-policy=user-gesture-required',
+)
+
+LAUNCH_PRESETS: dict[str, LaunchPreset] = {
+	'throughput': LaunchPreset(
+		name='throughput',
+		args=_HEADLESS_BASE_ARGS
+		+ (
+			# renderers are shared between contexts once the limit is reached
+			'--renderer-process-limit=8',
+		),
+		viewport={'width': 1024, 'height': 768},
+		memory_profile=(
+			'Lower than the default launch: no GPU process, extension or background service processes, and at most 8 '
+			'renderer processes, so memory grows with page content instead of with the number of contexts. '
+			'Shared memory goes to /tmp instead of /dev/shm, which avoids renderer crashes in containers with a small /dev/shm.'
+		),
+		cpu_profile=(
+			'Compositing and rasterization run in software on the CPU. A smaller viewport and muted, '
+			'non-autoplaying media keep that cheap, and no CPU is spent on background networking or updates.'
+		),
+	),
+	'low_memory': LaunchPreset(
+		name='low_memory',
+		args=_HEADLESS_BASE_ARGS
+		+ (
+			'--renderer-process-limit=2',
+			'--js-flags=--max-old-space-size=256',
+			'--blink-settings=imagesEnabled=false',
+		),
+		viewport={'width': 800, 'height': 600},
+		memory_profile=(
+			'Lowest footprint: at most 2 renderer processes shared by all contexts, a 256 MB V8 heap limit per renderer and '
+			'images are not loaded. Pages with very large heaps can run out of memory.'
+		),
+		cpu_profile=(
+			'Same as throughput, but contexts compete for 2 renderer processes, so heavy pages in one context '
+			'slow down the others. Screenshots show no images - not suited for vision heavy tasks.'
+		),
+	),
+}
+
+
+def get_launch_preset(name: str) -> LaunchPreset:
+	if name not in LAUNCH_PRESETS:
+		raise ValueError(f'Unknown launch preset {name!r}, available presets: {", ".join(LAUNCH_PRESETS)}')
+	return LAUNCH_PRESETS[name]
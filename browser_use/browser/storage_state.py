@@ -0,0 +1,162 @@
+"""
+Versioned storage-state snapshots (cookies, localStorage, IndexedDB, sessionStorage) per profile.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import Any, Optional
+
+from playwright.async_api import BrowserContext as PlaywrightBrowserContext
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_SNAPSHOT_FILE_PATTERN = re.compile(r'^v(\d+)\.json$')
+
+
+class StorageStateStore:
+	"""
+	Stores snapshots as `{directory}/{profile}/v{N}.json`, newest N wins.
+
+	A snapshot is Playwright's `storage_state` (cookies + localStorage, plus IndexedDB if the
+	installed Playwright supports exporting it) extended with the sessionStorage of the open tabs.
+	Only the last `keep_versions` snapshots of a profile are kept.
+	"""
+
+	def __init__(self, directory: str, keep_versions: int = 5):
+		self.directory = directory
+		self.keep_versions = keep_versions
+
+	def _profile_dir(self, profile: str) -> str:
+		if not profile or os.sep in profile or profile in ('.', '..'):
+			raise ValueError(f'Invalid storage state profile name: {profile!r}')
+		return os.path.join(self.directory, profile)
+
+	def _versions(self, profile: str) -> list[int]:
+		profile_dir = self._profile_dir(profile)
+		if not os.path.isdir(profile_dir):
+			return []
+		versions = []
+		for name in os.listdir(profile_dir):
+			match = _SNAPSHOT_FILE_PATTERN.match(name)
+			if match:
+				versions.append(int(match.group(1)))
+		return sorted(versions)
+
+	def _snapshot_path(self, profile: str, version: int) -> str:
+		return os.path.join(self._profile_dir(profile), f'v{version:06d}.json')
+
+	def latest_path(self, profile: str) -> Optional[str]:
+		versions = self._versions(profile)
+		return self._snapshot_path(profile, versions[-1]) if versions else None
+
+	async def load(self, profile: str) -> Optional[dict[str, Any]]:
+		"""Load the newest snapshot of a profile, None if there is none"""
+		return await asyncio.to_thread(self._load, profile)
+
+	def _load(self, profile: str) -> Optional[dict[str, Any]]:
+		path = self.latest_path(profile)
+		if path is None:
+			return None
+		with open(path, 'r') as f:
+			snapshot = json.load(f)
+		if snapshot.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+			logger.warning(f'Ignoring storage state snapshot with unknown format: {path}')
+			return None
+		return snapshot
+
+	async def save(self, context: PlaywrightBrowserContext, profile: str) -> str:
+		"""Snapshot the context and store it as the newest version of the profile. Returns the file path"""
+		try:
+			state = await context.storage_state(indexed_db=True)
+		except TypeError:
+			# Playwright < 1.51 can not export IndexedDB
+			logger.debug('Installed Playwright does not support IndexedDB export, saving without it')
+			state = await context.storage_state()
+
+		snapshot = {
+			'format_version': SNAPSHOT_FORMAT_VERSION,
+			'created_at': time.time(),
+			'storage_state': state,
+			'session_storage': await self._collect_session_storage(context),
+		}
+		return await asyncio.to_thread(self._write, profile, snapshot)
+
+	@staticmethod
+	async def _collect_session_storage(context: PlaywrightBrowserContext) -> dict[str, dict[str, str]]:
+		session_storage: dict[str, dict[str, str]] = {}
+		for page in context.pages:
+			try:
+				origin, items = await page.evaluate('() => [location.origin, Object.fromEntries(Object.entries(sessionStorage))]')
+			except Exception as e:
+				logger.debug(f'Failed to read sessionStorage of {page.url}: {e}')
+				continue
+			if origin and origin != 'null' and items:
+				session_storage.setdefault(origin, {}).update(items)
+		return session_storage
+
+	def _write(self, profile: str, snapshot: dict[str, Any]) -> str:
+		profile_dir = self._profile_dir(profile)
+		os.makedirs(profile_dir, exist_ok=True)
+
+		versions = self._versions(profile)
+		path = self._snapshot_path(profile, (versions[-1] + 1) if versions else 1)
+
+		fd, tmp_path = tempfile.mkstemp(dir=profile_dir, prefix='.snapshot-', suffix='.tmp')
+		try:
+			with os.fdopen(fd, 'w') as f:
+				json.dump(snapshot, f)
+			os.replace(tmp_path, path)
+		except BaseException:
+			if os.path.exists(tmp_path):
+				os.remove(tmp_path)
+			raise
+
+		# prune old versions
+		for version in self._versions(profile)[: -max(1, self.keep_versions)]:
+			os.remove(self._snapshot_path(profile, version))
+
+		logger.debug(f'Saved storage state snapshot {path}')
+		return path
+
+	@staticmethod
+	def local_storage_init_script(origins: list[dict[str, Any]]) -> str:
+		"""
+		Init script that restores the localStorage of the snapshotted origins (Playwright's `storage_state['origins']`)
+		on contexts that were not created from the snapshot. An origin that already has localStorage keeps it.
+		"""
+		local_storage = {
+			entry['origin']: {item['name']: item['value'] for item in entry.get('localStorage', [])}
+			for entry in origins
+			if entry.get('localStorage')
+		}
+		return f"""
+			(() => {{
+				const snapshot = {json.dumps(local_storage)};
+				const items = snapshot[location.origin];
+				if (!items || localStorage.length > 0) return;
+				for (const [key, value] of Object.entries(items)) {{
+					localStorage.setItem(key, value);
+				}}
+			}})();
+			"""
+
+	@staticmethod
+	def session_storage_init_script(session_storage: dict[str, dict[str, str]]) -> str:
+		"""Init script that restores sessionStorage for the snapshotted origins on a fresh tab"""
+		return f"""
+			(() => {{
+				const snapshot = {json.dumps(session_storage)};
+				const items = snapshot[location.origin];
+				if (!items || sessionStorage.length > 0) return;
+				for (const [key, value] of Object.entries(items)) {{
+					sessionStorage.setItem(key, value);
+				}}
+			}})();
+			"""
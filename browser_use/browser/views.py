@@ -16,6 +16,53 @@ class TabInfo(BaseModel):
 	title: str
 
 
+@dataclass
+class TabMemoryMetrics:
+	"""Renderer metrics of one tab from CDP Performance.getMetrics"""
+
+	url: str
+	js_heap_used_bytes: int
+	nodes: int
+	documents: int
+	idle_seconds: float
+
+
+@dataclass
+class MemoryMetrics:
+	"""Latest sample of the memory watchdog and what it did about it"""
+
+	tabs: list[TabMemoryMetrics]
+	sampled_at: float
+	evicted_tabs: list[str] = field(default_factory=list)
+	reloaded_tabs: list[str] = field(default_factory=list)
+
+	@property
+	def total_js_heap_used_bytes(self) -> int:
+		return sum(tab.js_heap_used_bytes for tab in self.tabs)
+
+
+@dataclass(frozen=True)
+class PageFingerprint:
+	"""Cheap summary of the current page, if it is equal the page did not change"""
+
+	page_id: str
+	tabs: int
+	url: str
+	# ids of the documents of the page and its frames, and their mutation and input counters summed up
+	documents: tuple[str, ...]
+	dom_mutations: int
+	interactions: int
+	scroll_x: int
+	scroll_y: int
+	viewport_width: int
+	viewport_height: int
+
+	@property
+	def dom(self) -> tuple:
+		"""The part of the fingerprint that changes with the DOM - input and scrolling aside"""
+		return (self.page_id, self.url, self.documents, self.dom_mutations)
+
+
 @dataclass
 class BrowserState(DOMState):
 	url: str
@@ -25,6 +72,7 @@ class BrowserState(DOMState):
 	pixels_above: int = 0
 	pixels_below: int = 0
 	browser_errors: list[str] = field(default_factory=list)
+	memory_metrics: Optional[MemoryMetrics] = None
 
 
 @dataclass
@@ -45,6 +93,18 @@ class BrowserStateHistory:
 		return data
 
 
+@dataclass
+class PageLoadTiming:
+	"""Load timing of a navigation, recorded with persistent profiles to compare cold and warm caches"""
+
+	url: str
+	warm_profile: bool
+	duration_ms: float
+	transfer_bytes: int
+	resources: int
+	cached_resources: int
+
+
 class BrowserError(Exception):
 	"""Base class for all browser errors"""
 
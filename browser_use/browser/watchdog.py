@@ -0,0 +1,163 @@
+"""
+Renderer memory watchdog - samples tab metrics over CDP and recycles tabs that exceed their budget.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Optional
+
+from playwright.async_api import CDPSession, Page
+
+from browser_use.browser.views import MemoryMetrics, TabMemoryMetrics
+
+if TYPE_CHECKING:
+	from browser_use.browser.context import BrowserContext
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryWatchdog:
+	"""
+	Samples `Performance.getMetrics` (JSHeapUsedSize, Nodes, Documents) of every tab of a context at most
+	every `interval` seconds and enforces the budgets of the context config.
+
+	Tabs other than the current one are closed if they exceed the per tab budget, and the least recently used
+	ones are closed while the whole context exceeds `max_total_js_heap_mb`. The current tab is never closed -
+	if it exceeds the per tab budget it is reloaded, keeping URL and scroll position.
+
+	All of it runs in `step`, which get_state calls between steps - never concurrently with an action.
+	"""
+
+	def __init__(self, browser_context: BrowserContext, interval: float):
+		self.browser_context = browser_context
+		self.interval = interval
+		self.latest: Optional[MemoryMetrics] = None
+
+		self._cdp_sessions: dict[Page, CDPSession] = {}
+		self._last_used: dict[Page, float] = {}
+		self._reload_pending = False
+		self._last_check: Optional[float] = None
+
+	async def step(self) -> None:
+		"""Check the tabs if `interval` seconds passed since the last check, and reload the current tab if needed"""
+		now = time.monotonic()
+		if self._last_check is None or now - self._last_check >= self.interval:
+			self._last_check = now
+			try:
+				await self.check()
+			except Exception as e:
+				logger.debug(f'Memory watchdog check failed: {e}')
+		# the watchdog must never fail a step - a failed reload leaves the tab as it is
+		try:
+			await self.reload_if_needed()
+		except Exception as e:
+			logger.warning(f'Memory watchdog failed to reload the current tab: {e}')
+
+	async def stop(self) -> None:
+		"""Detach the CDP sessions of the sampled tabs"""
+		for page, cdp_session in self._cdp_sessions.items():
+			try:
+				await cdp_session.detach()
+			except Exception as e:
+				logger.debug(f'Failed to detach CDP session of {page.url}: {e}')
+		self._cdp_sessions.clear()
+		self._last_used.clear()
+		self._last_check = None
+
+	async def _get_cdp_session(self, page: Page) -> CDPSession:
+		cdp_session = self._cdp_sessions.get(page)
+		if cdp_session is None:
+			cdp_session = await page.context.new_cdp_session(page)
+			await cdp_session.send('Performance.enable')
+			self._cdp_sessions[page] = cdp_session
+		return cdp_session
+
+	async def _sample_page(self, page: Page, now: float) -> Optional[TabMemoryMetrics]:
+		try:
+			cdp_session = await self._get_cdp_session(page)
+			result = await cdp_session.send('Performance.getMetrics')
+		except Exception as e:
+			logger.debug(f'Failed to sample memory metrics of {page.url}: {e}')
+			return None
+		metrics = {metric['name']: metric['value'] for metric in result.get('metrics', [])}
+		return TabMemoryMetrics(
+			url=page.url,
+			js_heap_used_bytes=int(metrics.get('JSHeapUsedSize', 0)),
+			nodes=int(metrics.get('Nodes', 0)),
+			documents=int(metrics.get('Documents', 0)),
+			idle_seconds=now - self._last_used.get(page, now),
+		)
+
+	def _over_tab_budget(self, tab: TabMemoryMetrics) -> bool:
+		config = self.browser_context.config
+		return tab.js_heap_used_bytes > config.max_tab_js_heap_mb * 1024 * 1024 or tab.nodes > config.max_tab_dom_nodes
+
+	async def check(self) -> MemoryMetrics:
+		"""Sample all tabs once, close idle tabs that are over budget and flag the current tab for reload"""
+		current_page = await self.browser_context.get_current_page()
+		pages = await self.browser_context.get_pages()
+
+		# forget closed tabs
+		for page in list(self._cdp_sessions):
+			if page not in pages:
+				del self._cdp_sessions[page]
+		for page in list(self._last_used):
+			if page not in pages:
+				del self._last_used[page]
+
+		now = time.time()
+		self._last_used[current_page] = now
+		sampled: list[tuple[Page, TabMemoryMetrics]] = []
+		for page in pages:
+			tab = await self._sample_page(page, now)
+			if tab is not None:
+				sampled.append((page, tab))
+
+		report = MemoryMetrics(tabs=[tab for _, tab in sampled], sampled_at=now)
+		config = self.browser_context.config
+		total_heap = report.total_js_heap_used_bytes
+
+		# least recently used first
+		idle = sorted(
+			((page, tab) for page, tab in sampled if page is not current_page),
+			key=lambda item: self._last_used.get(item[0], 0.0),
+		)
+		for page, tab in idle:
+			over_total = total_heap > config.max_total_js_heap_mb * 1024 * 1024
+			if not over_total and not self._over_tab_budget(tab):
+				continue
+			logger.info(f'Memory watchdog: closing idle tab {tab.url} ({tab.js_heap_used_bytes / 1024 / 1024:.0f} MB JS heap)')
+			try:
+				await page.close()
+			except Exception as e:
+				logger.debug(f'Failed to close tab {tab.url}: {e}')
+				continue
+			total_heap -= tab.js_heap_used_bytes
+			report.evicted_tabs.append(tab.url)
+
+		current_tab = next((tab for page, tab in sampled if page is current_page), None)
+		if current_tab is not None and self._over_tab_budget(current_tab):
+			self._reload_pending = True
+
+		self.latest = report
+		return report
+
+	async def reload_if_needed(self) -> bool:
+		"""Reload the current tab if the last check found it over budget, keeping URL and scroll position"""
+		if not self._reload_pending:
+			return False
+		self._reload_pending = False
+
+		page = await self.browser_context.get_current_page()
+		url = page.url
+		scroll = await page.evaluate('() => [window.scrollX, window.scrollY]')
+		logger.info(f'Memory watchdog: reloading {url} to free memory')
+		await page.goto(url)
+		await page.wait_for_load_state()
+		await page.evaluate('([x, y]) => window.scrollTo(x, y)', scroll)
+
+		if self.latest is not None:
+			self.latest.reloaded_tabs.append(url)
+		return True
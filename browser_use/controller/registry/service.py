@@ -5,6 +5,7 @@ from typing import Any, Callable, Dict, Generic, Optional, Type, TypeVar
 from langchain_core.language_models.chat_models import BaseChatModel
 from pydantic import BaseModel, Field, create_model
 
+from browser_use.agent.llm_cache import LLMCache
 from browser_use.browser.context import BrowserContext
 from browser_use.controller.registry.views import (
 	ActionModel,
@@ -36,7 +37,7 @@ class Registry(Generic[Context]):
 		params = {
 			name: (param.annotation, ... if param.default == param.empty else param.default)
 			for name, param in sig.parameters.items()
-			if name != 'browser' and name != 'page_extraction_llm' and name != 'available_file_paths'
+			if name not in ('browser', 'page_extraction_llm', 'available_file_paths', 'llm_cache')
 		}
 		# TODO: make the types here work
 		return create_model(
@@ -94,6 +95,7 @@ class Registry(Generic[Context]):
 		page_extraction_llm: Optional[BaseChatModel] = None,
 		sensitive_data: Optional[Dict[str, str]] = None,
 		available_file_paths: Optional[list[str]] = None,
+		llm_cache: Optional[LLMCache] = None,
 		#
 		context: Context | None = None,
 	) -> Any:
@@ -136,6 +138,8 @@ class Registry(Generic[Context]):
 				extra_args['page_extraction_llm'] = page_extraction_llm
 			if 'available_file_paths' in parameter_names:
 				extra_args['available_file_paths'] = available_file_paths
+			if 'llm_cache' in parameter_names:
+				extra_args['llm_cache'] = llm_cache
 			if action_name == 'input_text' and sensitive_data:
 				extra_args['has_sensitive_data'] = True
 			if is_pydantic:
@@ -1,6 +1,6 @@
 import asyncio
-import json
 import enum
+import json
 import logging
 from typing import Dict, Generic, Optional, Type, TypeVar
 
@@ -10,6 +10,8 @@ from langchain_core.prompts import PromptTemplate
 # from lmnr.sdk.laminar import Laminar
 from pydantic import BaseModel
 
+from browser_use.agent.llm_cache import LLMCache
+from browser_use.agent.llm_limiter import estimate_tokens, get_llm_limiter, provider_name
 from browser_use.agent.views import ActionModel, ActionResult
 from browser_use.browser.context import BrowserContext
 from browser_use.controller.registry.service import Registry
@@ -129,11 +131,8 @@ class Controller(Generic[Context]):
 			msg = None
 
 			try:
-				download_path = await browser._click_element_node(element_node)
-				if download_path:
-					msg = f'💾  Downloaded file to {download_path}'
-				else:
-					msg = f'🖱️  Clicked button with index {params.index}: {element_node.get_all_text_till_next_clickable_element(max_depth=2)}'
+				await browser._click_element_node(element_node)
+				msg = f'🖱️  Clicked button with index {params.index}: {element_node.get_all_text_till_next_clickable_element(max_depth=2)}'
 
 				logger.info(msg)
 				logger.debug(f'Element xpath: {element_node.xpath}')
@@ -187,7 +186,9 @@ class Controller(Generic[Context]):
 		@self.registry.action(
 			'Extract page content to retrieve specific information from the page, e.g. all company names, a specifc description, all information about, links with companies in structured format or simply links',
 		)
-		async def extract_content(goal: str, browser: BrowserContext, page_extraction_llm: BaseChatModel):
+		async def extract_content(
+			goal: str, browser: BrowserContext, page_extraction_llm: BaseChatModel, llm_cache: Optional[LLMCache] = None
+		):
 			page = await browser.get_current_page()
 			import markdownify
 
@@ -196,8 +197,23 @@ class Controller(Generic[Context]):
 			prompt = 'Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}'
 			template = PromptTemplate(input_variables=['goal', 'page'], template=prompt)
 			try:
-				output = page_extraction_llm.invoke(template.format(goal=goal, page=content))
-				msg = f'📄  Extracted from page\n: {output.content}\n'
+				extraction_prompt = template.format(goal=goal, page=content)
+				cache_key, extracted = None, None
+				# not `if llm_cache` - an empty cache is falsy, it has a length
+				if llm_cache is not None:
+					cache_key = llm_cache.make_key(page_extraction_llm, extraction_prompt, 'extract_content')
+					extracted = await llm_cache.aget(cache_key)
+				if extracted is None:
+					output = await get_llm_limiter().ainvoke(
+						page_extraction_llm,
+						extraction_prompt,
+						provider=provider_name(page_extraction_llm),
+						tokens=estimate_tokens(extraction_prompt),
+					)
+					extracted = str(output.content)
+					if llm_cache is not None and cache_key is not None:
+						await llm_cache.aput(cache_key, extracted)
+				msg = f'📄  Extracted from page\n: {extracted}\n'
 				logger.info(msg)
 				return ActionResult(extracted_content=msg, include_in_memory=True)
 			except Exception as e:
@@ -491,6 +507,7 @@ class Controller(Generic[Context]):
 		page_extraction_llm: Optional[BaseChatModel] = None,
 		sensitive_data: Optional[Dict[str, str]] = None,
 		available_file_paths: Optional[list[str]] = None,
+		llm_cache: Optional[LLMCache] = None,
 		#
 		context: Context | None = None,
 	) -> ActionResult:
@@ -514,19 +531,32 @@ class Controller(Generic[Context]):
 						page_extraction_llm=page_extraction_llm,
 						sensitive_data=sensitive_data,
 						available_file_paths=available_file_paths,
+						llm_cache=llm_cache,
 						context=context,
 					)
 
 					# Laminar.set_span_output(result)
 
 					if isinstance(result, str):
-						return ActionResult(extracted_content=result)
-					elif isinstance(result, ActionResult):
-						return result
+						result = ActionResult(extracted_content=result)
 					elif result is None:
-						return ActionResult()
-					else:
+						result = ActionResult()
+					elif not isinstance(result, ActionResult):
 						raise ValueError(f'Invalid action result type: {type(result)} of {result}')
+
+					if browser_context.config.save_downloads_path:
+						await self.attach_downloads(result, browser_context)
+					return result
 			return ActionResult()
 		except Exception as e:
 			raise e
+
+	async def attach_downloads(self, result: ActionResult, browser_context: BrowserContext, wait: bool = False) -> None:
+		"""Report downloads that started or were saved since the previous action on this action's result"""
+		messages = await browser_context.collect_downloads(wait=wait)
+		if not messages:
+			return
+		msg = '\n'.join(messages)
+		logger.info(msg)
+		result.extracted_content = f'{result.extracted_content}\n{msg}' if result.extracted_content else msg
+		result.include_in_memory = True
@@ -1,12 +1,13 @@
 (
   args = {
     doHighlightElements: true,
+    collectHighlightBoxes: false,
     focusHighlightIndex: -1,
     viewportExpansion: 0,
     debugMode: false,
   }
 ) => {
-  const { doHighlightElements, focusHighlightIndex, viewportExpansion, debugMode } = args;
+  const { doHighlightElements, collectHighlightBoxes, focusHighlightIndex, viewportExpansion, debugMode } = args;
   let highlightIndex = 0; // Reset highlight index
 
   // Add timing stack to handle recursion
@@ -332,6 +333,32 @@
     }
   }
 
+  /**
+   * Returns the position of an element relative to the top level viewport.
+   */
+  function getViewportBox(element, parentIframe = null) {
+    const rect = measureDomOperation(
+      () => element.getBoundingClientRect(),
+      'getBoundingClientRect'
+    );
+    if (!rect) return null;
+
+    let offsetX = 0;
+    let offsetY = 0;
+    if (parentIframe) {
+      const iframeRect = parentIframe.getBoundingClientRect();
+      offsetX = iframeRect.left;
+      offsetY = iframeRect.top;
+    }
+
+    return {
+      x: Math.round(rect.left + offsetX),
+      y: Math.round(rect.top + offsetY),
+      width: Math.round(rect.width),
+      height: Math.round(rect.height),
+    };
+  }
+
   /**
    * Returns an XPath tree string for an element.
    */
@@ -909,14 +936,14 @@
             nodeData.isInViewport = true;
             nodeData.highlightIndex = highlightIndex++;
 
-            if (doHighlightElements) {
-              if (focusHighlightIndex >= 0) {
-                if (focusHighlightIndex === nodeData.highlightIndex) {
-                  highlightElement(node, nodeData.highlightIndex, parentIframe);
-                }
-              } else {
+            if (focusHighlightIndex < 0 || focusHighlightIndex === nodeData.highlightIndex) {
+              if (doHighlightElements) {
                 highlightElement(node, nodeData.highlightIndex, parentIframe);
               }
+              // Boxes are drawn onto the screenshot in Python, without touching the page
+              if (collectHighlightBoxes) {
+                nodeData.viewportCoordinates = getViewportBox(node, parentIframe);
+              }
             }
           }
         }
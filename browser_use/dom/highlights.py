@@ -0,0 +1,110 @@
+"""
+Draws the numbered element highlights onto a screenshot instead of into the page.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import logging
+from typing import TYPE_CHECKING
+
+from browser_use.dom.views import SelectorMap
+
+if TYPE_CHECKING:
+	from PIL import ImageFont
+
+logger = logging.getLogger(__name__)
+
+# Same palette as highlightElement in buildDomTree.js
+HIGHLIGHT_COLORS = [
+	'#FF0000',
+	'#00FF00',
+	'#0000FF',
+	'#FFA500',
+	'#800080',
+	'#008080',
+	'#FF69B4',
+	'#4B0082',
+	'#FF4500',
+	'#2E8B57',
+	'#DC143C',
+	'#4682B4',
+]
+
+_LABEL_HEIGHT = 16
+
+
+def _load_font(size: int) -> ImageFont.ImageFont | ImageFont.FreeTypeFont:
+	from PIL import ImageFont
+
+	for font_name in ('DejaVuSans.ttf', 'Arial.ttf', 'Helvetica.ttc'):
+		try:
+			return ImageFont.truetype(font_name, size)
+		except OSError:
+			continue
+	try:
+		return ImageFont.load_default(size=size)
+	except TypeError:
+		# Pillow < 10.1
+		return ImageFont.load_default()
+
+
+def draw_highlights(screenshot_b64: str, selector_map: SelectorMap, viewport_width: int | None = None) -> str:
+	"""
+	Draw a box and its index label for every element of the selector map that has `viewport_coordinates`.
+
+	viewport_width: width of the viewport in CSS pixels, to scale the boxes to the screenshot's device pixels
+	"""
+	from PIL import Image, ImageDraw
+
+	image = Image.open(io.BytesIO(base64.b64decode(screenshot_b64))).convert('RGBA')
+	scale = image.width / viewport_width if viewport_width else 1.0
+	overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
+	draw = ImageDraw.Draw(overlay)
+	font = _load_font(max(8, round(11 * scale)))
+	label_height = round(_LABEL_HEIGHT * scale)
+
+	for index, node in selector_map.items():
+		box = node.viewport_coordinates
+		if box is None or box.width <= 0 or box.height <= 0:
+			continue
+
+		color = HIGHLIGHT_COLORS[index % len(HIGHLIGHT_COLORS)]
+		r, g, b = (int(color[i : i + 2], 16) for i in (1, 3, 5))
+		left = round(box.top_left.x * scale)
+		top = round(box.top_left.y * scale)
+		right = round(box.bottom_right.x * scale)
+		bottom = round(box.bottom_right.y * scale)
+		if right < 0 or bottom < 0 or left > image.width or top > image.height:
+			continue
+
+		# 10% opacity fill and a 2px border, like the DOM highlights
+		draw.rectangle((left, top, right, bottom), fill=(r, g, b, 26), outline=(r, g, b, 255), width=max(1, round(2 * scale)))
+
+		label = str(index)
+		text_left, text_top, text_right, text_bottom = draw.textbbox((0, 0), label, font=font)
+		text_width, text_height = text_right - text_left, text_bottom - text_top
+		label_width = text_width + round(8 * scale)
+
+		# inside the top right corner, above the box if the element is too small
+		label_left = right - label_width - round(2 * scale)
+		label_top = top + round(2 * scale)
+		if right - left < label_width + 4 * scale or bottom - top < label_height + 4 * scale:
+			label_left = right - label_width
+			label_top = top - label_height - round(2 * scale)
+		label_left = min(max(label_left, 0), image.width - label_width)
+		label_top = min(max(label_top, 0), image.height - label_height)
+
+		draw.rounded_rectangle(
+			(label_left, label_top, label_left + label_width, label_top + label_height),
+			radius=round(4 * scale),
+			fill=(r, g, b, 255),
+		)
+		text_x = label_left + (label_width - text_width) / 2 - text_left
+		text_y = label_top + (label_height - text_height) / 2 - text_top
+		draw.text((text_x, text_y), label, fill=(255, 255, 255, 255), font=font)
+
+	buffer = io.BytesIO()
+	Image.alpha_composite(image, overlay).convert('RGB').save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode('utf-8')
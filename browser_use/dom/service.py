@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, Optional
 if TYPE_CHECKING:
 	from playwright.async_api import Page
 
+from browser_use.dom.history_tree_processor.view import Coordinates, CoordinateSet
 from browser_use.dom.views import (
 	DOMBaseNode,
 	DOMElementNode,
@@ -40,8 +41,15 @@ class DomService:
 		highlight_elements: bool = True,
 		focus_element: int = -1,
 		viewport_expansion: int = 0,
+		collect_highlight_boxes: bool = False,
 	) -> DOMState:
-		element_tree, selector_map = await self._build_dom_tree(highlight_elements, focus_element, viewport_expansion)
+		"""
+		collect_highlight_boxes: store the viewport box of every highlighted element in `viewport_coordinates`,
+		to draw the highlights onto a screenshot instead of into the page
+		"""
+		element_tree, selector_map = await self._build_dom_tree(
+			highlight_elements, focus_element, viewport_expansion, collect_highlight_boxes
+		)
 		return DOMState(element_tree=element_tree, selector_map=selector_map)
 
 	@time_execution_async('--build_dom_tree')
@@ -50,6 +58,7 @@ class DomService:
 		highlight_elements: bool,
 		focus_element: int,
 		viewport_expansion: int,
+		collect_highlight_boxes: bool = False,
 	) -> tuple[DOMElementNode, SelectorMap]:
 		if await self.page.evaluate('1+1') != 2:
 			raise ValueError('The page cannot evaluate javascript code properly')
@@ -60,6 +69,7 @@ class DomService:
 		debug_mode = logger.getEffectiveLevel() == logging.DEBUG
 		args = {
 			'doHighlightElements': highlight_elements,
+			'collectHighlightBoxes': collect_highlight_boxes,
 			'focusHighlightIndex': focus_element,
 			'viewportExpansion': viewport_expansion,
 			'debugMode': debug_mode,
@@ -149,6 +159,10 @@ class DomService:
 				height=node_data['viewport']['height'],
 			)
 
+		viewport_coordinates = None
+		if node_data.get('viewportCoordinates'):
+			viewport_coordinates = self._coordinate_set(**node_data['viewportCoordinates'])
+
 		element_node = DOMElementNode(
 			tag_name=node_data['tagName'],
 			xpath=node_data['xpath'],
@@ -162,8 +176,21 @@ class DomService:
 			shadow_root=node_data.get('shadowRoot', False),
 			parent=None,
 			viewport_info=viewport_info,
+			viewport_coordinates=viewport_coordinates,
 		)
 
 		children_ids = node_data.get('children', [])
 
 		return element_node, children_ids
+
+	@staticmethod
+	def _coordinate_set(x: int, y: int, width: int, height: int) -> CoordinateSet:
+		return CoordinateSet(
+			top_left=Coordinates(x=x, y=y),
+			top_right=Coordinates(x=x + width, y=y),
+			bottom_left=Coordinates(x=x, y=y + height),
+			bottom_right=Coordinates(x=x + width, y=y + height),
+			center=Coordinates(x=x + width // 2, y=y + height // 2),
+			width=width,
+			height=height,
+		)
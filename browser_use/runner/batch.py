@@ -0,0 +1,250 @@
+"""
+Run a batch of tasks with bounded concurrency on a pool of browser contexts and stream the results to JSONL.
+
+	python -m browser_use.runner.batch tasks.jsonl --output results.jsonl --concurrency 4 --model gpt-4o
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Sequence, TypeVar
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from pydantic import BaseModel
+
+from browser_use.browser.browser import Browser, BrowserConfig
+from browser_use.browser.pool import BrowserContextPool
+from browser_use.runner.views import RunnerTask, TaskResult
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+R = TypeVar('R', bound=BaseModel)
+
+
+def load_tasks(path: str | Path) -> list[RunnerTask]:
+	"""
+	Read tasks from a file - `.jsonl` with one `{"task": ..., "task_id": ..., "max_steps": ...}` object per line
+	(only `task` is required), anything else with one task per line.
+	"""
+	path = Path(path)
+	tasks: list[RunnerTask] = []
+	for line in path.read_text(encoding='utf-8').splitlines():
+		line = line.strip()
+		if not line:
+			continue
+		if path.suffix == '.jsonl':
+			data = json.loads(line)
+			tasks.append(RunnerTask(**{k: v for k, v in data.items() if k in ('task', 'task_id', 'max_steps')}))
+		else:
+			tasks.append(RunnerTask(task=line))
+	return tasks
+
+
+def _percentile(values: list[float], q: float) -> float:
+	"""Linear interpolation between closest ranks"""
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	rank = (len(ordered) - 1) * q
+	low, high = math.floor(rank), math.ceil(rank)
+	return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class BatchReport:
+	results: list[TaskResult] = field(default_factory=list)
+	wall_seconds: float = 0.0
+
+	# every result is counted in exactly one of succeeded, unsuccessful (done, but not successful) and failed
+
+	@property
+	def failed(self) -> int:
+		return sum(1 for r in self.results if r.error or not r.is_done)
+
+	@property
+	def succeeded(self) -> int:
+		return sum(1 for r in self.results if not r.error and r.is_done and r.is_successful)
+
+	@property
+	def unsuccessful(self) -> int:
+		return len(self.results) - self.succeeded - self.failed
+
+	@property
+	def tasks_per_minute(self) -> float:
+		return len(self.results) / self.wall_seconds * 60 if self.wall_seconds else 0.0
+
+	@property
+	def p50_seconds(self) -> float:
+		return _percentile([r.duration_seconds for r in self.results], 0.5)
+
+	@property
+	def p95_seconds(self) -> float:
+		return _percentile([r.duration_seconds for r in self.results], 0.95)
+
+	def summary(self) -> str:
+		return (
+			f'{len(self.results)} tasks in {self.wall_seconds:.1f}s ({self.tasks_per_minute:.1f} tasks/min) - '
+			f'{self.succeeded} succeeded, {self.unsuccessful} unsuccessful, {self.failed} failed - '
+			f'latency p50 {self.p50_seconds:.1f}s, p95 {self.p95_seconds:.1f}s'
+		)
+
+
+async def run_on_pool(
+	items: Sequence[T],
+	run_item: Callable[[T, BrowserContextPool], Awaitable[R]],
+	item_id: Callable[[T], str],
+	browser: Optional[Browser],
+	browser_config: BrowserConfig,
+	concurrency: int,
+	output_path: Optional[str | Path] = None,
+	label: str = 'tasks',
+) -> list[R]:
+	"""
+	Run `run_item` for every item on a pool of `concurrency` contexts of `browser` - or of a new browser from
+	`browser_config`, closed afterwards. If `output_path` is set, every result is appended to it as one JSON line
+	as soon as it is done. Used by `BatchRunner` and `ReplayRunner`.
+
+	Returns the results in the order of `items`.
+	"""
+	owns_browser = browser is None
+	browser = browser or Browser(config=browser_config)
+	pool = BrowserContextPool(browser, size=concurrency)
+	output = open(output_path, 'a', encoding='utf-8') if output_path else None
+
+	results: dict[str, R] = {}
+
+	async def run_and_record(item: T) -> None:
+		result = await run_item(item, pool)
+		results[item_id(item)] = result
+		if output is not None:
+			output.write(result.model_dump_json() + '\n')
+			output.flush()
+		logger.info(f'Finished {len(results)}/{len(items)} {label}')
+
+	try:
+		# the pool bounds the concurrency - items wait for a free context
+		await asyncio.gather(*(run_and_record(item) for item in items))
+	finally:
+		if output is not None:
+			output.close()
+		await pool.close()
+		if owns_browser:
+			await browser.close()
+
+	return [results[item_id(item)] for item in items]
+
+
+class BatchRunner:
+	"""
+	Runs tasks on one Browser with at most `concurrency` agents at a time, each on a context from a
+	`BrowserContextPool`. Every task gets `max_steps` steps (or its own `RunnerTask.max_steps`) and at most
+	`task_timeout` seconds of wall-clock time.
+
+	For more agents than one event loop can drive, see `ShardedAgentRunner`.
+	"""
+
+	def __init__(
+		self,
+		llm: BaseChatModel,
+		browser: Optional[Browser] = None,
+		browser_config: Optional[BrowserConfig] = None,
+		concurrency: int = 4,
+		max_steps: int = 100,
+		task_timeout: Optional[float] = None,
+		agent_kwargs: Optional[dict[str, Any]] = None,
+	):
+		self.llm = llm
+		self.browser = browser
+		self.browser_config = browser_config or BrowserConfig(headless=True)
+		self.concurrency = concurrency
+		self.max_steps = max_steps
+		self.task_timeout = task_timeout
+		self.agent_kwargs = agent_kwargs or {}
+
+	async def _run_task(self, task: RunnerTask, pool: BrowserContextPool) -> TaskResult:
+		from browser_use.agent.service import Agent
+
+		start_time = time.time()
+		agent = None
+		try:
+			async with pool.acquire() as browser_context:
+				agent = Agent(task=task.task, llm=self.llm, browser_context=browser_context, **self.agent_kwargs)
+				history = await asyncio.wait_for(agent.run(max_steps=task.max_steps or self.max_steps), self.task_timeout)
+				return TaskResult.from_history(task, history, time.time() - start_time)
+		except asyncio.TimeoutError:
+			logger.error(f'Task {task.task_id} timed out after {self.task_timeout}s')
+			result = TaskResult.from_history(task, agent.state.history, time.time() - start_time) if agent else None
+			error = f'Task timed out after {self.task_timeout}s'
+			if result is None:
+				return TaskResult.from_error(task, error, time.time() - start_time)
+			result.error = error
+			return result
+		except Exception as e:
+			logger.error(f'Task {task.task_id} failed: {str(e)}')
+			return TaskResult.from_error(task, str(e), time.time() - start_time)
+
+	async def run(self, tasks: list[str | RunnerTask], output_path: Optional[str | Path] = None) -> BatchReport:
+		"""
+		Run all tasks. If `output_path` is set, every result is appended to it as one JSON line as soon as the
+		task finishes, so partial results survive an interrupted batch.
+
+		Returns the results in submission order.
+		"""
+		runner_tasks = [t if isinstance(t, RunnerTask) else RunnerTask(task=t) for t in tasks]
+		start_time = time.time()
+		results = await run_on_pool(
+			runner_tasks,
+			self._run_task,
+			lambda task: task.task_id,
+			self.browser,
+			self.browser_config,
+			self.concurrency,
+			output_path,
+			label='tasks',
+		)
+		return BatchReport(results=results, wall_seconds=time.time() - start_time)
+
+
+def _make_llm(model: str) -> BaseChatModel:
+	if model.startswith('claude'):
+		from langchain_anthropic import ChatAnthropic
+
+		return ChatAnthropic(model_name=model, timeout=100, stop=None)
+
+	from langchain_openai import ChatOpenAI
+
+	return ChatOpenAI(model=model)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+	parser = argparse.ArgumentParser(description='Run a batch of browser-use tasks')
+	parser.add_argument('tasks', help='.jsonl file with {"task": ...} objects or a text file with one task per line')
+	parser.add_argument('--output', default='results.jsonl', help='JSONL file the results are appended to')
+	parser.add_argument('--model', default='gpt-4o')
+	parser.add_argument('--concurrency', type=int, default=4)
+	parser.add_argument('--max-steps', type=int, default=100)
+	parser.add_argument('--timeout', type=float, default=None, help='Wall-clock seconds per task')
+	parser.add_argument('--headful', action='store_true')
+	args = parser.parse_args(argv)
+
+	runner = BatchRunner(
+		llm=_make_llm(args.model),
+		browser_config=BrowserConfig(headless=not args.headful),
+		concurrency=args.concurrency,
+		max_steps=args.max_steps,
+		task_timeout=args.timeout,
+	)
+	report = asyncio.run(runner.run(load_tasks(args.tasks), output_path=args.output))
+	print(report.summary())
+
+
+if __name__ == '__main__':
+	main()
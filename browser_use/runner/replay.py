@@ -0,0 +1,124 @@
+"""
+Replay one recorded history for many parameter sets (accounts, inputs) concurrently on a pool of browser contexts.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from browser_use.agent.views import AgentHistory, AgentHistoryList
+from browser_use.browser.browser import Browser, BrowserConfig
+from browser_use.browser.pool import BrowserContextPool
+from browser_use.runner.batch import run_on_pool
+from browser_use.runner.views import ReplayJob, ReplayResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplayReport:
+	results: list[ReplayResult] = field(default_factory=list)
+	wall_seconds: float = 0.0
+
+	@property
+	def succeeded(self) -> int:
+		return sum(1 for r in self.results if r.is_successful)
+
+	@property
+	def failed(self) -> int:
+		return len(self.results) - self.succeeded
+
+	@property
+	def replays_per_minute(self) -> float:
+		return len(self.results) / self.wall_seconds * 60 if self.wall_seconds else 0.0
+
+	def summary(self) -> str:
+		return (
+			f'{len(self.results)} replays in {self.wall_seconds:.1f}s ({self.replays_per_minute:.1f} replays/min) - '
+			f'{self.succeeded} succeeded, {self.failed} failed'
+		)
+
+
+class ReplayRunner:
+	"""
+	Replays `history` once per `ReplayJob` with at most `concurrency` replays at a time, each by its own agent
+	on a context from a `BrowserContextPool`. The model is never called - `llm` is only needed to build the agents.
+	A context is reset before the next replay gets it, so no cookies or storage of one account reach the next.
+
+	`history` can be a lazy `HistoryReader`. An `AgentHistoryList` is copied per replay, because a replay
+	updates the element indices of the recorded actions.
+
+	By default a failed step aborts its replay (`skip_failures=False`) and the replays use the fast
+	replay mode of `Agent.rerun_history`.
+	"""
+
+	def __init__(
+		self,
+		history: AgentHistoryList | Sequence[AgentHistory],
+		llm: BaseChatModel,
+		browser: Optional[Browser] = None,
+		browser_config: Optional[BrowserConfig] = None,
+		concurrency: int = 4,
+		fast: bool = True,
+		max_retries: int = 3,
+		skip_failures: bool = False,
+		agent_kwargs: Optional[dict[str, Any]] = None,
+	):
+		self.history = history
+		self.llm = llm
+		self.browser = browser
+		self.browser_config = browser_config or BrowserConfig(headless=True)
+		self.concurrency = concurrency
+		self.fast = fast
+		self.max_retries = max_retries
+		self.skip_failures = skip_failures
+		self.agent_kwargs = agent_kwargs or {}
+
+	async def _replay(self, job: ReplayJob, pool: BrowserContextPool) -> ReplayResult:
+		from browser_use.agent.service import Agent
+
+		start_time = time.time()
+		try:
+			async with pool.acquire() as browser_context:
+				agent = Agent(
+					task='Replay recorded history',
+					llm=self.llm,
+					browser_context=browser_context,
+					sensitive_data=job.sensitive_data,
+					**self.agent_kwargs,
+				)
+				history = self.history.model_copy(deep=True) if isinstance(self.history, AgentHistoryList) else self.history
+				results = await agent.rerun_history(
+					history, max_retries=self.max_retries, skip_failures=self.skip_failures, fast=self.fast
+				)
+				return ReplayResult.from_results(job, results, time.time() - start_time)
+		except Exception as e:
+			logger.error(f'Replay {job.replay_id} failed: {str(e)}')
+			return ReplayResult.from_error(job, str(e), time.time() - start_time)
+
+	async def run(self, jobs: list[ReplayJob | dict[str, str]], output_path: Optional[str | Path] = None) -> ReplayReport:
+		"""
+		Run one replay per job - a plain dict is used as the `sensitive_data` of its replay. If `output_path` is
+		set, every result is appended to it as one JSON line as soon as the replay finishes.
+
+		Returns the results in submission order.
+		"""
+		replay_jobs = [j if isinstance(j, ReplayJob) else ReplayJob(sensitive_data=j) for j in jobs]
+		start_time = time.time()
+		results = await run_on_pool(
+			replay_jobs,
+			self._replay,
+			lambda job: job.replay_id,
+			self.browser,
+			self.browser_config,
+			self.concurrency,
+			output_path,
+			label='replays',
+		)
+		return ReplayReport(results=results, wall_seconds=time.time() - start_time)
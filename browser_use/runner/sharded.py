@@ -0,0 +1,252 @@
+"""
+Run many agents across several worker processes, each with its own Browser.
+
+A single Python event loop (and a single Playwright connection) saturates long before
+the CPU does, so we shard agents over processes instead of over one loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from browser_use.browser.browser import BrowserConfig
+from browser_use.runner.views import RunnerTask, TaskResult
+
+logger = logging.getLogger(__name__)
+
+# Must be picklable (a module level function) - it is called inside every worker process
+LLMFactory = Callable[[], BaseChatModel]
+
+
+async def _run_task(
+	task: RunnerTask,
+	llm: BaseChatModel,
+	browser: Any,
+	max_steps: int,
+	agent_kwargs: dict[str, Any],
+	worker_id: int,
+) -> TaskResult:
+	"""Run one agent inside a worker process on its own context"""
+	from browser_use.agent.service import Agent
+
+	start_time = time.time()
+	try:
+		agent = Agent(task=task.task, llm=llm, browser=browser, **agent_kwargs)
+		history = await agent.run(max_steps=task.max_steps or max_steps)
+		return TaskResult.from_history(task, history, time.time() - start_time, worker_id=worker_id)
+	except Exception as e:
+		logger.error(f'Worker {worker_id}: task {task.task_id} failed: {str(e)}')
+		return TaskResult.from_error(task, str(e), time.time() - start_time, worker_id=worker_id)
+
+
+async def _worker_loop(
+	worker_id: int,
+	llm_factory: LLMFactory,
+	browser_config: BrowserConfig,
+	agents_per_worker: int,
+	max_steps: int,
+	agent_kwargs: dict[str, Any],
+	task_queue: Any,
+	result_queue: Any,
+) -> None:
+	from browser_use.browser.browser import Browser
+
+	browser = Browser(config=browser_config)
+	llm = llm_factory()
+
+	async def consume() -> None:
+		while True:
+			task: RunnerTask | None = await asyncio.to_thread(task_queue.get)
+			if task is None:
+				break
+			result_queue.put(('started', worker_id, task.task_id))
+			result = await _run_task(task, llm, browser, max_steps, agent_kwargs, worker_id)
+			result_queue.put(('done', worker_id, result))
+
+	try:
+		await asyncio.gather(*[consume() for _ in range(agents_per_worker)])
+	finally:
+		await browser.close()
+
+
+def _worker_main(*args: Any) -> None:
+	"""Entry point of a worker process"""
+	asyncio.run(_worker_loop(*args))
+
+
+@dataclass
+class _Worker:
+	worker_id: int
+	slot: int
+	process: Any
+	in_flight: set[str] = field(default_factory=set)
+
+
+class ShardedAgentRunner:
+	"""
+	Spreads agents over `num_workers` processes. Every worker owns one Browser (one Playwright driver
+	and one Chromium) and runs up to `agents_per_worker` agents concurrently on it.
+
+	Tasks are pulled from a shared queue, so fast workers take more tasks. If a worker process dies,
+	its in-flight tasks are reported as failed and a fresh worker takes its place - the other
+	workers are not affected.
+
+	With a persistent profile (`BrowserConfig.user_data_dir`) every worker slot gets its own profile
+	`worker-{slot}`, a replacement worker takes over the profile (and the warm cache) of the one it replaces.
+
+	@dev `llm_factory` and `agent_kwargs` are sent to the worker processes, so they have to be picklable
+	(e.g. a module level function that returns `ChatOpenAI(model='gpt-4o')`).
+	"""
+
+	def __init__(
+		self,
+		llm_factory: LLMFactory,
+		browser_config: Optional[BrowserConfig] = None,
+		num_workers: Optional[int] = None,
+		agents_per_worker: int = 1,
+		max_steps: int = 100,
+		agent_kwargs: Optional[dict[str, Any]] = None,
+		max_worker_restarts: int = 3,
+		poll_interval: float = 0.5,
+	):
+		self.llm_factory = llm_factory
+		self.browser_config = browser_config or BrowserConfig(headless=True)
+		self.num_workers = num_workers or os.cpu_count() or 1
+		self.agents_per_worker = agents_per_worker
+		self.max_steps = max_steps
+		self.agent_kwargs = agent_kwargs or {}
+		self.max_worker_restarts = max_worker_restarts
+		self.poll_interval = poll_interval
+
+		# spawn - forking a process that already runs an event loop / Playwright threads is unsafe
+		self._mp = multiprocessing.get_context('spawn')
+
+	async def run(self, tasks: list[str | RunnerTask]) -> list[TaskResult]:
+		"""Run all tasks and return their results in submission order"""
+		runner_tasks = [t if isinstance(t, RunnerTask) else RunnerTask(task=t) for t in tasks]
+		if not runner_tasks:
+			return []
+		return await asyncio.to_thread(self._supervise, runner_tasks)
+
+	def _spawn_worker(self, worker_id: int, slot: int, task_queue: Any, result_queue: Any) -> _Worker:
+		browser_config = self.browser_config
+		if browser_config.user_data_dir:
+			# Chromium locks a profile directory, so concurrent workers can not share one
+			browser_config = replace(browser_config, profile_name=f'worker-{slot}')
+
+		process = self._mp.Process(
+			target=_worker_main,
+			args=(
+				worker_id,
+				self.llm_factory,
+				browser_config,
+				self.agents_per_worker,
+				self.max_steps,
+				self.agent_kwargs,
+				task_queue,
+				result_queue,
+			),
+			daemon=True,
+		)
+		process.start()
+		logger.debug(f'Started worker {worker_id} (pid {process.pid})')
+		return _Worker(worker_id=worker_id, slot=slot, process=process)
+
+	def _supervise(self, tasks: list[RunnerTask]) -> list[TaskResult]:
+		"""Blocking supervisor loop - runs in a thread so the caller's event loop stays free"""
+		tasks_by_id = {t.task_id: t for t in tasks}
+		results: dict[str, TaskResult] = {}
+
+		task_queue = self._mp.Queue()
+		result_queue = self._mp.Queue()
+		for task in tasks:
+			task_queue.put(task)
+
+		n_workers = min(self.num_workers, max(1, -(-len(tasks) // self.agents_per_worker)))
+		workers = {i: self._spawn_worker(i, i, task_queue, result_queue) for i in range(n_workers)}
+		next_worker_id = n_workers
+		restarts = 0
+		crashed = False
+		draining = False
+		started_tasks: set[str] = set()
+
+		try:
+			while len(results) < len(tasks):
+				try:
+					kind, worker_id, payload = result_queue.get(timeout=self.poll_interval)
+				except queue.Empty:
+					kind = None
+
+				if kind == 'started':
+					started_tasks.add(payload)
+					if worker_id in workers:
+						workers[worker_id].in_flight.add(payload)
+				elif kind == 'done':
+					result: TaskResult = payload
+					results[result.task_id] = result
+					if worker_id in workers:
+						workers[worker_id].in_flight.discard(result.task_id)
+					logger.info(f'Finished {len(results)}/{len(tasks)} tasks')
+
+				# Crash isolation - fail the in-flight tasks of dead workers and replace them
+				for worker in list(workers.values()):
+					if worker.process.is_alive():
+						continue
+					del workers[worker.worker_id]
+					crashed = True
+					exitcode = worker.process.exitcode
+					for task_id in worker.in_flight:
+						if task_id not in results:
+							logger.error(f'Worker {worker.worker_id} crashed (exit code {exitcode}) while running {task_id}')
+							results[task_id] = TaskResult.from_error(
+								tasks_by_id[task_id],
+								f'Worker process crashed (exit code {exitcode})',
+								worker_id=worker.worker_id,
+							)
+
+					has_pending = len(started_tasks) < len(tasks)
+					if has_pending and not draining and restarts < self.max_worker_restarts:
+						restarts += 1
+						workers[next_worker_id] = self._spawn_worker(next_worker_id, worker.slot, task_queue, result_queue)
+						next_worker_id += 1
+
+				# A worker that died between taking a task and reporting it leaves the task in limbo - but a live
+				# worker may also have taken a task it did not report yet. Let the workers finish what they took
+				# and exit (the stop signals queue up behind all tasks), only then is an unreported task lost.
+				idle = kind is None and task_queue.empty() and not any(w.in_flight for w in workers.values())
+				if crashed and idle and not draining:
+					draining = True
+					for _ in range(len(workers) * self.agents_per_worker):
+						task_queue.put(None)
+
+				if not workers and len(results) < len(tasks):
+					if draining:
+						error = 'Task was lost by a crashed worker process'
+					else:
+						logger.error('All workers died - marking remaining tasks as failed')
+						error = 'No worker process left to run the task'
+					for task in tasks:
+						if task.task_id not in results:
+							results[task.task_id] = TaskResult.from_error(task, error)
+		finally:
+			self._shutdown(workers, task_queue)
+
+		return [results[t.task_id] for t in tasks]
+
+	def _shutdown(self, workers: dict[int, _Worker], task_queue: Any) -> None:
+		for _ in range(len(workers) * self.agents_per_worker):
+			task_queue.put(None)
+		for worker in workers.values():
+			worker.process.join(timeout=30)
+			if worker.process.is_alive():
+				logger.debug(f'Terminating worker {worker.worker_id}')
+				worker.process.terminate()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from pydantic import BaseModel
+
+from browser_use.agent.views import NO_ACTION_TO_REPLAY, ActionResult, AgentHistoryList
+
+
+@dataclass
+class RunnerTask:
+	"""A single task submitted to a runner"""
+
+	task: str
+	task_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+	max_steps: Optional[int] = None
+
+
+class TaskResult(BaseModel):
+	"""Picklable / JSON-serializable summary of a finished task"""
+
+	task_id: str
+	task: str
+	is_done: bool = False
+	is_successful: Optional[bool] = None
+	final_result: Optional[str] = None
+	errors: list[str] = []
+	n_steps: int = 0
+	total_input_tokens: int = 0
+	duration_seconds: float = 0.0
+	worker_id: Optional[int] = None
+	# Infrastructure error (timeout, crashed worker, ...) - not an agent error
+	error: Optional[str] = None
+
+	@classmethod
+	def from_history(
+		cls,
+		task: RunnerTask,
+		history: AgentHistoryList,
+		duration_seconds: float,
+		worker_id: Optional[int] = None,
+	) -> 'TaskResult':
+		return cls(
+			task_id=task.task_id,
+			task=task.task,
+			is_done=history.is_done(),
+			is_successful=history.is_successful(),
+			final_result=history.final_result(),
+			errors=[e for e in history.errors() if e],
+			n_steps=history.number_of_steps(),
+			total_input_tokens=history.total_input_tokens(),
+			duration_seconds=duration_seconds,
+			worker_id=worker_id,
+		)
+
+	@classmethod
+	def from_error(
+		cls,
+		task: RunnerTask,
+		error: str,
+		duration_seconds: float = 0.0,
+		worker_id: Optional[int] = None,
+	) -> 'TaskResult':
+		return cls(
+			task_id=task.task_id,
+			task=task.task,
+			error=error,
+			duration_seconds=duration_seconds,
+			worker_id=worker_id,
+		)
+
+
+@dataclass
+class ReplayJob:
+	"""One replay of a recorded history - its `<secret>` placeholders are filled from `sensitive_data`"""
+
+	sensitive_data: Optional[dict[str, str]] = None
+	replay_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+
+class ReplayResult(BaseModel):
+	"""JSON-serializable outcome of one replay - the sensitive data is left out"""
+
+	replay_id: str
+	n_actions: int = 0
+	# recorded steps without actions (e.g. failed model calls) - not errors of the replay
+	skipped_steps: int = 0
+	is_done: bool = False
+	extracted_content: list[str] = []
+	errors: list[str] = []
+	duration_seconds: float = 0.0
+	# The replay was aborted (a step failed after all retries, ...)
+	error: Optional[str] = None
+
+	@property
+	def is_successful(self) -> bool:
+		return self.error is None and not self.errors
+
+	@classmethod
+	def from_results(cls, job: ReplayJob, results: list[ActionResult], duration_seconds: float) -> 'ReplayResult':
+		skipped = [r for r in results if r.error == NO_ACTION_TO_REPLAY]
+		results = [r for r in results if r.error != NO_ACTION_TO_REPLAY]
+		return cls(
+			replay_id=job.replay_id,
+			n_actions=len(results),
+			skipped_steps=len(skipped),
+			is_done=bool(results) and results[-1].is_done is True,
+			extracted_content=[r.extracted_content for r in results if r.extracted_content],
+			errors=[r.error for r in results if r.error],
+			duration_seconds=duration_seconds,
+		)
+
+	@classmethod
+	def from_error(cls, job: ReplayJob, error: str, duration_seconds: float = 0.0) -> 'ReplayResult':
+		return cls(replay_id=job.replay_id, error=error, duration_seconds=duration_seconds)
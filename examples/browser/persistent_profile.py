@@ -0,0 +1,42 @@
+"""
+Compare cold and warm page loads with a persistent browser profile.
+
+The first run starts with an empty profile, the second one reuses its disk cache and code cache.
+
+@dev Delete the ./profiles directory to start cold again.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import asyncio
+
+from browser_use.browser.browser import Browser, BrowserConfig
+
+URLS = [
+	'https://github.com/browser-use/browser-use',
+	'https://www.youtube.com',
+]
+
+
+async def load_pages(run: int):
+	browser = Browser(config=BrowserConfig(headless=True, user_data_dir='./profiles', profile_name='benchmark'))
+	async with await browser.new_context() as context:
+		for url in URLS:
+			await context.navigate_to(url)
+		for timing in context.page_load_timings:
+			print(
+				f'run {run} ({"warm" if timing.warm_profile else "cold"}): {timing.duration_ms:6.0f} ms, '
+				f'{timing.cached_resources:3d}/{timing.resources:3d} cached - {timing.url}'
+			)
+	await browser.close()
+
+
+async def main():
+	for run in (1, 2):
+		await load_pages(run)
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
@@ -0,0 +1,62 @@
+"""
+Benchmark Browser startup: Playwright driver start, Chromium launch and first context.
+
+Run it before and after changes to the launch path to catch startup regressions.
+
+@dev Usage: python examples/browser/startup_benchmark.py [iterations]
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import asyncio
+import statistics
+import time
+
+from browser_use.browser.browser import Browser, BrowserConfig, acquire_playwright, release_playwright
+from browser_use.browser.context import BrowserContext
+
+
+async def measure_once(shared_driver: bool) -> dict[str, float]:
+	timings = {}
+
+	start = time.perf_counter()
+	browser = Browser(config=BrowserConfig(headless=True, share_playwright_driver=shared_driver))
+	browser.playwright = await browser._start_playwright()
+	timings['driver'] = time.perf_counter() - start
+
+	start = time.perf_counter()
+	browser.playwright_browser = await browser._setup_browser(browser.playwright)
+	timings['launch'] = time.perf_counter() - start
+
+	start = time.perf_counter()
+	context = BrowserContext(browser=browser, config=browser.config.new_context_config)
+	await context.get_session()
+	timings['first_context'] = time.perf_counter() - start
+
+	await context.close()
+	await browser.close()
+	return timings
+
+
+def report(name: str, runs: list[dict[str, float]]):
+	print(f'\n{name} ({len(runs)} runs)')
+	for key in ('driver', 'launch', 'first_context'):
+		values = [run[key] * 1000 for run in runs]
+		print(f'  {key:<14} median {statistics.median(values):8.1f} ms   max {max(values):8.1f} ms')
+
+
+async def main(iterations: int):
+	report('dedicated driver', [await measure_once(shared_driver=False) for _ in range(iterations)])
+
+	# keep one user of the shared driver alive, like a long running app with many agents
+	playwright = await acquire_playwright()
+	try:
+		report('shared driver', [await measure_once(shared_driver=True) for _ in range(iterations)])
+	finally:
+		await release_playwright(playwright)
+
+
+if __name__ == '__main__':
+	asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
@@ -0,0 +1,41 @@
+"""
+Run a batch of tasks with bounded concurrency and stream the results to a JSONL file.
+
+The same runner is available from the command line:
+
+	python -m browser_use.runner.batch tasks.jsonl --output results.jsonl --concurrency 4 --timeout 300
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+
+from langchain_openai import ChatOpenAI
+
+from browser_use.runner.batch import BatchRunner
+
+
+async def main():
+	runner = BatchRunner(
+		llm=ChatOpenAI(model='gpt-4o'),
+		concurrency=3,
+		max_steps=25,
+		task_timeout=300,
+	)
+	report = await runner.run(
+		[
+			'Search Google for weather in Tokyo',
+			'Check Reddit front page title',
+			'Look up Bitcoin price on Coinbase',
+			'Find NASA image of the day',
+			'Look up population of Paris',
+		],
+		output_path='results.jsonl',
+	)
+	print(report.summary())
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
@@ -0,0 +1,41 @@
+"""
+Replay one recorded flow for many accounts at once - each replay gets its own browser context.
+
+Record the flow once with placeholders for the account data, e.g. with
+sensitive_data={'username': ..., 'password': ...} and the task 'Log in with username and password',
+and save it with `history.save_to_file('login_flow.json')`.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+
+from langchain_openai import ChatOpenAI
+
+from browser_use.agent.views import AgentHistoryList, AgentOutput
+from browser_use.controller.service import Controller
+from browser_use.runner.replay import ReplayRunner
+
+
+async def main():
+	controller = Controller()
+	output_model = AgentOutput.type_with_custom_actions(controller.registry.create_action_model())
+	history = AgentHistoryList.load_from_file('login_flow.json', output_model)
+
+	runner = ReplayRunner(
+		history,
+		llm=ChatOpenAI(model='gpt-4o'),  # only needed to build the agents, the replays do not call it
+		concurrency=4,
+		agent_kwargs={'controller': controller},
+	)
+	report = await runner.run(
+		[{'username': f'user{i}@example.com', 'password': f'password{i}'} for i in range(10)],
+		output_path='replays.jsonl',
+	)
+	print(report.summary())
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
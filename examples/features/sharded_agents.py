@@ -0,0 +1,50 @@
+"""
+Run many agents across several worker processes - every worker has its own Browser.
+
+Use this instead of parallel_agents.py when a single event loop becomes the bottleneck.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+
+from langchain_openai import ChatOpenAI
+
+from browser_use.browser.browser import BrowserConfig
+from browser_use.runner.sharded import ShardedAgentRunner
+
+
+# Must be a module level function - it is sent to the worker processes
+def make_llm():
+	return ChatOpenAI(model='gpt-4o')
+
+
+async def main():
+	runner = ShardedAgentRunner(
+		llm_factory=make_llm,
+		browser_config=BrowserConfig(headless=True),
+		num_workers=4,
+		agents_per_worker=2,
+		max_steps=25,
+	)
+	results = await runner.run(
+		[
+			'Search Google for weather in Tokyo',
+			'Check Reddit front page title',
+			'Look up Bitcoin price on Coinbase',
+			'Find NASA image of the day',
+			'Check top story on CNN',
+			'Search latest SpaceX launch date',
+			'Look up population of Paris',
+			'Find current time in Sydney',
+		]
+	)
+
+	for result in results:
+		print(f'[worker {result.worker_id}] {result.task}: {result.error or result.final_result}')
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
@@ -2,9 +2,11 @@
 Test configuration for browser-use.
 """
 
+import asyncio
 import logging
 import os
 import sys
+from dataclasses import dataclass, field
 
 import pytest
 from langchain_openai import ChatOpenAI
@@ -23,6 +25,7 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
+from browser_use.agent.views import ActionResult, AgentHistoryList
 from browser_use.browser.browser import Browser, BrowserConfig
 from browser_use.browser.context import BrowserContext
 
@@ -57,3 +60,75 @@ async def browser_context(browser):
 	context = BrowserContext(browser=browser)
 	yield context
 	await context.close()
+
+
+class DummyBrowser:
+	"""Browser stand-in for the runner tests - the contexts of the pool are never started"""
+
+	def __init__(self):
+		self.config = BrowserConfig()
+		self.closed = False
+
+	async def close(self):
+		self.closed = True
+
+
+@dataclass
+class DummyAgentStats:
+	running: int = 0
+	max_running: int = 0
+	histories: list = field(default_factory=list)
+
+
+class DummyAgent:
+	"""
+	Agent stand-in for the runner tests. A task 'slow' runs for a second, a replay for the user 'locked' fails,
+	everything else finishes right away. `stats` is set per test by the `dummy_agent` fixture.
+	"""
+
+	stats: DummyAgentStats
+
+	def __init__(self, task, llm, browser_context, sensitive_data=None, **kwargs):
+		self.task = task
+		self.browser_context = browser_context
+		self.sensitive_data = sensitive_data
+		self.state = type('State', (), {'history': AgentHistoryList(history=[])})()
+
+	async def _work(self, seconds: float) -> None:
+		self.stats.running += 1
+		self.stats.max_running = max(self.stats.max_running, self.stats.running)
+		try:
+			await asyncio.sleep(seconds)
+		finally:
+			self.stats.running -= 1
+
+	async def run(self, max_steps=100):
+		await self._work(1 if self.task == 'slow' else 0.01)
+		return self.state.history
+
+	async def rerun_history(self, history, max_retries=3, skip_failures=True, fast=False):
+		self.stats.histories.append(history)
+		await self._work(0.01)
+		if self.sensitive_data['user'] == 'locked':
+			raise RuntimeError('Step 2 failed after 3 attempts')
+		return [
+			ActionResult(extracted_content=f'logged in as {self.sensitive_data["user"]}'),
+			ActionResult(is_done=True, extracted_content='done'),
+		]
+
+
+@pytest.fixture
+def dummy_browser():
+	return DummyBrowser()
+
+
+@pytest.fixture
+def dummy_agent(monkeypatch):
+	"""
+	Replace `Agent` with a `DummyAgent` that records into fresh stats, and return the stats.
+	"""
+	import browser_use.agent.service
+
+	stats = DummyAgentStats()
+	monkeypatch.setattr(browser_use.agent.service, 'Agent', type('DummyAgent', (DummyAgent,), {'stats': stats}))
+	return stats
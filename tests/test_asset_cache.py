@@ -0,0 +1,145 @@
+import time
+
+import pytest
+
+from browser_use.browser.asset_cache import AssetCache, CachedAsset
+
+
+def make_asset(size, ttl=60):
+	return CachedAsset(status=200, headers={}, body=b'x' * size, expires_at=time.time() + ttl)
+
+
+def test_lru_eviction_by_size():
+	"""
+	Test that the cache stays within max_bytes by evicting the least recently used entries,
+	and that reading an entry refreshes its position.
+	"""
+	cache = AssetCache(max_bytes=300, max_asset_bytes=300)
+	cache.put('a', make_asset(100))
+	cache.put('b', make_asset(100))
+	cache.put('c', make_asset(100))
+	assert cache.get('a') is not None  # a is now most recently used
+	cache.put('d', make_asset(100))
+	assert cache.get('b') is None
+	assert cache.get('a') is not None
+	assert cache.size_bytes == 300
+	assert cache.stats.evictions == 1
+
+
+def test_expired_and_oversized_assets():
+	"""
+	Test that expired entries are not served and assets bigger than max_asset_bytes are not stored.
+	"""
+	cache = AssetCache(max_bytes=1000)
+	cache.put('old', make_asset(10, ttl=-1))
+	assert cache.get('old') is None
+	assert cache.put('huge', make_asset(900)) is False
+	assert len(cache) == 0
+
+
+def test_freshness_lifetime():
+	"""
+	Test which responses are considered cacheable and for how long.
+	"""
+	lifetime = AssetCache.freshness_lifetime
+	assert lifetime(200, {'cache-control': 'public, max-age=3600'}) == 3600
+	assert lifetime(200, {'cache-control': 's-maxage=60'}) == 60
+	assert lifetime(200, {'cache-control': 'max-age=0'}) is None
+	assert lifetime(200, {'cache-control': 'no-store, max-age=3600'}) is None
+	assert lifetime(200, {'cache-control': 'private, max-age=3600'}) is None
+	assert lifetime(404, {'cache-control': 'max-age=3600'}) is None
+	assert lifetime(200, {'cache-control': 'max-age=3600', 'set-cookie': 'a=b'}) is None
+	assert lifetime(200, {}) is None
+	assert lifetime(200, {'expires': 'Thu, 01 Jan 2099 00:00:00 GMT'}) > 0
+	assert lifetime(200, {'expires': 'Thu, 01 Jan 1998 00:00:00 GMT'}) is None
+	assert lifetime(200, {'expires': 'garbage'}) is None
+
+
+class DummyRequest:
+	def __init__(self, url, resource_type='script', method='GET'):
+		self.url = url
+		self.resource_type = resource_type
+		self.method = method
+		self.headers = {}
+
+
+class DummyResponse:
+	status = 200
+	headers = {'Cache-Control': 'max-age=600', 'Content-Encoding': 'gzip', 'Content-Type': 'text/javascript'}
+
+	async def body(self):
+		return b'console.log(1)'
+
+
+class DummyRoute:
+	def __init__(self, request):
+		self.request = request
+		self.fetched = False
+		self.fell_back = False
+		self.fulfilled = None
+
+	async def fetch(self):
+		self.fetched = True
+		return DummyResponse()
+
+	async def fulfill(self, status, headers, body):
+		self.fulfilled = (status, headers, body)
+
+	async def fallback(self):
+		self.fell_back = True
+
+
+@pytest.mark.asyncio
+async def test_handle_route_serves_second_request_from_cache():
+	"""
+	Test the route handler: the first request is fetched and stored, the second one is
+	fulfilled from memory, and non-static requests are passed on untouched.
+	"""
+	cache = AssetCache(max_bytes=1024 * 1024)
+	first = DummyRoute(DummyRequest('https://cdn.example.com/app.js'))
+	await cache.handle_route(first)
+	assert first.fetched is True
+	assert 'content-encoding' not in first.fulfilled[1]
+
+	second = DummyRoute(DummyRequest('https://cdn.example.com/app.js'))
+	await cache.handle_route(second)
+	assert second.fetched is False
+	assert second.fulfilled == (200, {'cache-control': 'max-age=600', 'content-type': 'text/javascript'}, b'console.log(1)')
+
+	document = DummyRoute(DummyRequest('https://example.com/', resource_type='document'))
+	await cache.handle_route(document)
+	assert document.fell_back is True
+
+	assert cache.stats.hits == 1
+	assert cache.stats.misses == 1
+	assert cache.stats.hit_rate == 0.5
+
+
+@pytest.mark.asyncio
+async def test_empty_cache_is_installed_as_route(tmp_path):
+	"""
+	Test that the route handler is installed while the cache is still empty - the cache has a length, so it is falsy then.
+	"""
+	from browser_use.browser.browser import Browser, BrowserConfig
+	from browser_use.browser.context import BrowserContext
+
+	class DummyContext:
+		def __init__(self):
+			self.routes = []
+
+		async def route(self, url, handler):
+			self.routes.append(handler)
+
+		async def add_init_script(self, script):
+			pass
+
+	browser = Browser(config=BrowserConfig(user_data_dir=str(tmp_path), asset_cache_size_mb=1))
+	assert browser.asset_cache is not None and len(browser.asset_cache) == 0
+	playwright_context = DummyContext()
+
+	async def get_persistent_context():
+		return playwright_context
+
+	browser.get_persistent_context = get_persistent_context
+	await BrowserContext(browser=browser)._create_context(None)
+	assert playwright_context.routes == [browser.asset_cache.handle_route]
@@ -0,0 +1,145 @@
+import asyncio
+import json
+
+import pytest
+
+from browser_use.runner import batch
+from browser_use.runner.batch import BatchRunner, _percentile, load_tasks
+from browser_use.runner.views import RunnerTask, TaskResult
+
+
+def test_load_tasks_and_percentiles(tmp_path):
+	"""
+	Test reading tasks from JSONL and text files and the latency percentiles.
+	"""
+	jsonl = tmp_path / 'tasks.jsonl'
+	jsonl.write_text(json.dumps({'task': 'a', 'task_id': 'first', 'max_steps': 5}) + '\n\n' + json.dumps({'task': 'b'}) + '\n')
+	tasks = load_tasks(jsonl)
+	assert [(t.task, t.task_id, t.max_steps) for t in tasks[:1]] == [('a', 'first', 5)]
+	assert tasks[1].task == 'b' and tasks[1].max_steps is None
+
+	text = tmp_path / 'tasks.txt'
+	text.write_text('task one\ntask two\n')
+	assert [t.task for t in load_tasks(text)] == ['task one', 'task two']
+
+	assert _percentile([], 0.5) == 0.0
+	assert _percentile([1, 2, 3, 4], 0.5) == 2.5
+	assert _percentile([float(i) for i in range(1, 101)], 0.95) == pytest.approx(95.05)
+
+
+@pytest.mark.asyncio
+async def test_batch_runner_bounds_concurrency_and_streams_results(tmp_path, dummy_agent, dummy_browser):
+	"""
+	Test that the batch runner runs at most `concurrency` agents at a time, applies the per task timeout
+	and appends every result to the JSONL file.
+	"""
+	browser = dummy_browser
+	runner = BatchRunner(llm=None, browser=browser, concurrency=2, task_timeout=0.3)  # type: ignore
+	output = tmp_path / 'results.jsonl'
+
+	tasks = [RunnerTask(task=f'task {i}', task_id=str(i)) for i in range(5)] + [RunnerTask(task='slow', task_id='slow')]
+	report = await runner.run(tasks, output_path=output)
+
+	assert dummy_agent.max_running == 2
+	assert [r.task_id for r in report.results] == [t.task_id for t in tasks]
+	assert report.results[-1].error == 'Task timed out after 0.3s'
+	assert report.failed == 6  # the dummy agent never calls done
+	assert 'p95' in report.summary()
+	assert not browser.closed  # injected browsers stay open
+
+	lines = [json.loads(line) for line in output.read_text().splitlines()]
+	assert sorted(line['task_id'] for line in lines) == sorted(t.task_id for t in tasks)
+	assert batch.BatchReport().tasks_per_minute == 0.0
+
+
+class DummyFrame:
+	def __init__(self, url):
+		self.url = url
+
+
+class DummyPage:
+	def __init__(self, url):
+		self.url = url
+		self.frames = [DummyFrame(url)]
+		self.closed = False
+
+	async def close(self):
+		self.closed = True
+
+
+class DummyCDPSession:
+	def __init__(self):
+		self.sent = []
+
+	async def send(self, method, params=None):
+		self.sent.append((method, params))
+
+	async def detach(self):
+		pass
+
+
+class DummyPlaywrightContext:
+	def __init__(self):
+		self.pages = [DummyPage('about:blank')]
+		self.cdp_session = DummyCDPSession()
+
+	async def new_page(self):
+		page = DummyPage('about:blank')
+		self.pages.append(page)
+		return page
+
+	async def new_cdp_session(self, page):
+		return self.cdp_session
+
+	async def clear_permissions(self):
+		pass
+
+
+@pytest.mark.asyncio
+async def test_pooled_context_is_isolated_between_tasks(dummy_browser):
+	"""
+	Test that the second task on a pooled context gets the same context without anything of the first task:
+	its tabs, the storage of the origins it visited (also ones it already left) and its pending downloads.
+	"""
+	from browser_use.browser.pool import BrowserContextPool
+
+	pool = BrowserContextPool(dummy_browser, size=1)  # type: ignore
+	playwright_context = DummyPlaywrightContext()
+
+	async with pool.acquire() as first:
+		first.session = type('DummySession', (), {'context': playwright_context, 'cached_state': 'stale'})()
+		first_page = playwright_context.pages[0]
+		first_page.frames = [DummyFrame('https://account-a.com/inbox')]
+		first._on_frame_navigated(DummyFrame('https://login.account-a.com/'))
+		first._pending_downloads.append(asyncio.create_task(asyncio.sleep(10)))
+
+	async with pool.acquire() as second:
+		assert second is first
+		assert first_page.closed
+		assert [p.url for p in playwright_context.pages if not p.closed] == ['about:blank']
+		assert second.session.cached_state is None
+		assert second._pending_downloads == []
+		cleared = {
+			params['origin'] for method, params in playwright_context.cdp_session.sent if method == 'Storage.clearDataForOrigin'
+		}
+		assert cleared == {'https://account-a.com', 'https://login.account-a.com'}
+
+
+def test_batch_report_counts_partition_the_results():
+	"""
+	Test that every result is counted in exactly one of succeeded, unsuccessful and failed - including a task that
+	finished without success and one that timed out after its agent reported success.
+	"""
+	task = RunnerTask(task='task')
+	results = [
+		TaskResult(task_id='1', task='task', is_done=True, is_successful=True),
+		TaskResult(task_id='2', task='task', is_done=True, is_successful=False),
+		TaskResult(task_id='3', task='task', is_done=True, is_successful=None),
+		TaskResult(task_id='4', task='task', is_done=True, is_successful=True, error='Task timed out after 1s'),
+		TaskResult(task_id='5', task='task', is_done=False),
+		TaskResult.from_error(task, 'crashed'),
+	]
+	report = batch.BatchReport(results=results, wall_seconds=1.0)
+
+	assert (report.succeeded, report.unsuccessful, report.failed) == (1, 2, 3)
+	assert '1 succeeded, 2 unsuccessful, 3 failed' in report.summary()
@@ -2,6 +2,7 @@ import asyncio
 import pytest
 import requests
 import subprocess
+from unittest.mock import Mock
 from browser_use.browser.browser import Browser, BrowserConfig
 from browser_use.browser.context import BrowserContext, BrowserContextConfig
 from playwright._impl._api_structures import ProxySettings
@@ -303,4 +304,298 @@ async def test_standard_browser_launch_with_proxy(monkeypatch):
     # Call get_playwright_browser and verify that the returned browser is as expected.
     result_browser = await browser_obj.get_playwright_browser()
     assert isinstance(result_browser, DummyBrowser), "Expected DummyBrowser from _setup_standard_browser with proxy provided"
-    await browser_obj.close()
\ No newline at end of file
+    await browser_obj.close()
+
+@pytest.mark.asyncio
+async def test_persistent_profile_launch(monkeypatch, tmp_path):
+    """
+    Test that with user_data_dir set, the browser is launched as a persistent context in
+    {user_data_dir}/{profile_name} with a capped disk cache, and that the profile is reported
+    as cold on the first launch and warm on the next one.
+    """
+    launches = []
+    class DummyContext:
+        browser = None
+        def __init__(self):
+            self.closed = False
+        def on(self, event, handler):
+            pass
+        async def close(self):
+            self.closed = True
+    class DummyChromium:
+        async def launch_persistent_context(self, user_data_dir, headless, args, proxy=None, **kwargs):
+            launches.append((user_data_dir, args))
+            with open(f"{user_data_dir}/Preferences", "w") as f:
+                f.write("{}")
+            return DummyContext()
+    class DummyPlaywright:
+        def __init__(self):
+            self.chromium = DummyChromium()
+        async def stop(self):
+            pass
+    class DummyAsyncPlaywrightContext:
+        async def start(self):
+            return DummyPlaywright()
+    monkeypatch.setattr("browser_use.browser.browser.async_playwright", lambda: DummyAsyncPlaywrightContext())
+    config = BrowserConfig(user_data_dir=str(tmp_path), profile_name="w0", disk_cache_size_mb=10)
+    for expected_warm in (False, True):
+        browser_obj = Browser(config=config)
+        contexts = await asyncio.gather(*(browser_obj.get_persistent_context() for _ in range(3)))
+        assert all(c is contexts[0] for c in contexts), "Concurrent callers must share one launch"
+        context = contexts[0]
+        assert await browser_obj.get_persistent_context() is context, "The persistent context should be reused"
+        assert browser_obj.profile_warm is expected_warm
+        await browser_obj.close()
+        assert context.closed
+    user_data_dir, args = launches[0]
+    assert user_data_dir == str(tmp_path / "w0")
+    assert f"--disk-cache-size={10 * 1024 * 1024}" in args
+    assert "--no-startup-window" not in args
+    assert len(launches) == 2
+
+@pytest.mark.asyncio
+async def test_shared_persistent_context_is_prepared_once(tmp_path):
+    """
+    Test that BrowserContexts sharing the persistent context install the asset cache route and the init scripts
+    only once - the change tracker also if only a later one reuses unchanged states - and that each one removes
+    its own domain policy route on close.
+    """
+    class DummyContext:
+        def __init__(self):
+            self.routes = []
+            self.init_scripts = 0
+            self.pages = []
+        async def route(self, url, handler):
+            self.routes.append(handler)
+        async def unroute(self, url, handler):
+            self.routes.remove(handler)
+        async def add_init_script(self, script):
+            self.init_scripts += 1
+    config = BrowserConfig(user_data_dir=str(tmp_path), asset_cache_size_mb=1)
+    browser_obj = Browser(config=config)
+    shared = DummyContext()
+    async def get_persistent_context():
+        return shared
+    browser_obj.get_persistent_context = get_persistent_context
+    contexts = [
+        BrowserContext(
+            browser=browser_obj,
+            config=BrowserContextConfig(
+                allowed_domains=[f"site{i}.com"], block_disallowed_requests=True, reuse_unchanged_state=i > 0
+            ),
+        )
+        for i in range(3)
+    ]
+    for context in contexts:
+        assert await context._create_context(None) is shared
+    assert shared.routes.count(browser_obj.asset_cache.handle_route) == 1
+    assert shared.routes[1:] == [context.domain_policy.handle_route for context in contexts]
+    assert shared.init_scripts == 2
+    for context in contexts:
+        context.session = Mock(context=shared)
+        context._page_event_handler = None
+        await context.close()
+    assert shared.routes == [browser_obj.asset_cache.handle_route]
+
+@pytest.mark.asyncio
+async def test_browser_contexts_use_own_tabs_of_shared_persistent_context(tmp_path):
+    """
+    Test that BrowserContexts sharing the persistent context each work in tabs of their own (plus the popups
+    of those), and that reset_context and close only close their own tabs.
+    """
+    class DummyPage:
+        def __init__(self, context, url="about:blank", opener=None):
+            self.context = context
+            self.url = url
+            self._opener = opener
+            self._closed = False
+            self.frames = []
+        def is_closed(self):
+            return self._closed
+        async def close(self):
+            self._closed = True
+            self.context.pages.remove(self)
+        async def opener(self):
+            return self._opener
+        async def title(self):
+            return self.url
+        async def bring_to_front(self):
+            pass
+        async def wait_for_load_state(self, state=None):
+            pass
+        def on(self, event, handler):
+            pass
+    class DummyCDPSession:
+        async def send(self, method, params=None):
+            pass
+        async def detach(self):
+            pass
+    class DummyContext:
+        def __init__(self):
+            self.pages = []
+            self.listeners = []
+            self.pages.append(DummyPage(self, "about:startup"))
+        async def new_page(self, url="about:blank", opener=None):
+            page = DummyPage(self, url, opener)
+            self.pages.append(page)
+            for listener in list(self.listeners):
+                await listener(page)
+            return page
+        def on(self, event, handler):
+            self.listeners.append(handler)
+        def remove_listener(self, event, handler):
+            self.listeners.remove(handler)
+        async def add_init_script(self, script):
+            pass
+        async def new_cdp_session(self, page):
+            return DummyCDPSession()
+        async def clear_permissions(self):
+            pass
+    browser_obj = Browser(config=BrowserConfig(user_data_dir=str(tmp_path)))
+    shared = DummyContext()
+    async def get_persistent_context():
+        return shared
+    browser_obj.get_persistent_context = get_persistent_context
+    first = BrowserContext(browser=browser_obj)
+    second = BrowserContext(browser=browser_obj)
+    await first.get_session()
+    await second.get_session()
+    first_page = await first.get_current_page()
+    second_page = await second.get_current_page()
+    assert first_page is not second_page
+    assert shared.pages[0].url == "about:startup" and shared.pages[0] not in (first_page, second_page)
+
+    popup = await shared.new_page("https://popup.com/", opener=second_page)
+    await first.create_new_tab()
+    assert [tab.url for tab in await first.get_tabs_info()] == ["about:blank", "about:blank"]
+    assert [tab.url for tab in await second.get_tabs_info()] == ["about:blank", "https://popup.com/"]
+    assert await second.get_current_page() is popup
+
+    await first.reset_context(keep_page=True)
+    assert len(await first.get_pages()) == 1 and first_page.is_closed()
+    assert not second_page.is_closed() and not popup.is_closed()
+
+    await first.close()
+    assert not second_page.is_closed() and not popup.is_closed()
+    await second.close()
+    assert shared.pages == [shared.pages[0]] and shared.pages[0].url == "about:startup"
+    assert shared.listeners == []
+
+@pytest.mark.asyncio
+async def test_shared_playwright_driver(monkeypatch):
+    """
+    Test that browsers on the same event loop share one Playwright driver, which is
+    stopped only when the last browser is closed, and that by default every browser
+    starts a dedicated driver.
+    """
+    events = []
+    class DummyBrowser:
+        async def close(self):
+            pass
+    class DummyChromium:
+        async def launch(self, headless, args, proxy=None):
+            return DummyBrowser()
+    class DummyPlaywright:
+        def __init__(self):
+            self.chromium = DummyChromium()
+        async def stop(self):
+            events.append("stop")
+    class DummyAsyncPlaywrightContext:
+        async def start(self):
+            events.append("start")
+            return DummyPlaywright()
+    monkeypatch.setattr("browser_use.browser.browser.async_playwright", lambda: DummyAsyncPlaywrightContext())
+    first = Browser(config=BrowserConfig(headless=True, share_playwright_driver=True))
+    second = Browser(config=BrowserConfig(headless=True, share_playwright_driver=True))
+    await asyncio.gather(first.get_playwright_browser(), second.get_playwright_browser())
+    assert first.playwright is second.playwright
+    assert events == ["start"]
+    await first.close()
+    assert events == ["start"]
+    await second.close()
+    assert events == ["start", "stop"]
+    dedicated = Browser(config=BrowserConfig(headless=True))
+    await dedicated.get_playwright_browser()
+    await dedicated.close()
+    assert events == ["start", "stop", "start", "stop"]
+
+@pytest.mark.asyncio
+async def test_get_shared_browser(monkeypatch):
+    """
+    Test that get_shared_browser hands out one Browser per config and only closes
+    Chromium when the last user closes it.
+    """
+    from browser_use.browser.browser import get_shared_browser
+    closed = []
+    class DummyBrowser:
+        async def close(self):
+            closed.append(True)
+    class DummyChromium:
+        async def launch(self, headless, args, proxy=None):
+            return DummyBrowser()
+    class DummyPlaywright:
+        def __init__(self):
+            self.chromium = DummyChromium()
+        async def stop(self):
+            pass
+    class DummyAsyncPlaywrightContext:
+        async def start(self):
+            return DummyPlaywright()
+    monkeypatch.setattr("browser_use.browser.browser.async_playwright", lambda: DummyAsyncPlaywrightContext())
+    config = BrowserConfig(headless=True)
+    first = get_shared_browser(config)
+    second = get_shared_browser(BrowserConfig(headless=True))
+    other = get_shared_browser(BrowserConfig(headless=False))
+    assert first is second
+    assert first is not other
+    await first.get_playwright_browser()
+    await first.close()
+    assert closed == [] and first.playwright_browser is not None
+    await second.close()
+    assert closed == [True]
+    third = get_shared_browser(config)
+    assert third is not first
+    await third.close()
+    await other.close()
+    default = get_shared_browser()
+    assert get_shared_browser(BrowserConfig()) is default
+    await default.close()
+    await default.close()
+
+@pytest.mark.asyncio
+async def test_launch_preset(monkeypatch):
+    """
+    Test that a launch preset adds its Chromium args before extra_chromium_args, replaces
+    only the default viewport, and that unknown presets are rejected.
+    """
+    from browser_use.browser.presets import LAUNCH_PRESETS
+    captured_args = []
+    class DummyBrowser:
+        pass
+    class DummyChromium:
+        async def launch(self, headless, args, proxy=None):
+            captured_args.extend(args)
+            return DummyBrowser()
+    class DummyPlaywright:
+        def __init__(self):
+            self.chromium = DummyChromium()
+        async def stop(self):
+            pass
+    class DummyAsyncPlaywrightContext:
+        async def start(self):
+            return DummyPlaywright()
+    monkeypatch.setattr("browser_use.browser.browser.async_playwright", lambda: DummyAsyncPlaywrightContext())
+    preset = LAUNCH_PRESETS["throughput"]
+    browser_obj = Browser(config=BrowserConfig(headless=True, preset="throughput", extra_chromium_args=["--renderer-process-limit=4"]))
+    await browser_obj.get_playwright_browser()
+    assert all(arg in captured_args for arg in preset.args)
+    assert captured_args.index("--renderer-process-limit=8") < captured_args.index("--renderer-process-limit=4")
+    assert browser_obj.config.new_context_config.browser_window_size == preset.viewport
+    context = await browser_obj.new_context()
+    assert context.config.browser_window_size == preset.viewport
+    await browser_obj.close()
+    custom_size = BrowserContextConfig(browser_window_size={"width": 1920, "height": 1080})
+    browser_obj = Browser(config=BrowserConfig(preset="low_memory", new_context_config=custom_size))
+    assert browser_obj.config.new_context_config.browser_window_size == {"width": 1920, "height": 1080}
+    with pytest.raises(ValueError, match="Unknown launch preset"):
+        Browser(config=BrowserConfig(preset="turbo"))
@@ -0,0 +1,138 @@
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import create_model
+
+from browser_use.agent.checkpoint import CheckpointJournal
+from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
+from browser_use.agent.views import (
+	ActionResult,
+	AgentBrain,
+	AgentHistory,
+	AgentOutput,
+	AgentState,
+	StepMetadata,
+)
+from browser_use.browser.views import BrowserStateHistory, TabInfo
+from browser_use.controller.registry.views import ActionModel
+
+
+def make_output_model():
+	DoneParams = create_model('DoneParams', text=(str, ...))
+	Actions = create_model('Actions', __base__=ActionModel, done=(DoneParams | None, None))
+	return AgentOutput.type_with_custom_actions(Actions), Actions
+
+
+def run_step(state: AgentState, message_manager: MessageManager, output_model, actions_model, i: int) -> None:
+	message_manager._add_message_with_tokens(HumanMessage(content=f'state {i}'))
+	output = output_model(
+		current_state=AgentBrain(evaluation_previous_goal='Success', memory=f'memory {i}', next_goal=f'goal {i}'),
+		action=[actions_model(done={'text': f'done {i}'})],
+	)
+	message_manager._remove_last_state_message()
+	message_manager.add_model_output(output)
+	result = [ActionResult(extracted_content=f'result {i}', include_in_memory=True)]
+	state.last_result = result
+	state.n_steps += 1
+	state.history.history.append(
+		AgentHistory(
+			model_output=output,
+			result=result,
+			state=BrowserStateHistory(
+				url=f'https://example.com/{i}',
+				title='Example',
+				tabs=[TabInfo(page_id=0, url=f'https://example.com/{i}', title='Example')],
+				interacted_element=[None],
+			),
+			metadata=StepMetadata(step_start_time=0, step_end_time=1, input_tokens=10, step_number=i),
+		)
+	)
+
+
+def test_checkpoint_journal_roundtrip(tmp_path):
+	"""
+	Test that the journal only appends one line per step and replays into the same agent state,
+	ignoring a torn last line.
+	"""
+	output_model, actions_model = make_output_model()
+	state = AgentState()
+	message_manager = MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='System prompt'),
+		settings=MessageManagerSettings(),
+		state=state.message_manager_state,
+	)
+	journal = CheckpointJournal(tmp_path / 'journal.jsonl')
+
+	sizes = []
+	for i in range(3):
+		run_step(state, message_manager, output_model, actions_model, i)
+		journal.append(state)
+		sizes.append(journal.path.stat().st_size)
+	lines = journal.path.read_text().splitlines()
+	assert len(lines) == 3
+	# later lines only hold the delta of their step
+	assert sizes[2] - sizes[1] < sizes[0]
+
+	with open(journal.path, 'a') as f:
+		f.write('{"agent_id": "torn')
+
+	loaded = CheckpointJournal.load_state(journal.path, output_model)
+	assert loaded.agent_id == state.agent_id
+	assert loaded.n_steps == state.n_steps == 4
+	assert loaded.last_result[0].extracted_content == 'result 2'
+	assert [h.model_dump() for h in loaded.history.history] == [h.model_dump() for h in state.history.history]
+	assert loaded.history.history[-1].model_output.action[0].done.text == 'done 2'
+
+	original_messages = state.message_manager_state.history.messages
+	loaded_messages = loaded.message_manager_state.history.messages
+	assert [m.message.content for m in loaded_messages] == [m.message.content for m in original_messages]
+	assert loaded.message_manager_state.history.current_tokens == state.message_manager_state.history.current_tokens
+	assert loaded.message_manager_state.tool_id == state.message_manager_state.tool_id
+
+
+def test_checkpoint_journal_appends_after_torn_line(tmp_path):
+	"""
+	Test that appending after a resume from a journal with a torn last line first removes the fragment,
+	so a second resume recovers every step - also when the crash only cut off the final newline.
+	"""
+	output_model, actions_model = make_output_model()
+	state = AgentState()
+	message_manager = MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='System prompt'),
+		settings=MessageManagerSettings(),
+		state=state.message_manager_state,
+	)
+	path = tmp_path / 'journal.jsonl'
+	journal = CheckpointJournal(path)
+	for i in range(3):
+		run_step(state, message_manager, output_model, actions_model, i)
+		journal.append(state)
+	with open(path, 'a') as f:
+		f.write('{"agent_id": "torn')
+
+	# resume and keep going
+	state = CheckpointJournal.load_state(path, output_model)
+	message_manager = MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='System prompt'),
+		settings=MessageManagerSettings(),
+		state=state.message_manager_state,
+	)
+	journal = CheckpointJournal(path)
+	journal.seed(state)
+	for i in range(3, 5):
+		run_step(state, message_manager, output_model, actions_model, i)
+		journal.append(state)
+
+	resumed = CheckpointJournal.load_state(path, output_model)
+	assert resumed.n_steps == state.n_steps == 6
+	assert len(resumed.history.history) == 5
+	assert 'torn' not in path.read_text()
+
+	# a crash right before the newline - the complete line is kept
+	path.write_bytes(path.read_bytes()[:-1])
+	journal = CheckpointJournal(path)
+	journal.seed(resumed)
+	journal.append(resumed)
+	assert CheckpointJournal.load_state(path, output_model).n_steps == 6
+	assert len(path.read_text().splitlines()) == 6
@@ -1,6 +1,7 @@
 import asyncio
 import base64
 import os
+import time
 import pytest
 from browser_use.browser.context import BrowserContext, BrowserContextConfig
 from browser_use.browser.views import BrowserState
@@ -323,4 +324,281 @@ async def test_remove_highlights_failure():
     try:
         await context.remove_highlights()
     except Exception as e:
-        pytest.fail(f"remove_highlights raised an exception: {e}")
\ No newline at end of file
+        pytest.fail(f"remove_highlights raised an exception: {e}")
+
+
+@pytest.mark.asyncio
+async def test_reset_context_keep_page():
+    """
+    Test reset_context(keep_page=True): all tabs are replaced by one new blank tab (without
+    the back/forward history of the task), cookies and storage of every origin visited since
+    the last reset are cleared over CDP - also origins no longer loaded in any frame -,
+    permissions are cleared and the cached state is dropped.
+    """
+    class DummyFrame:
+        def __init__(self, url):
+            self.url = url
+    class DummyPage:
+        def __init__(self, url, frame_urls=()):
+            self.url = url
+            self.frames = [DummyFrame(url)] + [DummyFrame(u) for u in frame_urls]
+            self.closed = False
+            self.goto_url = None
+        async def close(self):
+            self.closed = True
+        async def goto(self, url):
+            self.goto_url = url
+    class DummyCDPSession:
+        def __init__(self):
+            self.sent = []
+            self.detached = False
+        async def send(self, method, params=None):
+            self.sent.append((method, params))
+        async def detach(self):
+            self.detached = True
+    class DummyContext:
+        def __init__(self, pages):
+            self.pages = pages
+            self.cdp_session = DummyCDPSession()
+            self.permissions_cleared = False
+            self.new_page_created = None
+        async def new_cdp_session(self, page):
+            return self.cdp_session
+        async def new_page(self):
+            self.new_page_created = DummyPage("about:blank")
+            self.pages.append(self.new_page_created)
+            return self.new_page_created
+        async def clear_permissions(self):
+            self.permissions_cleared = True
+    page1 = DummyPage("https://a.com/path", frame_urls=["https://ads.b.com:8443/frame", "about:blank"])
+    page2 = DummyPage("http://c.org/")
+    dummy_context = DummyContext([page1, page2])
+    dummy_session = type("DummySession", (), {})()
+    dummy_session.context = dummy_context
+    dummy_session.cached_state = "stale"
+    dummy_browser = Mock()
+    dummy_browser.config = Mock()
+    context = BrowserContext(browser=dummy_browser, config=BrowserContextConfig())
+    context.session = dummy_session
+    context.state.target_id = "target"
+    # visited earlier in the task, not loaded anymore
+    context._on_frame_navigated(DummyFrame("https://login.d.net/account"))
+    context._on_frame_navigated(DummyFrame("chrome-error://chromewebdata/"))
+    await context.reset_context(keep_page=True)
+    assert page1.closed is True
+    assert page2.closed is True
+    assert dummy_context.new_page_created is not None and dummy_context.new_page_created.closed is False
+    sent = dummy_context.cdp_session.sent
+    assert sent[0] == ("Network.clearBrowserCookies", None)
+    cleared = {params["origin"] for method, params in sent if method == "Storage.clearDataForOrigin"}
+    assert cleared == {"https://a.com", "https://ads.b.com:8443", "http://c.org", "https://login.d.net"}
+    assert context._visited_origins == set()
+    assert dummy_context.cdp_session.detached is True
+    assert dummy_context.permissions_cleared is True
+    assert dummy_session.cached_state is None
+    assert context.state.target_id is None
+
+@pytest.mark.asyncio
+async def test_downloads_are_saved_in_background(tmp_path):
+    """
+    Test that download events are saved without blocking, that concurrent downloads with
+    the same suggested filename get unique paths, and that collect_downloads reports a
+    download as started without waiting for it, and as saved exactly once.
+    """
+    class DummyDownload:
+        suggested_filename = "report.pdf"
+        async def save_as(self, path):
+            await asyncio.sleep(0.01)
+            with open(path, "w") as f:
+                f.write("data")
+    dummy_browser = Mock()
+    dummy_browser.config = Mock()
+    config = BrowserContextConfig(save_downloads_path=str(tmp_path))
+    context = BrowserContext(browser=dummy_browser, config=config)
+    assert config.download_wait_time == 0
+    assert await context.collect_downloads() == []
+    context._on_download(DummyDownload())
+    context._on_download(DummyDownload())
+    assert await context.collect_downloads() == ["💾  Download started: report.pdf"] * 2
+    assert await context.collect_downloads() == []
+    messages = await context.collect_downloads(wait=True)
+    paths = [m.removeprefix("💾  Downloaded file to ") for m in messages]
+    assert sorted(os.path.basename(p) for p in paths) == ["report (1).pdf", "report.pdf"]
+    assert all(os.path.exists(p) for p in paths)
+    assert await context.collect_downloads() == []
+
+@pytest.mark.asyncio
+async def test_click_waits_briefly_for_download_and_reset_drops_pending(tmp_path):
+    """
+    Test that a click waits at most download_wait_time for a download to start and returns as
+    soon as one starts, and that reset_context drops downloads of the previous task.
+    """
+    class DummyDownload:
+        suggested_filename = "report.pdf"
+        async def save_as(self, path):
+            await asyncio.sleep(10)
+    dummy_browser = Mock()
+    dummy_browser.config = Mock()
+    config = BrowserContextConfig(save_downloads_path=str(tmp_path), download_wait_time=0.2)
+    context = BrowserContext(browser=dummy_browser, config=config)
+
+    start = time.monotonic()
+    await context._wait_for_download_start()
+    assert time.monotonic() - start >= 0.2
+
+    context._download_started.clear()
+    asyncio.get_running_loop().call_later(0.01, context._on_download, DummyDownload())
+    start = time.monotonic()
+    await context._wait_for_download_start()
+    assert time.monotonic() - start < 0.2
+    assert len(context._pending_downloads) == 1
+
+    dummy_session = type("DummySession", (), {})()
+    dummy_session.context = type("DummyContext", (), {"pages": []})()
+    dummy_session.cached_state = None
+    context.session = dummy_session
+    pending = context._pending_downloads[0]
+    await context.reset_context()
+    await asyncio.sleep(0)
+    assert pending.cancelled()
+    assert await context.collect_downloads() == []
+
+@pytest.mark.asyncio
+async def test_input_text_strategy():
+    """
+    Test that 'auto' fills plain inputs and long text, types short text into fields that need
+    key events, and uses insertText for contenteditable elements. The element properties
+    must be read with a single evaluate call.
+    """
+    class DummyKeyboard:
+        def __init__(self):
+            self.inserted = None
+        async def insert_text(self, text):
+            self.inserted = text
+    class DummyPage:
+        def __init__(self):
+            self.keyboard = DummyKeyboard()
+    class DummyElementHandle:
+        def __init__(self, **properties):
+            self.properties = {"tagName": "input", "isContentEditable": False, "readOnly": False,
+                               "disabled": False, "needsKeyEvents": False, **properties}
+            self.calls = []
+        async def wait_for_element_state(self, state, timeout=None):
+            pass
+        async def scroll_into_view_if_needed(self, timeout=None):
+            pass
+        async def evaluate(self, script):
+            self.calls.append("evaluate")
+            return self.properties
+        async def fill(self, text):
+            self.calls.append(("fill", text))
+        async def type(self, text, delay=0):
+            self.calls.append(("type", text))
+        async def focus(self):
+            self.calls.append("focus")
+    dummy_browser = Mock()
+    dummy_browser.config = Mock()
+    context = BrowserContext(browser=dummy_browser, config=BrowserContextConfig(input_type_max_length=10))
+    page = DummyPage()
+    async def get_current_page():
+        return page
+    context.get_current_page = get_current_page
+    element_node = DOMElementNode(tag_name="input", xpath="//input", attributes={}, children=[], is_visible=True, parent=None)
+    async def run(handle, text):
+        async def get_locate_element(node):
+            return handle
+        context.get_locate_element = get_locate_element
+        await context._input_text_element_node(element_node, text)
+        return handle.calls
+    assert await run(DummyElementHandle(), "hello") == ["evaluate", ("fill", "hello")]
+    assert await run(DummyElementHandle(needsKeyEvents=True), "hello") == ["evaluate", ("fill", ""), ("type", "hello")]
+    assert await run(DummyElementHandle(needsKeyEvents=True), "x" * 11) == ["evaluate", ("fill", "x" * 11)]
+    assert await run(DummyElementHandle(isContentEditable=True, tagName="div"), "doc") == ["evaluate", "focus", "evaluate"]
+    assert page.keyboard.inserted == "doc"
+    context.config.input_text_strategy = "type"
+    assert await run(DummyElementHandle(), "hello") == ["evaluate", ("fill", ""), ("type", "hello")]
+
+@pytest.mark.asyncio
+async def test_get_state_reuses_unchanged_page():
+    """
+    Test that get_state reuses the cached state while the page fingerprint is unchanged,
+    re-extracts after a DOM mutation, and that dom_changed_since_state ignores pure
+    input changes (which only invalidate the screenshot).
+    """
+    class DummyPage:
+        def __init__(self):
+            self.values = ["doc", 5, 0, "https://example.com", 0, 0, 1280, 1100]
+            self.main_frame = Mock()
+            self.frames = [self.main_frame]
+        async def evaluate(self, script):
+            return list(self.values) if self.values is not None else None
+    class DummyFrame:
+        def __init__(self):
+            self.values = ["frame-doc", 0, 0]
+        async def evaluate(self, script):
+            return list(self.values)
+    class DummySession:
+        def __init__(self, page):
+            self.context = Mock()
+            self.context.pages = [page]
+            self.cached_state = None
+    dummy_browser = Mock()
+    dummy_browser.config = Mock()
+    context = BrowserContext(browser=dummy_browser, config=BrowserContextConfig(reuse_unchanged_state=True))
+    page = DummyPage()
+    session = DummySession(page)
+    async def get_session():
+        return session
+    async def get_current_page():
+        return page
+    async def wait_for_load():
+        pass
+    extractions = []
+    async def update_state(focus_element=-1):
+        extractions.append(True)
+        return Mock(name=f"state{len(extractions)}")
+    context.get_session = get_session
+    context.get_current_page = get_current_page
+    context._wait_for_page_and_frames_load = wait_for_load
+    context._update_state = update_state
+    class DummyWatchdog:
+        latest = "metrics 1"
+        async def step(self):
+            pass
+    context._memory_watchdog = DummyWatchdog()
+
+    first = await context.get_state()
+    context._memory_watchdog.latest = "metrics 2"
+    assert await context.get_state() is first
+    assert first.memory_metrics == "metrics 2", "A reused state carries the latest memory sample"
+    assert len(extractions) == 1
+    assert await context.dom_changed_since_state() is False
+
+    page.values[2] += 1  # typed into an input
+    assert await context.dom_changed_since_state() is False
+    second = await context.get_state()
+    assert second is not first and len(extractions) == 2
+
+    page.values[1] += 1  # DOM mutation
+    assert await context.dom_changed_since_state() is True
+    await context.get_state()
+    assert len(extractions) == 3
+
+    frame = DummyFrame()
+    page.frames.append(frame)  # iframe added
+    assert await context.dom_changed_since_state() is True
+    await context.get_state()
+    frame.values[1] += 1  # DOM mutation inside the iframe
+    assert await context.dom_changed_since_state() is True
+    await context.get_state()
+    assert await context.get_state() is not None and len(extractions) == 5
+
+    page.values = None  # change tracker missing - never reuse
+    await context.get_state()
+    assert len(extractions) == 6
+
+    context.config.reuse_unchanged_state = False
+    page.values = ["doc", 5, 0, "https://example.com", 0, 0, 1280, 1100]
+    await context.get_state()
+    await context.get_state()
+    assert len(extractions) == 8
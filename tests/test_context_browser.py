@@ -0,0 +1,171 @@
+"""
+Tests of BrowserContext against a real headless Chromium - pages are served by a route, no network needed.
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use.browser.browser import Browser, BrowserConfig
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+
+async def serve_html(route):
+	await route.fulfill(status=200, content_type='text/html', body='<html><body><div id="root">page</div></body></html>')
+
+
+@pytest.fixture
+async def browser():
+	browser_instance = Browser(config=BrowserConfig(headless=True))
+	yield browser_instance
+	await browser_instance.close()
+
+
+@pytest.fixture
+async def context(browser):
+	browser_context = BrowserContext(browser=browser, config=BrowserContextConfig(reuse_unchanged_state=True))
+	session = await browser_context.get_session()
+	await session.context.route('https://*.test/**', serve_html)
+	yield browser_context
+	await browser_context.close()
+
+
+async def test_reset_keeping_page_clears_storage_of_visited_origins(context):
+	"""
+	Test that reset_context(keep_page=True) clears the storage of an origin the task left before the reset,
+	and that the next task starts on a single tab without the back/forward history of the previous one.
+	"""
+	page = await context.get_current_page()
+	await page.goto('https://a.test/')
+	await page.evaluate("() => { localStorage.setItem('account', 'a'); document.cookie = 'session=a; path=/'; }")
+	await page.goto('https://b.test/')
+	await page.evaluate("() => localStorage.setItem('account', 'b')")
+	await context.create_new_tab('https://c.test/')
+
+	await context.reset_context(keep_page=True)
+
+	session = await context.get_session()
+	assert len(session.context.pages) == 1
+	page = await context.get_current_page()
+	assert page.url == 'about:blank'
+	assert await page.evaluate('() => history.length') == 1
+	assert await session.context.cookies() == []
+
+	for url in ('https://a.test/', 'https://b.test/'):
+		await page.goto(url)
+		assert await page.evaluate("() => localStorage.getItem('account')") is None
+
+
+async def test_two_tasks_on_one_pooled_context(browser):
+	"""
+	Test that the second task on a pooled context sees nothing of the first one: no cookies, no storage,
+	no back/forward history and no pending downloads.
+	"""
+	from browser_use.browser.pool import BrowserContextPool
+
+	pool = BrowserContextPool(browser, size=1)
+	try:
+		async with pool.acquire() as first:
+			session = await first.get_session()
+			await session.context.route('https://*.test/**', serve_html)
+			page = await first.get_current_page()
+			await page.goto('https://account-a.test/')
+			await page.evaluate("() => { localStorage.setItem('user', 'a'); document.cookie = 'session=a; path=/'; }")
+			await page.goto('https://other.test/')
+			first._pending_downloads.append(asyncio.create_task(asyncio.sleep(10)))
+
+		async with pool.acquire() as second:
+			assert second is first
+			assert second._pending_downloads == []
+			page = await second.get_current_page()
+			assert await page.evaluate('() => history.length') == 1
+			await page.goto('https://account-a.test/')
+			assert await page.evaluate("() => localStorage.getItem('user')") is None
+			assert await page.evaluate('() => document.cookie') == ''
+	finally:
+		await pool.close()
+
+
+SHADOW_AND_IFRAME_PAGE = """<html><body>
+<div id="host"></div>
+<iframe id="frame" srcdoc="<div id='inner'>frame</div>"></iframe>
+<script>
+	document.getElementById('host').attachShadow({ mode: 'closed' }).innerHTML = '<span>shadow</span>';
+</script>
+</body></html>"""
+
+
+async def test_fingerprint_sees_shadow_root_and_iframe_mutations(context):
+	"""
+	Test that a mutation inside a (closed) shadow root and one inside an iframe invalidate the cached state.
+	"""
+
+	async def serve_page(route):
+		await route.fulfill(status=200, content_type='text/html', body=SHADOW_AND_IFRAME_PAGE)
+
+	session = await context.get_session()
+	await session.context.route('https://shadow.test/**', serve_page)
+	page = await context.get_current_page()
+	# keep a handle on the closed shadow root to mutate it from the test
+	await page.add_init_script(
+		"""(() => {
+			const attachShadow = Element.prototype.attachShadow;
+			Element.prototype.attachShadow = function (...args) {
+				return (window.testShadowRoot = attachShadow.apply(this, args));
+			};
+		})()"""
+	)
+	await page.goto('https://shadow.test/')
+	await page.wait_for_selector('#frame')
+	frame = page.frame_locator('#frame')
+	await frame.locator('#inner').wait_for()
+
+	await context.get_state()
+	assert await context.dom_changed_since_state() is False
+
+	await page.evaluate("() => { window.testShadowRoot.querySelector('span').textContent = 'changed'; }")
+	assert await context.dom_changed_since_state() is True
+
+	state = await context.get_state()
+	assert await context.dom_changed_since_state() is False
+	child_frame = next(f for f in page.frames if f is not page.main_frame)
+	await child_frame.evaluate("() => { document.getElementById('inner').textContent = 'changed'; }")
+	assert await context.dom_changed_since_state() is True
+	assert await context.get_state() is not state
+
+
+async def test_change_tracker_is_not_visible_to_the_page(context):
+	"""
+	Test that the change tracker adds no global the page can find by name, and that the patched functions still
+	look native to the page.
+	"""
+	page = await context.get_current_page()
+	await page.goto('https://tracked.test/')
+
+	assert await context.get_page_fingerprint() is not None
+	assert await page.evaluate("() => Object.keys(window).filter((key) => key.toLowerCase().includes('browser'))") == []
+	assert await page.evaluate('() => Element.prototype.attachShadow.toString()') == 'function attachShadow() { [native code] }'
+	assert await page.evaluate('() => Function.prototype.toString.toString()') == 'function toString() { [native code] }'
+	assert await page.evaluate('() => [Element.prototype.attachShadow.name, Element.prototype.attachShadow.length]') == [
+		'attachShadow',
+		1,
+	]
+	assert await page.evaluate("() => Element.prototype.attachShadow.hasOwnProperty('prototype')") is False
+
+
+async def test_change_tracker_is_only_added_for_reuse_unchanged_state(browser):
+	"""
+	Test that pages of a context without reuse_unchanged_state do not get the change tracker.
+	"""
+	browser_context = BrowserContext(browser=browser)
+	try:
+		session = await browser_context.get_session()
+		await session.context.route('https://*.test/**', serve_html)
+		page = await browser_context.get_current_page()
+		await page.goto('https://untracked.test/')
+		assert await browser_context.get_page_fingerprint() is None
+		assert (
+			await page.evaluate('() => Element.prototype.attachShadow.toString()') == 'function attachShadow() { [native code] }'
+		)
+	finally:
+		await browser_context.close()
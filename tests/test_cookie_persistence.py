@@ -0,0 +1,85 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from browser_use.browser.cookies import CookiePersister
+
+
+class DummyContext:
+	"""Minimal stand-in for a Playwright BrowserContext that only serves cookies."""
+
+	def __init__(self, cookies):
+		self._cookies = cookies
+		self.calls = 0
+
+	async def cookies(self):
+		self.calls += 1
+		return list(self._cookies)
+
+
+@pytest.mark.asyncio
+async def test_save_writes_file_atomically(tmp_path):
+	"""
+	Test that save() writes the cookie jar as JSON and leaves no temp files behind.
+	"""
+	cookies_file = tmp_path / 'nested' / 'cookies.json'
+	persister = CookiePersister(str(cookies_file))
+	context = DummyContext([{'name': 'sid', 'value': '1', 'domain': 'example.com', 'path': '/'}])
+	assert await persister.save(context) is True
+	with open(cookies_file) as f:
+		assert json.load(f)[0]['name'] == 'sid'
+	assert os.listdir(cookies_file.parent) == ['cookies.json']
+
+
+@pytest.mark.asyncio
+async def test_save_skips_unchanged_cookie_jar(tmp_path):
+	"""
+	Test that a second save with an identical cookie jar does not rewrite the file,
+	and that a changed jar does.
+	"""
+	cookies_file = tmp_path / 'cookies.json'
+	persister = CookiePersister(str(cookies_file))
+	context = DummyContext([{'name': 'a', 'value': '1'}])
+	assert await persister.save(context) is True
+	assert await persister.save(context) is False
+	context._cookies = [{'name': 'a', 'value': '2'}]
+	assert await persister.save(context) is True
+
+
+@pytest.mark.asyncio
+async def test_load_primes_hash(tmp_path):
+	"""
+	Test that cookies loaded from disk are not written back if they did not change.
+	"""
+	cookies_file = tmp_path / 'cookies.json'
+	cookies = [{'name': 'a', 'value': '1'}]
+	cookies_file.write_text(json.dumps(cookies))
+	persister = CookiePersister(str(cookies_file))
+	assert await persister.load() == cookies
+	assert await persister.save(DummyContext(cookies)) is False
+	assert await CookiePersister(str(tmp_path / 'missing.json')).load() == []
+
+
+@pytest.mark.asyncio
+async def test_schedule_save_is_debounced(tmp_path):
+	"""
+	Test that many schedule_save() calls within the debounce window result in a single
+	cookie fetch, and that flush() saves immediately.
+	"""
+	cookies_file = tmp_path / 'cookies.json'
+	persister = CookiePersister(str(cookies_file), debounce_seconds=0.05)
+	context = DummyContext([{'name': 'a', 'value': '1'}])
+	for _ in range(10):
+		persister.schedule_save(context)
+	await asyncio.sleep(0.1)
+	assert context.calls == 1
+	assert cookies_file.exists()
+
+	context._cookies = [{'name': 'a', 'value': '2'}]
+	persister.schedule_save(context)
+	assert await persister.flush(context) is True
+	await asyncio.sleep(0.1)
+	assert context.calls == 2
+	assert json.loads(cookies_file.read_text())[0]['value'] == '2'
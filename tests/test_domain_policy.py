@@ -0,0 +1,116 @@
+import pytest
+
+from browser_use.browser.browser import Browser, BrowserConfig
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+from browser_use.browser.domain_policy import DomainPolicy
+from browser_use.browser.views import BrowserError
+
+
+class DummyRequest:
+	def __init__(self, url, navigation=False, resource_type='script'):
+		self.url = url
+		self.resource_type = 'document' if navigation else resource_type
+		self._navigation = navigation
+
+	def is_navigation_request(self):
+		return self._navigation
+
+
+class DummyRoute:
+	def __init__(self, request):
+		self.request = request
+		self.outcome = None
+
+	async def fallback(self):
+		self.outcome = 'fallback'
+
+	async def abort(self, error_code=None):
+		self.outcome = error_code
+
+
+def test_allow_and_deny_lists():
+	"""
+	Test suffix matching on label boundaries, that denied domains win over allowed ones,
+	and how URLs without a host are treated.
+	"""
+	policy = DomainPolicy(allowed_domains=['Example.com', 'mysite.org'], denied_domains=['ads.example.com'])
+	assert policy.is_url_allowed('https://example.com/path') is True
+	assert policy.is_url_allowed('https://deep.sub.example.com') is True
+	assert policy.is_url_allowed('http://user:pw@example.com:8080/') is True
+	assert policy.is_url_allowed('https://notexample.com') is False
+	assert policy.is_url_allowed('https://ads.example.com/banner.js') is False
+	assert policy.is_url_allowed('https://x.ads.example.com') is False
+	assert policy.is_url_allowed('notaurl') is False
+	assert policy.is_url_allowed('http://[invalid') is False
+
+	deny_only = DomainPolicy(denied_domains=['tracker.net'])
+	assert deny_only.is_url_allowed('about:blank') is True
+	assert deny_only.is_url_allowed('https://cdn.tracker.net/x.js') is False
+	assert deny_only.is_url_allowed('https://example.com') is True
+
+	assert DomainPolicy().is_active is False
+	assert DomainPolicy().is_url_allowed('anything') is True
+
+
+@pytest.mark.asyncio
+async def test_route_handler_aborts_and_counts_violations():
+	"""
+	Test that the route handler aborts disallowed documents and subresources, lets allowed
+	requests through to other handlers, and counts violations per host.
+	"""
+	policy = DomainPolicy(allowed_domains=['example.com'])
+	allowed = DummyRoute(DummyRequest('https://example.com/app.js'))
+	await policy.handle_route(allowed)
+	assert allowed.outcome == 'fallback'
+
+	for request in (
+		DummyRequest('https://evil.com/', navigation=True),
+		DummyRequest('https://evil.com/pixel.gif', resource_type='image'),
+		DummyRequest('https://cdn.other.com/lib.js'),
+	):
+		route = DummyRoute(request)
+		await policy.handle_route(route)
+		assert route.outcome == 'blockedbyclient'
+
+	assert policy.stats.blocked_navigations == 1
+	assert policy.stats.blocked_subresources == 2
+	assert policy.stats.blocked_requests == 3
+	assert policy.stats.blocked_hosts['evil.com'] == 2
+
+
+class DummyPlaywrightContext:
+	def __init__(self):
+		self.pages = []
+		self.routes = []
+
+	async def route(self, url, handler):
+		self.routes.append(handler)
+
+	async def add_init_script(self, script):
+		pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('block_disallowed_requests', [False, True])
+async def test_requests_are_only_intercepted_on_request(tmp_path, block_disallowed_requests):
+	"""
+	Test that the policy only routes the requests of the context with block_disallowed_requests, since routing
+	disables the HTTP cache, and that refused navigations are counted without it.
+	"""
+	browser = Browser(config=BrowserConfig(user_data_dir=str(tmp_path)))
+	playwright_context = DummyPlaywrightContext()
+
+	async def get_persistent_context():
+		return playwright_context
+
+	browser.get_persistent_context = get_persistent_context
+	config = BrowserContextConfig(allowed_domains=['example.com'], block_disallowed_requests=block_disallowed_requests)
+	context = BrowserContext(browser=browser, config=config)
+
+	await context._create_context(None)
+	assert (context.domain_policy.handle_route in playwright_context.routes) is block_disallowed_requests
+
+	with pytest.raises(BrowserError):
+		await context.navigate_to('https://evil.com/')
+	assert context.domain_policy.stats.blocked_navigations == 1
+	assert context.domain_policy.stats.blocked_hosts['evil.com'] == 1
@@ -0,0 +1,58 @@
+import base64
+import io
+
+import pytest
+
+from browser_use.dom.service import DomService
+
+
+def test_parse_node_reads_viewport_box():
+	"""
+	Test that the viewport box collected by buildDomTree.js is parsed into viewport_coordinates.
+	"""
+	service = DomService.__new__(DomService)
+	node, _ = service._parse_node(
+		{
+			'tagName': 'button',
+			'xpath': '/html/body/button',
+			'highlightIndex': 3,
+			'viewportCoordinates': {'x': 10, 'y': 20, 'width': 100, 'height': 40},
+		}
+	)
+	box = node.viewport_coordinates
+	assert (box.top_left.x, box.top_left.y) == (10, 20)
+	assert (box.bottom_right.x, box.bottom_right.y) == (110, 60)
+	assert (box.center.x, box.center.y) == (60, 40)
+	node, _ = service._parse_node({'tagName': 'div', 'xpath': '/html/body/div'})
+	assert node.viewport_coordinates is None
+
+
+def test_draw_highlights_scales_boxes_to_screenshot():
+	"""
+	Test that boxes are drawn in the highlight color, scaled by the device pixel ratio,
+	and that elements without a box are skipped.
+	"""
+	Image = pytest.importorskip('PIL.Image')
+	from browser_use.dom.highlights import draw_highlights
+
+	buffer = io.BytesIO()
+	Image.new('RGB', (400, 300), 'white').save(buffer, format='PNG')
+	screenshot = base64.b64encode(buffer.getvalue()).decode()
+
+	service = DomService.__new__(DomService)
+	node, _ = service._parse_node(
+		{
+			'tagName': 'button',
+			'xpath': '/html/body/button',
+			'highlightIndex': 0,
+			'viewportCoordinates': {'x': 50, 'y': 50, 'width': 60, 'height': 40},
+		}
+	)
+	hidden, _ = service._parse_node({'tagName': 'a', 'xpath': '/html/body/a', 'highlightIndex': 1})
+
+	result = draw_highlights(screenshot, {0: node, 1: hidden}, viewport_width=200)
+	image = Image.open(io.BytesIO(base64.b64decode(result))).convert('RGB')
+	assert image.size == (400, 300)
+	# index 0 is red, its left border is at 2 x 50 px
+	assert image.getpixel((101, 150)) == (255, 0, 0)
+	assert image.getpixel((20, 20)) == (255, 255, 255)
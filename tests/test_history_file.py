@@ -0,0 +1,97 @@
+import base64
+from unittest.mock import MagicMock, Mock
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from browser_use.agent.history_file import HistoryReader, screenshots_dir
+from browser_use.agent.service import Agent
+from browser_use.agent.views import ActionResult, AgentBrain, AgentHistory, AgentHistoryList, AgentOutput
+from browser_use.browser.browser import Browser
+from browser_use.browser.context import BrowserContext
+from browser_use.browser.views import BrowserState, BrowserStateHistory, TabInfo
+from browser_use.controller.service import Controller
+
+SCREENSHOT = base64.b64encode(b'\x89PNG\r\n\x1a\n fake screenshot').decode()
+
+
+def make_history(output_model, action_model, n_steps: int) -> AgentHistoryList:
+	return AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=output_model(
+					current_state=AgentBrain(evaluation_previous_goal='Success', memory='', next_goal=f'goal {i}'),
+					action=[action_model(go_to_url={'url': f'https://example.com/{i}'})],
+				),
+				result=[ActionResult(extracted_content=f'result {i}')],
+				state=BrowserStateHistory(
+					url=f'https://example.com/{i}',
+					title='Example',
+					tabs=[TabInfo(page_id=0, url=f'https://example.com/{i}', title='Example')],
+					interacted_element=[None],
+					screenshot=SCREENSHOT if i % 2 == 0 else None,
+				),
+			)
+			for i in range(n_steps)
+		]
+	)
+
+
+def test_jsonl_history_roundtrip_and_lazy_reader(tmp_path):
+	"""
+	Test that JSONL histories store one step per line with screenshots out of line, and that the reader
+	indexes the file and loads single steps on access.
+	"""
+	action_model = Controller().registry.create_action_model()
+	output_model = AgentOutput.type_with_custom_actions(action_model)
+	history = make_history(output_model, action_model, 5)
+	path = tmp_path / 'history.jsonl'
+	history.save_to_file(path)
+
+	lines = path.read_text().splitlines()
+	assert len(lines) == 5
+	assert SCREENSHOT not in lines[0]
+	assert (screenshots_dir(path) / 'step_0000.png').read_bytes() == base64.b64decode(SCREENSHOT)
+
+	reader = HistoryReader(path, output_model)
+	assert len(reader) == 5
+	assert reader[3].model_output.current_state.next_goal == 'goal 3'
+	assert reader[-1].state.url == 'https://example.com/4'
+	assert reader[0].state.screenshot is None
+	assert reader.screenshot(0) == SCREENSHOT
+	assert reader.raw(2)['result'][0]['extracted_content'] == 'result 2'
+	assert [h.state.url for h in reader[1:3]] == ['https://example.com/1', 'https://example.com/2']
+
+	loaded = AgentHistoryList.load_from_file(path, output_model)
+	assert [h.model_dump() for h in loaded.history] == [h.model_dump() for h in history.history]
+
+
+def test_agent_streams_history_to_file_as_steps_complete(tmp_path):
+	"""
+	Test that an agent with `history_path` appends every history item to the file as soon as it is stored.
+	"""
+	path = tmp_path / 'history.jsonl'
+	agent = Agent(
+		task='Test task',
+		llm=Mock(spec=BaseChatModel),
+		browser=Mock(spec=Browser),
+		browser_context=Mock(spec=BrowserContext),
+		history_path=path,
+	)
+	output_model = agent.AgentOutput
+	history = make_history(output_model, agent.ActionModel, 2)
+
+	for i, item in enumerate(history.history):
+		state = BrowserState(
+			url=item.state.url,
+			title='Example',
+			element_tree=MagicMock(),
+			selector_map={},
+			tabs=item.state.tabs,
+			screenshot=item.state.screenshot,
+		)
+		agent._make_history_item(item.model_output, state, item.result)
+		assert len(path.read_text().splitlines()) == i + 1
+
+	reader = HistoryReader(path, output_model)
+	assert [h.state.url for h in reader[:]] == ['https://example.com/0', 'https://example.com/1']
+	assert reader.screenshot(0) == SCREENSHOT
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from browser_use.agent.llm_cache import LLMCache
+
+
+class DummyLLM:
+	model_name = 'dummy'
+
+	@property
+	def _identifying_params(self):
+		return {'model_name': self.model_name, 'temperature': 0}
+
+
+def test_llm_cache_roundtrip_and_stats(tmp_path):
+	"""
+	Test that a stored response is returned for the same input, model and extra key parts,
+	survives reopening the cache file and is counted in the stats.
+	"""
+	cache = LLMCache(tmp_path / 'llm_cache.sqlite')
+	llm = DummyLLM()
+	messages = [
+		SystemMessage(content='system'),
+		HumanMessage(content='Current date and time: 2025-01-01 10:00\nClick the button'),
+	]
+	key = cache.make_key(llm, messages, 'next_action')
+
+	assert cache.get(key) is None
+	cache.put(key, '{"action": []}')
+	assert cache.get(key) == '{"action": []}'
+
+	# the timestamp of the state message is not part of the key
+	later = [SystemMessage(content='system'), HumanMessage(content='Current date and time: 2025-01-01 10:05\nClick the button')]
+	assert cache.make_key(llm, later, 'next_action') == key
+	# but the input, the model settings and the extra parts are
+	assert cache.make_key(llm, later, 'plan') != key
+	assert cache.make_key(llm, [HumanMessage(content='Click the link')], 'next_action') != key
+	other_llm = DummyLLM()
+	other_llm.model_name = 'other'
+	assert cache.make_key(other_llm, messages, 'next_action') != key
+
+	assert (cache.stats.hits, cache.stats.misses, cache.stats.stored) == (1, 1, 1)
+	cache.close()
+
+	reopened = LLMCache(tmp_path / 'llm_cache.sqlite')
+	assert reopened.get(key) == '{"action": []}'
+	reopened.close()
+
+
+def test_llm_cache_eviction(tmp_path):
+	"""
+	Test that least recently used entries are evicted above max_entries and expired entries are not returned.
+	"""
+	cache = LLMCache(tmp_path / 'llm_cache.sqlite', max_entries=2)
+	cache.put('a', '1')
+	cache.put('b', '2')
+	assert cache.get('a') == '1'
+	cache.put('c', '3')
+
+	assert len(cache) == 2
+	assert cache.get('b') is None
+	assert cache.get('a') == '1'
+	assert cache.stats.evictions == 1
+
+	cache.ttl_seconds = 0.05
+	time.sleep(0.1)
+	assert cache.get('c') is None
+	assert len(cache) == 1
+	cache.close()
+
+
+@pytest.mark.asyncio
+async def test_llm_cache_async_access_runs_off_the_event_loop(tmp_path):
+	"""
+	Test that aget and aput read and write the cache on its own thread, not on the thread of the event loop.
+	"""
+	cache = LLMCache(tmp_path / 'llm_cache.sqlite')
+	threads = []
+	get, put = cache.get, cache.put
+	cache.get = lambda key: threads.append(threading.get_ident()) or get(key)
+	cache.put = lambda key, value: threads.append(threading.get_ident()) or put(key, value)
+
+	assert await cache.aget('a') is None
+	await cache.aput('a', '1')
+	assert await cache.aget('a') == '1'
+
+	assert len(threads) == 3 and threading.get_ident() not in threads
+	assert (cache.stats.hits, cache.stats.misses, cache.stats.stored) == (1, 1, 1)
+	cache.close()
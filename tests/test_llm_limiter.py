@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from browser_use.agent import llm_limiter
+from browser_use.agent.llm_limiter import LLMLimiter, ProviderLimits, track_llm_calls
+
+
+class DummyLLM:
+	def __init__(self, delay: float = 0.05):
+		self.delay = delay
+		self.in_flight = 0
+		self.max_in_flight = 0
+		self.calls = 0
+
+	async def ainvoke(self, input):
+		self.calls += 1
+		self.in_flight += 1
+		self.max_in_flight = max(self.max_in_flight, self.in_flight)
+		await asyncio.sleep(self.delay)
+		self.in_flight -= 1
+		return input
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_in_flight_requests():
+	"""
+	Test that no more than max_in_flight calls of a provider run at the same time
+	and that the wait is recorded for the current task.
+	"""
+	limiter = LLMLimiter({'DummyLLM': ProviderLimits(max_in_flight=2)})
+	llm = DummyLLM()
+
+	async def call(i):
+		stats = track_llm_calls()
+		result = await limiter.ainvoke(llm, i, provider='DummyLLM')
+		return result, stats.queue_seconds
+
+	results = await asyncio.gather(*(call(i) for i in range(6)))
+
+	assert [result for result, _ in results] == list(range(6))
+	assert llm.max_in_flight == 2
+	assert max(waited for _, waited in results) >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_limiter_waits_for_token_budget(monkeypatch):
+	"""
+	Test that calls over the tokens per minute budget wait until earlier calls leave the window.
+	"""
+	monkeypatch.setattr(llm_limiter, '_TOKEN_WINDOW_SECONDS', 0.2)
+	limiter = LLMLimiter({'DummyLLM': ProviderLimits(tokens_per_minute=100)})
+	llm = DummyLLM(delay=0)
+
+	stats = track_llm_calls()
+	await limiter.ainvoke(llm, 'a', provider='DummyLLM', tokens=60)
+	await limiter.ainvoke(llm, 'b', provider='DummyLLM', tokens=60)
+	assert stats.queue_seconds >= 0.15
+
+	# unlimited providers are called directly
+	await limiter.ainvoke(llm, 'c', provider='OtherLLM', tokens=10_000)
+	assert llm.calls == 3
@@ -0,0 +1,171 @@
+import pytest
+
+from browser_use.browser.context import BrowserContextConfig
+from browser_use.browser.watchdog import MemoryWatchdog
+
+MB = 1024 * 1024
+
+
+class DummyCDPSession:
+	def __init__(self, page):
+		self.page = page
+		self.detached = False
+
+	async def detach(self):
+		self.detached = True
+
+	async def send(self, method, params=None):
+		if method == 'Performance.getMetrics':
+			return {
+				'metrics': [
+					{'name': 'JSHeapUsedSize', 'value': self.page.heap},
+					{'name': 'Nodes', 'value': self.page.nodes},
+					{'name': 'Documents', 'value': 1},
+				]
+			}
+		return {}
+
+
+class DummyPage:
+	def __init__(self, context, url, heap, nodes=100):
+		self.context = context
+		self.url = url
+		self.heap = heap
+		self.nodes = nodes
+		self.scroll = [0, 500]
+		self.navigations = []
+
+	async def close(self):
+		self.context.pages.remove(self)
+
+	async def evaluate(self, script, arg=None):
+		if arg is not None:
+			self.scroll = arg
+			return None
+		return list(self.scroll)
+
+	async def goto(self, url):
+		self.navigations.append(url)
+		self.scroll = [0, 0]
+
+	async def wait_for_load_state(self, state=None):
+		pass
+
+
+class DummyPlaywrightContext:
+	def __init__(self):
+		self.pages = []
+
+	async def new_cdp_session(self, page):
+		return DummyCDPSession(page)
+
+
+class DummySession:
+	def __init__(self, context):
+		self.context = context
+
+
+class DummyBrowserContext:
+	"""BrowserContext stand-in - the current page is the last one, like without CDP."""
+
+	def __init__(self, **config):
+		self.config = BrowserContextConfig(**config)
+		self.playwright_context = DummyPlaywrightContext()
+
+	def add_page(self, url, heap, nodes=100):
+		page = DummyPage(self.playwright_context, url, heap, nodes)
+		self.playwright_context.pages.append(page)
+		return page
+
+	async def get_session(self):
+		return DummySession(self.playwright_context)
+
+	async def get_current_page(self):
+		return self.playwright_context.pages[-1]
+
+	async def get_pages(self):
+		return list(self.playwright_context.pages)
+
+
+@pytest.mark.asyncio
+async def test_idle_tabs_are_evicted_lru_when_over_total_budget():
+	"""
+	Test that idle tabs are closed least recently used first until the context is under
+	its total heap budget, and that the current tab is never closed.
+	"""
+	context = DummyBrowserContext(max_total_js_heap_mb=250, max_tab_js_heap_mb=1000)
+	oldest = context.add_page('https://a.com', 100 * MB)
+	newer = context.add_page('https://b.com', 100 * MB)
+	current = context.add_page('https://c.com', 100 * MB)
+	watchdog = MemoryWatchdog(context, interval=1)
+	watchdog._last_used = {oldest: 1.0, newer: 2.0}
+
+	report = await watchdog.check()
+	assert report.evicted_tabs == ['https://a.com']
+	assert context.playwright_context.pages == [newer, current]
+	assert report.total_js_heap_used_bytes == 300 * MB
+	assert watchdog.latest is report
+
+
+@pytest.mark.asyncio
+async def test_current_tab_over_budget_is_reloaded_keeping_scroll():
+	"""
+	Test that a current tab over its node budget is flagged, and reloaded at the next
+	reload_if_needed() call with its URL and scroll position restored.
+	"""
+	context = DummyBrowserContext(max_tab_dom_nodes=1000)
+	idle = context.add_page('https://idle.com', 1 * MB, nodes=5000)
+	current = context.add_page('https://heavy.com', 1 * MB, nodes=5000)
+	watchdog = MemoryWatchdog(context, interval=1)
+
+	report = await watchdog.check()
+	assert report.evicted_tabs == ['https://idle.com']
+	assert idle not in context.playwright_context.pages
+	assert await watchdog.reload_if_needed() is True
+	assert current.navigations == ['https://heavy.com']
+	assert current.scroll == [0, 500]
+	assert report.reloaded_tabs == ['https://heavy.com']
+	assert await watchdog.reload_if_needed() is False
+
+
+@pytest.mark.asyncio
+async def test_step_checks_at_most_every_interval_and_stop_detaches_sessions():
+	"""
+	Test that step() only samples the tabs once `interval` seconds passed since the last sample, reloads a current tab
+	over budget right away, and that stop() detaches the CDP sessions it opened.
+	"""
+	context = DummyBrowserContext(max_tab_dom_nodes=1000)
+	current = context.add_page('https://heavy.com', 1 * MB, nodes=5000)
+	watchdog = MemoryWatchdog(context, interval=3600)
+
+	await watchdog.step()
+	first = watchdog.latest
+	assert current.navigations == ['https://heavy.com']
+	await watchdog.step()
+	assert watchdog.latest is first
+	assert current.navigations == ['https://heavy.com']
+
+	cdp_sessions = list(watchdog._cdp_sessions.values())
+	assert len(cdp_sessions) == 1
+	await watchdog.stop()
+	assert all(cdp_session.detached for cdp_session in cdp_sessions)
+	assert watchdog._cdp_sessions == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_does_not_fail_the_step():
+	"""
+	Test that a reload that times out is logged instead of raised out of step(), so get_state still runs.
+	"""
+	context = DummyBrowserContext(max_tab_dom_nodes=1000)
+	current = context.add_page('https://heavy.com', 1 * MB, nodes=5000)
+
+	async def goto(url):
+		raise TimeoutError('Timeout 30000ms exceeded')
+
+	current.goto = goto
+	watchdog = MemoryWatchdog(context, interval=1)
+
+	await watchdog.step()
+	assert watchdog.latest is not None
+	assert await watchdog.reload_if_needed() is False
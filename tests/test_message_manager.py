@@ -0,0 +1,245 @@
+import base64
+import struct
+import zlib
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from browser_use.agent.message_manager import tokenizers
+from browser_use.agent.message_manager.compaction import MEMORY_MESSAGE_PREFIX, HistoryCompactor
+from browser_use.agent.message_manager.service import HISTORY_PLACEHOLDER, MessageManager, MessageManagerSettings
+from browser_use.agent.message_manager.tokenizers import EstimateTokenizer, get_tokenizer, image_tokens, png_dimensions
+from browser_use.agent.views import AgentBrain, AgentOutput, MessageManagerState
+
+
+def make_message_manager(**settings) -> MessageManager:
+	return MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='System prompt'),
+		settings=MessageManagerSettings(**settings),
+		state=MessageManagerState(),
+	)
+
+
+def test_stable_prefix_cache_control_markers():
+	"""
+	Test that in stable prefix mode the end of the preamble and the end of the task history are marked
+	as cache breakpoints, without changing the stored messages.
+	"""
+	message_manager = make_message_manager(stable_prefix=True, cache_control=True)
+	prefix_length = message_manager.state.prefix_length
+	assert prefix_length == len(message_manager.state.history.messages)
+
+	message_manager._add_message_with_tokens(HumanMessage(content='Action result: clicked'))
+	message_manager._add_message_with_tokens(HumanMessage(content='Current state'))
+	messages = message_manager.get_messages()
+
+	preamble_end = messages[prefix_length - 1]
+	assert preamble_end.content[0]['cache_control'] == {'type': 'ephemeral'}
+	assert messages[-2].content[0] == {'type': 'text', 'text': 'Action result: clicked', 'cache_control': {'type': 'ephemeral'}}
+	# the current state message is not cached and the history keeps plain messages
+	assert messages[-1].content == 'Current state'
+	assert isinstance(message_manager.state.history.messages[prefix_length - 1].message.content, str)
+
+	# the preamble is byte-stable across steps
+	message_manager._remove_last_state_message()
+	message_manager.add_plan('plan', position=-1)
+	message_manager._add_message_with_tokens(HumanMessage(content='Next state'))
+	assert message_manager.get_messages()[:prefix_length] == messages[:prefix_length]
+	assert isinstance(message_manager.get_messages()[-3], AIMessage)
+
+
+def test_stable_prefix_rejects_inserts_into_preamble():
+	"""
+	Test that inserting into the preamble raises in stable prefix mode and that no markers are added by default.
+	"""
+	message_manager = make_message_manager(stable_prefix=True)
+	with pytest.raises(ValueError):
+		message_manager._add_message_with_tokens(HumanMessage(content='inserted'), position=1)
+
+	assert all(isinstance(message.content, str) for message in message_manager.get_messages())
+
+
+def png_data_url(width: int, height: int) -> str:
+	ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+	chunk = struct.pack('>I', len(ihdr)) + b'IHDR' + ihdr + struct.pack('>I', zlib.crc32(b'IHDR' + ihdr))
+	return 'data:image/png;base64,' + base64.b64encode(b'\x89PNG\r\n\x1a\n' + chunk).decode()
+
+
+class CountingTokenizer:
+	def __init__(self):
+		self.calls = 0
+
+	def count(self, text: str) -> int:
+		self.calls += 1
+		return len(text.split())
+
+
+def test_image_tokens_from_screenshot_size():
+	"""
+	Test that image tokens are computed from the PNG header instead of a flat estimate.
+	"""
+	assert png_dimensions(png_data_url(1280, 1100)) == (1280, 1100)
+	assert png_dimensions('data:image/jpeg;base64,abcd') is None
+
+	# 1280x1100 is scaled to 768x660 -> 2x2 tiles
+	assert image_tokens(1280, 1100, 'gpt-4o') == 85 + 170 * 4
+	assert image_tokens(1000, 750, 'claude-3-5-sonnet') == 1000
+	assert image_tokens(1280, 1100, 'gpt-4o') < image_tokens(1920, 4000, 'gpt-4o')
+
+	message_manager = make_message_manager(model_name='gpt-4o')
+	message = HumanMessage(
+		content=[{'type': 'text', 'text': 'state'}, {'type': 'image_url', 'image_url': {'url': png_data_url(1280, 1100)}}]
+	)
+	assert message_manager._count_tokens(message) == message_manager._count_text_tokens('state') + 85 + 170 * 4
+
+
+def test_pluggable_tokenizer_is_memoized(monkeypatch):
+	"""
+	Test that registered tokenizers are used for their model family, unknown models fall back
+	to the character estimate and every message is tokenized once.
+	"""
+	monkeypatch.setattr(tokenizers, '_TOKENIZER_FACTORIES', dict(tokenizers._TOKENIZER_FACTORIES))
+	monkeypatch.setattr(tokenizers, '_tokenizers', {})
+	tokenizer = CountingTokenizer()
+	tokenizers.register_tokenizer('my-model', lambda: tokenizer)
+
+	assert isinstance(get_tokenizer('unknown-model'), EstimateTokenizer)
+	assert get_tokenizer('provider/my-model-large') is tokenizer
+	# Bedrock model ids with region and provider prefixes
+	assert get_tokenizer('us.my-model-large') is tokenizer
+	assert get_tokenizer('bedrock/eu.vendor.my-model-v1:0') is tokenizer
+
+	message_manager = make_message_manager(model_name='my-model-large')
+	message = HumanMessage(content='one two three')
+	calls = tokenizer.calls
+	assert message_manager._count_tokens(message) == 3
+	assert message_manager._count_tokens(message) == 3
+	assert tokenizer.calls == calls + 1
+
+	message.content = 'one two three four'
+	assert message_manager._count_tokens(message) == 4
+
+
+class SummaryLLM:
+	def __init__(self):
+		self.prompts = []
+
+	async def ainvoke(self, messages):
+		self.prompts.append(messages[-1].content)
+		return AIMessage(content=f'summary {len(self.prompts)}')
+
+
+def add_step(message_manager: MessageManager, i: int) -> None:
+	output = AgentOutput(
+		current_state=AgentBrain(evaluation_previous_goal='Success', memory=f'step {i}', next_goal=f'goal {i}'),
+		action=[],
+	)
+	message_manager.add_model_output(output)
+	message_manager._add_message_with_tokens(HumanMessage(content=f'Action result: result {i}'))
+
+
+@pytest.mark.asyncio
+async def test_history_compaction_keeps_recent_window():
+	"""
+	Test that the old history is summarized into one memory message after the preamble, the recent
+	messages stay verbatim, token accounting follows and the next compaction folds in the previous memory.
+	"""
+	message_manager = make_message_manager(stable_prefix=True)
+	prefix_length = message_manager.state.prefix_length
+	preamble = message_manager.get_messages()
+	llm = SummaryLLM()
+	compactor = HistoryCompactor(llm, token_budget=50, keep_recent_messages=4)
+
+	for i in range(10):
+		add_step(message_manager, i)
+	assert compactor.compaction_range(message_manager) is not None
+	recent = message_manager.get_messages()[-4:]
+
+	assert await compactor.compact(message_manager)
+	messages = message_manager.get_messages()
+	assert messages[:prefix_length] == preamble
+	assert messages[prefix_length].content == f'{MEMORY_MESSAGE_PREFIX}\nsummary 1'
+	assert messages[prefix_length + 1 :] == recent
+	assert 'Action result: result 0' in llm.prompts[0] and '"memory": "step 0"' in llm.prompts[0]
+	assert message_manager.state.history.current_tokens == sum(m.metadata.tokens for m in message_manager.state.history.messages)
+
+	for i in range(10, 20):
+		add_step(message_manager, i)
+	assert await compactor.compact(message_manager)
+	assert 'summary 1' in llm.prompts[1]
+	assert message_manager.get_messages()[prefix_length].content == f'{MEMORY_MESSAGE_PREFIX}\nsummary 2'
+	assert len(message_manager.get_messages()) == prefix_length + 1 + 4
+
+
+@pytest.mark.asyncio
+async def test_compaction_keeps_preamble_of_state_without_prefix_length():
+	"""
+	Test that a state saved before the preamble length was recorded gets it back from the memory placeholder, so
+	compaction never summarizes the system prompt and the task - and that without a placeholder nothing is compacted.
+	"""
+	original = make_message_manager(available_file_paths=['/tmp/file.txt'])
+	prefix_length = original.state.prefix_length
+	for i in range(10):
+		add_step(original, i)
+	old_state = original.state.model_copy(update={'prefix_length': 0})
+
+	message_manager = MessageManager(task='Test task', system_message=SystemMessage(content='System prompt'), state=old_state)
+	assert message_manager.state.prefix_length == prefix_length
+	preamble = message_manager.get_messages()[:prefix_length]
+	assert await HistoryCompactor(SummaryLLM(), token_budget=50, keep_recent_messages=4).compact(message_manager)
+	assert message_manager.get_messages()[:prefix_length] == preamble
+
+	without_placeholder = MessageManagerState()
+	without_placeholder.history.messages = [m for m in old_state.history.messages if m.message.content != HISTORY_PLACEHOLDER]
+	message_manager = MessageManager(
+		task='Test task', system_message=SystemMessage(content='System prompt'), state=without_placeholder
+	)
+	assert HistoryCompactor(SummaryLLM(), token_budget=50).compaction_range(message_manager) is None
+
+
+def test_huggingface_tokenizer_loads_in_background(monkeypatch):
+	"""
+	Test that the tokenizer files are only downloaded on the first count, on a background thread while the count
+	falls back to the estimate, and that a failed download keeps estimating.
+	"""
+	import sys
+	import threading
+	import types
+
+	loaded = threading.Event()
+	downloads = []
+
+	class DummyEncoding:
+		def __init__(self, text):
+			self.ids = text.split()
+
+	class DummyTokenizer:
+		@staticmethod
+		def from_pretrained(repo_id):
+			downloads.append(repo_id)
+			assert loaded.wait(timeout=5)
+			if repo_id == 'missing/repo':
+				raise OSError('not found')
+			return types.SimpleNamespace(encode=lambda text, add_special_tokens: DummyEncoding(text))
+
+	monkeypatch.setitem(sys.modules, 'tokenizers', types.SimpleNamespace(Tokenizer=DummyTokenizer))
+
+	tokenizer = tokenizers.HuggingFaceTokenizer('some/repo')
+	missing = tokenizers.HuggingFaceTokenizer('missing/repo')
+	assert downloads == []
+	message_manager = make_message_manager()
+	message_manager.tokenizer = tokenizer
+	message = HumanMessage(content='one two three four five six')
+
+	assert message_manager._count_tokens(message) == len('one two three four five six') // 3
+	assert missing.count('one two three') == len('one two three') // 3
+	loaded.set()
+	tokenizer._loader.join(timeout=5)
+	missing._loader.join(timeout=5)
+
+	assert tokenizer.count('one two three four five six') == 6
+	# the estimate was not memoized
+	assert message_manager._count_tokens(message) == 6
+	assert missing.count('one two three') == len('one two three') // 3
+	assert downloads == ['some/repo', 'missing/repo']
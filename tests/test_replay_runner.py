@@ -0,0 +1,71 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from browser_use.agent.views import AgentBrain, AgentHistory, AgentHistoryList, AgentOutput
+from browser_use.browser.views import BrowserStateHistory
+from browser_use.controller.service import Controller
+from browser_use.runner.replay import ReplayReport, ReplayRunner
+from browser_use.runner.views import ReplayJob
+
+
+@pytest.mark.asyncio
+async def test_replay_runner_replays_each_parameter_set(tmp_path, dummy_agent, dummy_browser):
+	"""
+	Test that the replay runner replays the history once per parameter set with bounded concurrency,
+	on a separate copy of the history, and collects successes and failures in submission order.
+	"""
+	browser = dummy_browser
+	history = AgentHistoryList(history=[])
+	runner = ReplayRunner(history, llm=None, browser=browser, concurrency=2)  # type: ignore
+	output = tmp_path / 'replays.jsonl'
+
+	jobs = [ReplayJob(sensitive_data={'user': f'user{i}'}, replay_id=str(i)) for i in range(4)] + [{'user': 'locked'}]
+	report = await runner.run(jobs, output_path=output)
+
+	assert dummy_agent.max_running == 2
+	assert all(h is not history for h in dummy_agent.histories)
+	assert [r.replay_id for r in report.results[:4]] == ['0', '1', '2', '3']
+	assert report.results[0].extracted_content == ['logged in as user0', 'done']
+	assert report.results[0].is_done and report.results[0].is_successful
+	assert report.results[-1].error == 'Step 2 failed after 3 attempts'
+	assert (report.succeeded, report.failed) == (4, 1)
+	assert not browser.closed  # injected browsers stay open
+
+	lines = [json.loads(line) for line in output.read_text().splitlines()]
+	assert len(lines) == 5
+	assert 'locked' not in output.read_text()  # the sensitive data is not written
+	assert ReplayReport().replays_per_minute == 0.0
+
+
+@pytest.mark.asyncio
+async def test_replay_runner_with_agent_rerun_history(dummy_browser):
+	"""
+	Test the replay runner with the real Agent.rerun_history: the recorded secrets are filled per replay, and a
+	recorded step without actions is counted as skipped, not as a failure of the replay.
+	"""
+	controller = Controller()
+	actions_model = controller.registry.create_action_model()
+	output_model = AgentOutput.type_with_custom_actions(actions_model)
+
+	def history_item(model_output):
+		return AgentHistory(
+			model_output=model_output,
+			result=[],
+			state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[None] if model_output else []),
+		)
+
+	done = output_model(
+		current_state=AgentBrain(evaluation_previous_goal='', memory='', next_goal='finish'),
+		action=[actions_model(done={'text': 'logged in as <secret>user</secret>', 'success': True})],
+	)
+	history = AgentHistoryList(history=[history_item(None), history_item(done)])
+
+	runner = ReplayRunner(history, llm=Mock(spec=BaseChatModel), browser=dummy_browser, agent_kwargs={'controller': controller})
+	report = await runner.run([{'user': 'user0'}, {'user': 'user1'}])
+
+	assert [r.extracted_content for r in report.results] == [['logged in as user0'], ['logged in as user1']]
+	assert all(r.is_done and r.skipped_steps == 1 and r.errors == [] for r in report.results)
+	assert report.succeeded == 2
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
@@ -124,6 +125,87 @@ class TestAgent:
 			assert 'Test error' in agent._last_result[0].error
 			assert agent._last_result[0].include_in_memory == True
 
+	@pytest.mark.asyncio
+	async def test_fast_replay_uses_recorded_selectors(self, mock_controller, mock_llm, mock_browser, mock_browser_context):  # type: ignore
+		"""
+		Test that the fast replay only extracts the page for an element whose recorded selector does not match
+		or for an action that walks the element tree, and waits for the page to settle instead of a fixed delay.
+		"""
+		agent = Agent(
+			task='Test task', llm=mock_llm, controller=mock_controller, browser=mock_browser, browser_context=mock_browser_context
+		)
+		agent.browser_context.get_replay_state = AsyncMock(side_effect=[MagicMock(), None])
+		agent.browser_context.get_state = AsyncMock(return_value=MagicMock())
+		agent.browser_context.wait_for_quiescence = AsyncMock()
+		agent.controller.act = AsyncMock(return_value=ActionResult())
+		agent._update_action_indices = AsyncMock(side_effect=lambda element, action, state: action)
+
+		actions = [MagicMock(), MagicMock(), MagicMock(), MagicMock()]
+		for action, (name, index) in zip(
+			actions, [('click_element', 1), ('input_text', 2), ('scroll_down', None), ('upload_file', 3)]
+		):
+			action.get_index.return_value = index
+			action.model_dump.return_value = {name: {'index': index}}
+		history_item = MagicMock()
+		history_item.model_output.action = actions
+		history_item.state.interacted_element = [MagicMock(), MagicMock(), None, MagicMock()]
+
+		results = await agent._execute_history_step_fast(history_item)
+
+		assert len(results) == 4
+		assert agent.browser_context.get_replay_state.await_count == 2
+		# only the element whose selector failed and the upload action need the full state
+		assert agent.browser_context.get_state.await_count == 2
+		assert agent._update_action_indices.await_count == 2
+		assert agent.browser_context.wait_for_quiescence.await_count == 4
+
+	@pytest.mark.asyncio
+	async def test_pipelined_planner_runs_during_action_call(self, mock_controller, mock_llm, mock_browser, mock_browser_context):  # type: ignore
+		"""
+		Test that the pipelined planner plans on the same input as the action model while it runs,
+		and that its plan is added to the next step.
+		"""
+		agent = Agent(
+			task='Test task',
+			llm=mock_llm,
+			controller=mock_controller,
+			browser=mock_browser,
+			browser_context=mock_browser_context,
+			planner_llm=Mock(spec=BaseChatModel),
+			planner_pipelined=True,
+		)
+		agent.browser_context.get_state = AsyncMock(return_value=MagicMock())
+		agent._message_manager = MagicMock()
+		agent._message_manager.get_messages.side_effect = lambda: [f'step {agent.state.n_steps}']
+		agent._make_history_item = MagicMock()
+		agent.multi_act = AsyncMock(return_value=[ActionResult()])
+
+		action_model_running = asyncio.Event()
+		planner_inputs = []
+
+		async def run_planner(input_messages):
+			planner_inputs.append(input_messages)
+			# only finishes if the action model is called before the plan is done
+			await asyncio.wait_for(action_model_running.wait(), timeout=1)
+			return f'plan for {input_messages[0]}'
+
+		async def get_next_action(input_messages):
+			action_model_running.set()
+			await asyncio.sleep(0)
+			return MagicMock(action=[])
+
+		agent._run_planner = run_planner
+		agent.get_next_action = get_next_action
+
+		await agent.step()
+		agent._message_manager.add_plan.assert_called_once_with(None, position=-1)
+		await agent.step()
+
+		assert planner_inputs == [['step 1'], ['step 2']]
+		agent._message_manager.add_plan.assert_called_with('plan for step 1', position=-1)
+		assert agent._planner_task is not None
+		await agent._wait_for_planner()
+
 
 class TestRegistry:
 	@pytest.fixture
@@ -0,0 +1,111 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from browser_use.runner.sharded import ShardedAgentRunner
+from browser_use.runner.views import RunnerTask, TaskResult
+
+
+class FakeProcess:
+	"""
+	Worker process stand-in - a thread that plays the worker protocol. What a task does depends on its text:
+	'crash before start' dies right after taking it, 'crash' dies after reporting it started, 'slow start'
+	reports it started only after a while, everything else just finishes.
+	"""
+
+	def __init__(self, target, args, daemon):
+		self.worker_id = args[0]
+		self.task_queue = args[-2]
+		self.result_queue = args[-1]
+		self.exitcode = None
+		self.pid = None
+		self._thread = threading.Thread(target=self._run, daemon=True)
+
+	def start(self):
+		self._thread.start()
+
+	def is_alive(self):
+		return self._thread.is_alive()
+
+	def join(self, timeout=None):
+		self._thread.join(timeout)
+
+	def terminate(self):
+		pass
+
+	def _run(self):
+		while True:
+			task = self.task_queue.get()
+			if task is None:
+				self.exitcode = 0
+				return
+			if task.task == 'crash before start':
+				self.exitcode = 1
+				return
+			if task.task == 'slow start':
+				time.sleep(0.3)
+			self.result_queue.put(('started', self.worker_id, task.task_id))
+			if task.task == 'crash':
+				self.exitcode = -9
+				return
+			time.sleep(0.02)
+			result = TaskResult(task_id=task.task_id, task=task.task, is_done=True, worker_id=self.worker_id)
+			self.result_queue.put(('done', self.worker_id, result))
+
+
+class FakeMultiprocessing:
+	Queue = queue.Queue
+	Process = FakeProcess
+
+
+def make_runner(num_workers):
+	runner = ShardedAgentRunner(llm_factory=None, num_workers=num_workers, poll_interval=0.05)  # type: ignore
+	runner._mp = FakeMultiprocessing()  # type: ignore
+	return runner
+
+
+@pytest.mark.asyncio
+async def test_tasks_are_distributed_and_results_collected_in_order():
+	"""
+	Test that the tasks are spread over the workers through the shared queue and that the results come back
+	in submission order.
+	"""
+	runner = make_runner(num_workers=2)
+	tasks = [RunnerTask(task=f'task {i}', task_id=str(i)) for i in range(8)]
+
+	results = await runner.run(tasks)
+
+	assert [r.task_id for r in results] == [t.task_id for t in tasks]
+	assert all(r.is_done and r.error is None for r in results)
+	assert {r.worker_id for r in results} == {0, 1}
+
+
+@pytest.mark.asyncio
+async def test_crashed_worker_fails_its_task_and_is_replaced():
+	"""
+	Test that the task of a worker that died is reported as failed, and that a replacement worker runs the rest.
+	"""
+	runner = make_runner(num_workers=1)
+	tasks = [RunnerTask(task='crash', task_id='crash')] + [RunnerTask(task=f'task {i}', task_id=str(i)) for i in range(3)]
+
+	results = await runner.run(tasks)
+
+	assert results[0].error == 'Worker process crashed (exit code -9)'
+	assert all(r.is_done and r.worker_id == 1 for r in results[1:])
+
+
+@pytest.mark.asyncio
+async def test_task_taken_by_live_worker_is_not_declared_lost():
+	"""
+	Test that when a worker dies between taking a task and reporting it, only its task is lost - not the one a live
+	worker has taken but not reported yet.
+	"""
+	runner = make_runner(num_workers=2)
+	tasks = [RunnerTask(task='crash before start', task_id='lost'), RunnerTask(task='slow start', task_id='slow')]
+
+	results = await runner.run(tasks)
+
+	assert results[0].error == 'Task was lost by a crashed worker process'
+	assert results[1].is_done and results[1].error is None
@@ -0,0 +1,146 @@
+import json
+import os
+
+import pytest
+
+from browser_use.browser.browser import Browser, BrowserConfig
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+from browser_use.browser.storage_state import SNAPSHOT_FORMAT_VERSION, StorageStateStore
+
+
+class DummyPage:
+	def __init__(self, origin, items, url='https://example.com/'):
+		self.origin = origin
+		self.items = items
+		self.url = url
+
+	async def evaluate(self, script):
+		return [self.origin, self.items]
+
+
+class DummyContext:
+	"""Playwright BrowserContext stand-in; supports_indexed_db mimics Playwright >= 1.51."""
+
+	def __init__(self, supports_indexed_db=True):
+		self.supports_indexed_db = supports_indexed_db
+		self.pages = [
+			DummyPage('https://example.com', {'token': 'abc'}),
+			DummyPage('null', {'ignored': '1'}, url='about:blank'),
+		]
+		self.indexed_db_requested = None
+
+	async def storage_state(self, **kwargs):
+		if 'indexed_db' in kwargs and not self.supports_indexed_db:
+			raise TypeError("storage_state() got an unexpected keyword argument 'indexed_db'")
+		self.indexed_db_requested = kwargs.get('indexed_db', False)
+		return {'cookies': [{'name': 'sid', 'value': '1'}], 'origins': []}
+
+
+@pytest.mark.asyncio
+async def test_save_and_load_latest_snapshot(tmp_path):
+	"""
+	Test that snapshots are versioned per profile, the newest one is loaded,
+	and the sessionStorage of open tabs is captured (opaque origins are skipped).
+	"""
+	store = StorageStateStore(str(tmp_path))
+	assert await store.load('work') is None
+
+	context = DummyContext()
+	first = await store.save(context, 'work')
+	second = await store.save(context, 'work')
+	assert first != second
+	assert store.latest_path('work') == second
+	assert context.indexed_db_requested is True
+
+	snapshot = await store.load('work')
+	assert snapshot['storage_state']['cookies'][0]['name'] == 'sid'
+	assert snapshot['session_storage'] == {'https://example.com': {'token': 'abc'}}
+	assert await store.load('other') is None
+
+
+@pytest.mark.asyncio
+async def test_old_versions_are_pruned(tmp_path):
+	"""
+	Test that only keep_versions snapshots are kept per profile.
+	"""
+	store = StorageStateStore(str(tmp_path), keep_versions=2)
+	for _ in range(4):
+		await store.save(DummyContext(), 'p')
+	assert sorted(os.listdir(tmp_path / 'p')) == ['v000003.json', 'v000004.json']
+
+
+@pytest.mark.asyncio
+async def test_save_without_indexed_db_support(tmp_path):
+	"""
+	Test that saving falls back to a plain storage_state on Playwright versions
+	without IndexedDB export.
+	"""
+	store = StorageStateStore(str(tmp_path))
+	context = DummyContext(supports_indexed_db=False)
+	await store.save(context, 'p')
+	assert context.indexed_db_requested is False
+
+
+def test_invalid_profile_name(tmp_path):
+	"""
+	Test that profile names can not escape the storage directory.
+	"""
+	store = StorageStateStore(str(tmp_path))
+	with pytest.raises(ValueError):
+		store.latest_path('../escape')
+	with pytest.raises(ValueError):
+		store.latest_path('')
+
+
+class DummyReusedContext:
+	"""Persistent Playwright context stand-in that records what is applied to it"""
+
+	def __init__(self):
+		self.pages = []
+		self.cookies = []
+		self.init_scripts = []
+
+	async def add_cookies(self, cookies):
+		self.cookies.extend(cookies)
+
+	async def add_init_script(self, script):
+		self.init_scripts.append(script)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_restored_into_reused_context(tmp_path):
+	"""
+	Test that a snapshot loaded into a reused (persistent) context restores the localStorage of its origins
+	next to the cookies, since storage_state can only be passed to new contexts.
+	"""
+	snapshot = {
+		'format_version': SNAPSHOT_FORMAT_VERSION,
+		'storage_state': {
+			'cookies': [{'name': 'sid', 'value': '1', 'domain': 'example.com', 'path': '/'}],
+			'origins': [
+				{'origin': 'https://example.com', 'localStorage': [{'name': 'token', 'value': 'abc'}]},
+				{'origin': 'https://empty.com', 'localStorage': []},
+			],
+		},
+		'session_storage': {},
+	}
+	(tmp_path / 'profiles' / 'work').mkdir(parents=True)
+	(tmp_path / 'profiles' / 'work' / 'v000001.json').write_text(json.dumps(snapshot))
+
+	browser = Browser(config=BrowserConfig(user_data_dir=str(tmp_path / 'user-data')))
+	shared = DummyReusedContext()
+
+	async def get_persistent_context():
+		return shared
+
+	browser.get_persistent_context = get_persistent_context
+	context = BrowserContext(
+		browser=browser,
+		config=BrowserContextConfig(storage_state_profile='work', storage_state_dir=str(tmp_path / 'profiles')),
+	)
+
+	assert await context._create_context(None) is shared
+	assert shared.cookies == snapshot['storage_state']['cookies']
+	restore_scripts = [script for script in shared.init_scripts if 'localStorage.setItem' in script]
+	assert len(restore_scripts) == 1
+	assert '{"https://example.com": {"token": "abc"}}' in restore_scripts[0]